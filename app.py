@@ -7,10 +7,24 @@ import random
 from modules.config import inject_custom_css, initialize_session_state
 from modules.data_loader import load_questions, load_exam_questions
 from modules.dashboard import show_enhanced_dashboard
+from modules.daily_review import (
+    DAILY_REVIEW_MODE, daily_review_score, end_daily_review,
+    show_daily_review_interface, show_daily_review_results
+)
 from modules.quiz_interface import show_enhanced_quiz_interface
 from modules.exam_blanc import show_exam_blanc_interface, show_exam_blanc_results, create_exam_blanc, show_exam_blanc_review_interface
+from modules.mixed_practice import (
+    MIXED_MODE, end_mixed_practice, show_mixed_practice_interface, show_mixed_practice_results, start_mixed_practice
+)
 from modules.results import show_enhanced_results
-from modules.utils import get_user_progress, calculate_score
+from modules.search import show_search_page
+from modules.selection_quiz import (
+    SELECTION_MODE, end_selection_quiz, get_selection_questions, selection_score,
+    show_selection_quiz_interface, show_selection_results
+)
+from modules.utils import get_user_progress
+from modules.progress import get_progress, reset_module_answers, reset_exam_answers
+from modules.timing import timed
 
 # Import du nouveau système de persistance
 from modules.persistence import (
@@ -18,6 +32,8 @@ from modules.persistence import (
     save_user_progress, 
     show_progress_info,
     on_answer_validated,
+    is_progress_durable,
+    get_learner_id,
     reset_user_progress,
     test_directory_creation
 )
@@ -30,6 +46,7 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@timed("app")
 def main():
     inject_custom_css()
     initialize_session_state()
@@ -74,17 +91,39 @@ def main():
                         del st.session_state.shuffled_questions
                     if 'show_error_review' in st.session_state:
                         del st.session_state.show_error_review
+                    if 'selection_quiz' in st.session_state:
+                        del st.session_state.selection_quiz
+                    if 'daily_review' in st.session_state:
+                        del st.session_state.daily_review
+                    if 'mixed_practice' in st.session_state:
+                        end_mixed_practice()
                     st.rerun()
                 
                 st.divider()
             
-            # Sauvegarde automatique uniquement
-            st.markdown("""
+            # Sauvegarde automatique uniquement (état de durabilité du thread de sauvegarde)
+            save_status = "✅ Tout est sauvegardé" if is_progress_durable() else "⏳ Sauvegarde en cours..."
+            st.markdown(f"""
             <div class="stats-card">
                 <h4>💾 Sauvegarde Auto</h4>
+                <p style="font-size: 0.85em; opacity: 0.9;">{save_status}</p>
+                <p style="font-size: 0.8em; opacity: 0.8;">👤 {get_learner_id()}</p>
             </div>
             """, unsafe_allow_html=True)
 
+            # Recherche plein texte (résultats et quiz sur les questions trouvées)
+            if st.button("🔎 Rechercher une question", use_container_width=True,
+                         type="primary" if st.session_state.show_search else "secondary"):
+                st.session_state.show_search = not st.session_state.show_search
+                st.rerun()
+
+            # Entraînement mixte : questions tirées dans tous les modules selon leur faiblesse
+            if st.button("🔀 Entraînement mixte", use_container_width=True,
+                         help="Questions de tous les modules, en priorité les erreurs et les questions jamais vues"):
+                if start_mixed_practice():
+                    st.session_state.show_search = False
+                    st.rerun()
+
             # Sélection du module
             st.subheader("🎯 Choisir un module")
             module_options = [f"{m['title']} - {m['full_title']}" for m in data['modules']]
@@ -98,7 +137,8 @@ def main():
             current_module = data['modules'][selected_module_idx]
             
             # Statistiques du module sélectionné
-            correct, total_answered = calculate_score(current_module['questions'], st.session_state.user_answers, current_module['id'])
+            module_progress = get_progress().module(current_module['id'])
+            correct, total_answered = module_progress['correct'], module_progress['answered']
             if total_answered > 0:
                 module_score = (correct / total_answered) * 100
                 from modules.utils import get_performance_level
@@ -168,15 +208,14 @@ def main():
                 
                 # Progression de l'examen blanc
                 if st.session_state.exam_blanc_questions:
-                    exam_data = st.session_state.exam_blanc_questions
+                    exam = st.session_state.exam_blanc_questions
                     
-                    # Calculer la progression
-                    part1_answered = sum(1 for q in exam_data['part1']['questions'] 
-                                       if q['id'] in st.session_state.user_answers)
-                    part2_answered = sum(1 for q in exam_data['part2']['questions'] 
-                                       if q['id'] in st.session_state.user_answers)
+                    # Progression (compteurs incrémentaux par partie)
+                    progress = get_progress()
+                    part1_answered = progress.exam_part(exam.seed, 1)['answered']
+                    part2_answered = progress.exam_part(exam.seed, 2)['answered']
                     total_answered = part1_answered + part2_answered
-                    total_questions = exam_data['total_questions']
+                    total_questions = exam.total_questions
                     
                     # Temps écoulé
                     if st.session_state.start_time:
@@ -201,8 +240,8 @@ def main():
                         <h3>📊 Progression Examen</h3>
                         <p><strong>Partie {st.session_state.exam_blanc_part}</strong> / 2</p>
                         <p>Complétées: <strong>{total_answered}</strong> / {total_questions}</p>
-                        <p>Partie 1: {part1_answered} / {len(exam_data['part1']['questions'])}</p>
-                        <p>Partie 2: {part2_answered} / {len(exam_data['part2']['questions'])}</p>
+                        <p>Partie 1: {part1_answered} / {exam.part_size(1)}</p>
+                        <p>Partie 2: {part2_answered} / {exam.part_size(2)}</p>
                         <p style="color: {time_color};">{time_icon} {elapsed_hours}h{elapsed_mins:02d}m</p>
                     </div>
                     """, unsafe_allow_html=True)
@@ -221,14 +260,8 @@ def main():
                                use_container_width=True,
                                help=f"Supprimer toutes les réponses de l'examen #{exam_id}"):
                         if st.session_state.get(f'confirm_reset_exam_{exam_id}', False):
-                            # Supprimer toutes les réponses de cet examen
-                            keys_to_remove = []
-                            for key in st.session_state.user_answers.keys():
-                                if key.startswith(f'exam{exam_id}_'):
-                                    keys_to_remove.append(key)
-                            
-                            for key in keys_to_remove:
-                                del st.session_state.user_answers[key]
+                            # Supprimer toutes les réponses de cet examen (clés préfixées par le seed)
+                            reset_exam_answers(exam.seed)
                             
                             # Sauvegarder les changements
                             save_user_progress(force_save=True)
@@ -267,18 +300,92 @@ def main():
                 # Progression de la révision
                 if 'exam_blanc_review_questions' in st.session_state:
                     review_questions = st.session_state.exam_blanc_review_questions
-                    current_idx = st.session_state.current_question_idx
                     
                     st.markdown(f"""
                     <div class="stats-card">
                         <h3>🔄 Révision Erreurs</h3>
-                        <p><strong>Question {current_idx + 1}</strong> / {len(review_questions)}</p>
                         <p>Erreurs à revoir: <strong>{len(review_questions)}</strong></p>
                     </div>
                     """, unsafe_allow_html=True)
                     
                     st.info("**Mode:** 🔄 Révision des erreurs")
                     
+            elif st.session_state.quiz_mode == SELECTION_MODE:
+                st.title("🔎 Quiz sur sélection")
+                
+                # Bouton de retour principal
+                if st.button("🏠 Retour au menu", type="primary", use_container_width=True):
+                    # Sauvegarder avant de quitter
+                    save_user_progress()
+                    end_selection_quiz()
+                    st.rerun()
+                
+                st.divider()
+                
+                # Progression sur les questions de la sélection
+                questions = get_selection_questions()
+                if questions is not None:
+                    correct, answered, _ = selection_score(questions)
+                    st.markdown(f"""
+                    <div class="stats-card">
+                        <h3>📊 Progression</h3>
+                        <p><strong>{answered}</strong> / {len(questions)} complétées</p>
+                        <p><strong>{correct}</strong> bonne(s) réponse(s)</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                    
+                    st.info(f"**Mode actuel:** 🔎 {st.session_state.selection_quiz['title']}")
+                    
+            elif st.session_state.quiz_mode == MIXED_MODE:
+                st.title("🔀 Entraînement mixte")
+                
+                # Bouton de retour principal
+                if st.button("🏠 Retour au menu", type="primary", use_container_width=True):
+                    # Sauvegarder avant de quitter
+                    save_user_progress()
+                    end_mixed_practice()
+                    st.rerun()
+                
+                st.divider()
+                
+                # Réponses données pendant cet entraînement
+                mixed = st.session_state.get('mixed_practice')
+                if mixed:
+                    st.markdown(f"""
+                    <div class="stats-card">
+                        <h3>📊 Progression</h3>
+                        <p><strong>{mixed['answered']}</strong> question(s) répondue(s)</p>
+                        <p><strong>{mixed['correct']}</strong> bonne(s) réponse(s)</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                    
+                    st.info("**Mode actuel:** 🔀 Tous les modules, selon vos points faibles")
+                    
+            elif st.session_state.quiz_mode == DAILY_REVIEW_MODE:
+                st.title("📅 Révision du jour")
+                
+                # Bouton de retour principal
+                if st.button("🏠 Retour au menu", type="primary", use_container_width=True):
+                    # Sauvegarder avant de quitter
+                    save_user_progress()
+                    end_daily_review()
+                    st.rerun()
+                
+                st.divider()
+                
+                # Progression sur les fiches de la série
+                if st.session_state.get('daily_review'):
+                    correct, answered, total = daily_review_score()
+                    st.markdown(f"""
+                    <div class="stats-card">
+                        <h3>📊 Progression</h3>
+                        <p><strong>{answered}</strong> / {total} revues</p>
+                        <p><strong>{correct}</strong> bonne(s) réponse(s)</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                    
+                    st.info("**Mode actuel:** 📅 Répétition espacée")
+                    
             else:
                 st.title("📝 Quiz en cours")
                 
@@ -299,11 +406,10 @@ def main():
                 if st.session_state.current_module:
                     module = st.session_state.current_module
                     questions = st.session_state.get('shuffled_questions', module['questions'])
-                    current_idx = st.session_state.current_question_idx
                     total_questions = len(questions)
                     
-                    # Calculer les questions répondues
-                    answered_questions = sum(1 for q in questions if f"{module['id']}_{q['id']}" in st.session_state.user_answers)
+                    # Questions répondues (compteur incrémental du module)
+                    answered_questions = get_progress().module(module['id'])['answered']
                     progress = answered_questions / total_questions
                     
                     st.markdown(f"""
@@ -311,7 +417,6 @@ def main():
                         <h3>📊 Progression</h3>
                         <p><strong>{answered_questions}</strong> / {total_questions} complétées</p>
                         <p><strong>{progress:.1%}</strong> complété</p>
-                        <p style="font-size: 0.9em; opacity: 0.8;">Question actuelle: {current_idx + 1}</p>
                     </div>
                     """, unsafe_allow_html=True)
                     
@@ -332,13 +437,7 @@ def main():
                                help=f"Supprimer toutes les réponses du {module['title']}"):
                         if st.session_state.get(f'confirm_reset_module_{module["id"]}', False):
                             # Supprimer toutes les réponses de ce module
-                            keys_to_remove = []
-                            for key in st.session_state.user_answers.keys():
-                                if key.startswith(f"{module['id']}_"):
-                                    keys_to_remove.append(key)
-                            
-                            for key in keys_to_remove:
-                                del st.session_state.user_answers[key]
+                            reset_module_answers(module['id'])
                             
                             # Sauvegarder les changements
                             save_user_progress(force_save=True)
@@ -357,7 +456,10 @@ def main():
     
     # Contenu principal
     if not st.session_state.quiz_started:
-        show_enhanced_dashboard(data)
+        if st.session_state.show_search:
+            show_search_page()
+        else:
+            show_enhanced_dashboard(data)
     elif st.session_state.quiz_completed:
         if st.session_state.quiz_mode == 'exam_blanc':
             show_exam_blanc_results()
@@ -366,6 +468,12 @@ def main():
             st.session_state.quiz_mode = 'exam_blanc'
             st.session_state.quiz_completed = True
             show_exam_blanc_results()
+        elif st.session_state.quiz_mode == SELECTION_MODE:
+            show_selection_results()
+        elif st.session_state.quiz_mode == DAILY_REVIEW_MODE:
+            show_daily_review_results()
+        elif st.session_state.quiz_mode == MIXED_MODE:
+            show_mixed_practice_results()
         else:
             show_enhanced_results()
     else:
@@ -373,6 +481,12 @@ def main():
             show_exam_blanc_interface()
         elif st.session_state.quiz_mode == 'exam_blanc_review':
             show_exam_blanc_review_interface()
+        elif st.session_state.quiz_mode == SELECTION_MODE:
+            show_selection_quiz_interface()
+        elif st.session_state.quiz_mode == DAILY_REVIEW_MODE:
+            show_daily_review_interface()
+        elif st.session_state.quiz_mode == MIXED_MODE:
+            show_mixed_practice_interface()
         else:
             show_enhanced_quiz_interface()
 
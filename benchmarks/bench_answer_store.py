@@ -0,0 +1,94 @@
+"""
+Benchmark : dictionnaire user_answers à clés texte vs AnswerStore compact
+
+Mesure la mémoire d'une session ayant répondu à toute la banque d'entraînement
+et à 10 examens blancs, puis le coût d'un reset de module / d'examen et d'un
+comptage de réponses.
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_answer_store.py
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.answer_store import AnswerStore, EXAM_PART_SIZES, exam_key
+from modules.question_bank import QuestionBank
+
+QUESTIONS_FILE = "data/questions.json"
+EXAM_SEEDS = list(range(1, 11))
+REPEATS = 200
+
+
+def full_answers(bank, rng):
+    """Réponses à toutes les questions d'entraînement et à 10 examens complets"""
+    answers = {}
+    for module in bank.modules:
+        for question in module['questions']:
+            answers[f"{module['id']}_{question['id']}"] = rng.choice('ABC')
+    for seed in EXAM_SEEDS:
+        for part, size in EXAM_PART_SIZES.items():
+            for position in range(size):
+                answers[exam_key(seed, part, position)] = rng.choice('ABC')
+    return answers
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    value = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, size
+
+
+def timed(func, states):
+    """Temps moyen de func(state) sur des états préparés à l'avance (µs)"""
+    start = time.perf_counter()
+    for state in states:
+        func(state)
+    return (time.perf_counter() - start) / len(states) * 1e6
+
+
+def dict_reset(answers, prefix):
+    for key in [key for key in answers if key.startswith(prefix)]:
+        del answers[key]
+
+
+def main():
+    bank = QuestionBank.from_file(QUESTIONS_FILE)
+    source = full_answers(bank, random.Random(0))
+    # Clés recréées pour ne pas mesurer des chaînes partagées avec `source`
+    pairs = [(''.join(key), choice) for key, choice in source.items()]
+
+    # Préchauffe le cache process-wide de décodage des clés d'examen
+    AnswerStore.from_dict(bank, source)
+
+    answers_dict, dict_bytes = measure_memory(lambda: {''.join(k): v for k, v in pairs})
+    store, store_bytes = measure_memory(lambda: AnswerStore.from_dict(bank, source))
+
+    print(f"Réponses: {len(answers_dict)}")
+    print(f"{'':<24}{'dict':>14}{'AnswerStore':>14}")
+    print(f"{'mémoire':<24}{dict_bytes / 1024:>11.1f} KB{store_bytes / 1024:>11.1f} KB"
+          f"  (tableaux compacts: {store.nbytes()} o)")
+
+    dicts = [dict(answers_dict) for _ in range(REPEATS)]
+    stores = [AnswerStore.from_dict(bank, source) for _ in range(REPEATS)]
+
+    count_dict = timed(lambda answers: sum(1 for k in answers if k.startswith('6_')), dicts)
+    count_store = timed(lambda answers: answers.count_module(6), stores)
+    print(f"{'comptage module 6':<24}{count_dict:>11.1f} µs{count_store:>11.1f} µs")
+
+    reset_dict = timed(lambda answers: dict_reset(answers, '6_'), dicts)
+    reset_store = timed(lambda answers: answers.reset_module(6), stores)
+    print(f"{'reset module 6':<24}{reset_dict:>11.1f} µs{reset_store:>11.1f} µs")
+
+    reset_dict = timed(lambda answers: dict_reset(answers, 'exam5_'), dicts)
+    reset_store = timed(lambda answers: answers.reset_exam(5), stores)
+    print(f"{'reset examen #5':<24}{reset_dict:>11.1f} µs{reset_store:>11.1f} µs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark : durée d'un build de data/ avec et sans cache incrémental
+
+Copie les scripts de data/ et des sources synthétiques 1x et 10x (voir
+bench_parser.write_sources) dans un dossier temporaire, puis lance
+process_data.py et process_exam.py comme un rédacteur le ferait :
+- sans cache (AMF_BUILD_CACHE=0) : tout est réanalysé et réécrit
+- premier build avec cache (cache vide)
+- rebuild sans modification
+- rebuild après modification d'une question
+Chaque durée inclut le démarrage de Python. Le script vérifie que les sorties
+avec et sans cache sont identiques.
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_build_cache.py
+"""
+import filecmp
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_parser import write_sources
+
+SCALES = [1, 10]
+SCRIPTS = [("process_data.py", "questions.txt", "questions.json"), ("process_exam.py", "examen.txt", "exam_questions.json")]
+
+
+def run(directory, script, cache=True):
+    """Durée (ms) d'un build ; --yes : pas de confirmation en cas de blocs écartés"""
+    env = dict(os.environ, AMF_BUILD_CACHE="1" if cache else "0")
+    start = time.perf_counter()
+    subprocess.run([sys.executable, script, "--yes"], cwd=directory, env=env,
+                   stdout=subprocess.DEVNULL, check=True)
+    return (time.perf_counter() - start) * 1e3
+
+
+def edit_one_question(path):
+    """Modifie le texte de l'énoncé de la 100e question du fichier"""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    seen = 0
+    for i, line in enumerate(lines):
+        if line.startswith("Énoncé de la question"):
+            seen += 1
+            if seen == 100:
+                lines[i] = line.rstrip("\n") + " (modifié)\n"
+                break
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+
+
+def prepare(directory, sources):
+    os.makedirs(directory)
+    for script in glob.glob(os.path.join(ROOT, "data", "*.py")):
+        shutil.copy(script, directory)
+    for source, name in zip(sources, ("questions.txt", "examen.txt")):
+        shutil.copy(source, os.path.join(directory, name))
+
+
+def main():
+    print(f"{'source':<22}{'sans cache':>12}{'1er build':>12}{'inchangé':>12}{'1 question':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in SCALES:
+            sources = write_sources(tmp, scale)
+            plain_dir = os.path.join(tmp, f"plain_{scale}")
+            cached_dir = os.path.join(tmp, f"cached_{scale}")
+            prepare(plain_dir, sources)
+            prepare(cached_dir, sources)
+
+            for script, source, output in SCRIPTS:
+                plain = run(plain_dir, script, cache=False)
+                cold = run(cached_dir, script)
+                warm = run(cached_dir, script)
+                for directory in (plain_dir, cached_dir):
+                    edit_one_question(os.path.join(directory, source))
+                run(plain_dir, script, cache=False)
+                edited = run(cached_dir, script)
+
+                same = filecmp.cmp(os.path.join(plain_dir, output), os.path.join(cached_dir, output), shallow=False)
+                assert same, f"{output} {scale}x : sorties différentes avec et sans cache"
+                label = f"{source} {scale}x"
+                print(f"{label:<22}{plain:>9.0f} ms{cold:>9.0f} ms{warm:>9.0f} ms{edited:>9.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark : rendu du tableau de bord quand la progression ne change pas
+
+Répond à quelques questions de plusieurs modules et d'un examen blanc, revient
+à l'accueil puis relance la page sans modifier la progression (ce que
+provoquent l'ouverture d'un expander ou la confirmation de régénération d'un
+examen). Mesure la durée médiane de show_enhanced_dashboard (zone
+« dashboard » de modules/timing.py) pour ces reruns, puis pour un rerun
+suivant une nouvelle réponse.
+
+La progression est gardée en mémoire (AMF_PROGRESS_BACKEND=memory) : le
+dossier checkpoint n'est pas touché.
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_dashboard.py
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ["AMF_PROGRESS_BACKEND"] = "memory"
+
+from streamlit.testing.v1 import AppTest
+from modules.timing import reset_timings, timing_summary
+
+RERUNS = 20
+APP_TIMEOUT = 120
+
+
+def click(at, label):
+    button = next(b for b in at.button if label in b.label)
+    button.click().run(timeout=APP_TIMEOUT)
+    assert not at.exception, at.exception
+
+
+def answer(at, count):
+    for i in range(count):
+        at.radio[0].set_value("ABC"[i % 3]).run(timeout=APP_TIMEOUT)
+        click(at, "💾 Valider")
+        click(at, "➡️ Suivant")
+    click(at, "🏠 Retour au menu")
+
+
+def main():
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=APP_TIMEOUT)
+    at.run()
+    assert not at.exception, at.exception
+    for theme in (1, 6, 11):
+        click(at, f"🎯 Commencer Thème {theme}")
+        answer(at, 3)
+    click(at, "🚀 Commencer l'Examen #1")
+    answer(at, 3)
+
+    reset_timings()
+    for _ in range(RERUNS):
+        at.run(timeout=APP_TIMEOUT)
+    unchanged = timing_summary()['dashboard']
+
+    reset_timings()
+    click(at, "🎯 Commencer Thème 2")
+    answer(at, 1)
+    changed = timing_summary()['dashboard']
+
+    print(f"{'rerun':<32}{'exécutions':>12}{'médiane':>12}")
+    print(f"{'progression inchangée':<32}{unchanged['runs']:>12}{unchanged['median_ms']:>9.1f} ms")
+    print(f"{'après une nouvelle réponse':<32}{changed['runs']:>12}{changed['median_ms']:>9.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark : liste des erreurs, parcours des réponses vs index des erreurs
+
+Parcours : chaque question du module (ou de l'examen blanc) est comparée à
+la réponse enregistrée dans l'AnswerStore, comme le faisaient le mode
+révision, les résultats d'un module et le bouton « Réviser les erreurs »
+de l'examen. Index : positions en erreur tenues par ProgressAggregate à
+chaque validation.
+
+Session ayant répondu à toute la banque d'entraînement et à 10 examens
+blancs, avec ERROR_RATE de réponses fausses ; chaque durée est la médiane de
+REPEATS mesures.
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_error_index.py
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.answer_store import AnswerStore, EXAM_PART_SIZES, exam_key
+from modules.progress import ProgressAggregate
+from modules.question_bank import QuestionBank
+
+QUESTIONS_FILE = "data/questions.json"
+EXAM_QUESTIONS_FILE = "data/exam_questions.json"
+EXAM_SEEDS = list(range(1, 11))
+ERROR_RATE = 0.2
+REPEATS = 200
+
+
+def answer(correct_answer, rng):
+    """Réponse juste ou, avec la probabilité ERROR_RATE, une autre lettre"""
+    if rng.random() >= ERROR_RATE:
+        return correct_answer
+    return rng.choice([letter for letter in 'ABC' if letter != correct_answer])
+
+
+def median_us(function):
+    durations = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1e6
+
+
+def scan_module_errors(store, module):
+    return [q for q in module['questions'] if store.module_choice(module['id'], q['id']) not in (None, q['correct_answer'])]
+
+
+def index_module_errors(aggregate, module):
+    return [module['questions'][position] for position in aggregate.module_error_positions(module['id'])]
+
+
+def scan_exam_errors(store, seed, corrections):
+    errors = []
+    for part, correct_answers in corrections.items():
+        for position, correct_answer in enumerate(correct_answers):
+            choice = store.get(exam_key(seed, part, position))
+            if choice is not None and choice != correct_answer:
+                errors.append((part, position))
+    return errors
+
+
+def main():
+    rng = random.Random(42)
+    bank = QuestionBank.from_file(QUESTIONS_FILE)
+    exam_bank = QuestionBank.from_file(EXAM_QUESTIONS_FILE)
+    store = AnswerStore(bank)
+    aggregate = ProgressAggregate()
+
+    for module in bank.modules:
+        for position, question in enumerate(module['questions']):
+            choice = answer(question['correct_answer'], rng)
+            store[f"{module['id']}_{question['id']}"] = choice
+            aggregate.record_module_answer(module['id'], position, None, choice, question['correct_answer'])
+
+    # Corrigés d'examens tirés dans la banque d'examen (la composition réelle dépend du seed)
+    exam_modules = exam_bank.modules
+    exam_corrections = {}
+    for seed in EXAM_SEEDS:
+        corrections = {}
+        for part, size in EXAM_PART_SIZES.items():
+            questions = exam_modules[part - 1]['questions']
+            corrections[part] = ''.join(rng.choice(questions)['correct_answer'] for _ in range(size))
+            for position, correct_answer in enumerate(corrections[part]):
+                choice = answer(correct_answer, rng)
+                store[exam_key(seed, part, position)] = choice
+                aggregate.record_exam_answer(seed, part, position, None, choice, correct_answer)
+        exam_corrections[seed] = corrections
+
+    largest = max(bank.modules, key=lambda module: len(module['questions']))
+    assert scan_module_errors(store, largest) == index_module_errors(aggregate, largest)
+    assert scan_exam_errors(store, 1, exam_corrections[1]) == aggregate.exam_error_positions(1)
+
+    rows = [
+        (f"erreurs de {largest['title']} ({len(largest['questions'])} q.)",
+         median_us(lambda: scan_module_errors(store, largest)),
+         median_us(lambda: index_module_errors(aggregate, largest))),
+        ("erreurs des 12 modules",
+         median_us(lambda: [scan_module_errors(store, module) for module in bank.modules]),
+         median_us(lambda: [index_module_errors(aggregate, module) for module in bank.modules])),
+        ("erreurs d'un examen blanc (120 q.)",
+         median_us(lambda: scan_exam_errors(store, 1, exam_corrections[1])),
+         median_us(lambda: aggregate.exam_error_positions(1))),
+    ]
+    print(f"{len(store)} réponses, {ERROR_RATE:.0%} d'erreurs")
+    print(f"{'liste':<44}{'parcours':>12}{'index':>12}{'gain':>9}")
+    for label, scan, indexed in rows:
+        print(f"{label:<44}{scan:>9.1f} µs{indexed:>9.1f} µs{scan / indexed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark : coût serveur d'un clic, rerun complet vs rerun du fragment
+
+Pilote l'application avec streamlit.testing (AppTest) sur un module
+d'entraînement puis un examen blanc : sélection d'une réponse, Valider,
+Suivant, Précédent et navigation rapide. Les zones chronométrées par
+modules/timing.py donnent :
+- « app » : exécution complète du script (coût de chaque clic avant les fragments)
+- « fragment:quiz » / « fragment:exam » : rendu de la carte question seule
+  (coût d'un clic qui ne relance que le fragment)
+
+AppTest relance toujours le script complet : les deux zones sont donc mesurées
+dans les mêmes exécutions, puis combinées selon la portée réelle de chaque
+clic dans l'application (seule la validation d'une nouvelle réponse relance
+toute la page, pour mettre à jour les compteurs de la barre latérale).
+
+La progression est gardée en mémoire (AMF_PROGRESS_BACKEND=memory) : le
+dossier checkpoint n'est pas touché.
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_fragments.py
+"""
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ["AMF_PROGRESS_BACKEND"] = "memory"
+
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from streamlit.testing.v1 import AppTest
+from modules.timing import reset_timings, timing_summary
+
+QUESTIONS_PER_RUN = 8
+APP_TIMEOUT = 120
+
+
+def click(at, label):
+    button = next(b for b in at.button if b.label == label or b.label.startswith(label))
+    button.click().run(timeout=APP_TIMEOUT)
+    assert not at.exception, at.exception
+
+
+def jump_to(at, index):
+    """Clic dans la grille de navigation rapide (composant : valeur injectée directement)"""
+    grid = next(node for node in at._tree if getattr(node, 'type', None) == 'component_instance')
+    widget_states = at._tree.get_widget_states()
+    widget_states.widgets.append(
+        WidgetState(id=grid.proto.id, json_value=json.dumps({'index': index, 'nonce': 1}))
+    )
+    at._run(widget_states, timeout=APP_TIMEOUT)
+    assert not at.exception, at.exception
+
+
+def answer_questions(at):
+    """Répond à QUESTIONS_PER_RUN questions puis revient en arrière et saute via la grille"""
+    clicks = {'select': 0, 'validate': 0, 'navigate': 0}
+    for i in range(QUESTIONS_PER_RUN):
+        at.radio[0].set_value("ABC"[i % 3]).run(timeout=APP_TIMEOUT)
+        clicks['select'] += 1
+        click(at, "💾 Valider")
+        clicks['validate'] += 1
+        click(at, "➡️ Suivant")
+        clicks['navigate'] += 1
+    for _ in range(2):
+        click(at, "⬅️ Précédent")
+        clicks['navigate'] += 1
+    jump_to(at, 0)
+    clicks['navigate'] += 1
+    return clicks
+
+
+def report(title, fragment, clicks):
+    summary = timing_summary()
+    app = summary['app']['median_ms']
+    card = summary[fragment]['median_ms']
+    total = sum(clicks.values())
+    before = total * app
+    after = clicks['validate'] * app + (total - clicks['validate']) * card
+
+    print(f"\n{title} ({total} clics : {clicks['select']} sélections, "
+          f"{clicks['validate']} validations, {clicks['navigate']} navigations)")
+    print(f"{'zone':<18}{'exécutions':>12}{'médiane':>12}{'max':>12}")
+    for name in ('app', fragment):
+        stats = summary[name]
+        print(f"{name:<18}{stats['runs']:>12}{stats['median_ms']:>9.1f} ms{stats['max_ms']:>9.1f} ms")
+    print(f"travail serveur estimé : {before:.0f} ms avant, {after:.0f} ms avec fragments "
+          f"({before / after:.1f}x)")
+
+
+def main():
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=APP_TIMEOUT)
+    at.run()
+    assert not at.exception, at.exception
+
+    click(at, "🎯 Commencer Thème 6")
+    reset_timings()
+    report("Module 6", "fragment:quiz", answer_questions(at))
+
+    click(at, "🏠 Retour au menu")
+    click(at, "🚀 Commencer l'Examen #1")
+    reset_timings()
+    report("Examen blanc #1", "fragment:exam", answer_questions(at))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark : démarrage à froid, questions.json complet vs manifeste + shards
+
+Construit des banques 1x et 50x (modules dupliqués avec de nouveaux
+identifiants), les écrit sous les deux formats dans un dossier temporaire,
+puis mesure :
+- le démarrage (banque + moteur de score, ce qu'il faut pour l'accueil)
+- l'ouverture du premier module (lecture de son shard en mode manifeste)
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_lazy_bank.py
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "data"))
+
+from process_data import write_manifest_and_shards
+from modules.question_bank import QuestionBank
+from modules.scoring import ScoringEngine
+
+QUESTIONS_FILE = "data/questions.json"
+SCALES = [1, 50]
+REPEATS = 5
+
+
+def scaled_bank(raw, scale):
+    """Banque dont chaque module contient `scale` fois ses questions"""
+    modules = []
+    for module in raw['modules']:
+        questions = [
+            dict(question, id=copy * 10000 + question['id'])
+            for copy in range(scale) for question in module['questions']
+        ]
+        modules.append(dict(module, questions=questions, total_questions=len(questions)))
+    total = sum(len(module['questions']) for module in modules)
+    return {'metadata': dict(raw['metadata'], total_questions=total), 'modules': modules}
+
+
+def best_of(func):
+    """Meilleur temps de REPEATS exécutions (ms)"""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1e3
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    with open(QUESTIONS_FILE, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    print(f"{'banque':<10}{'format':<12}{'démarrage':>12}{'1er module':>12}{'octets lus':>14}")
+    for scale in SCALES:
+        directory = tempfile.mkdtemp(prefix="bench_lazy_bank_")
+        try:
+            data = scaled_bank(raw, scale)
+            full_path = os.path.join(directory, "questions.json")
+            with open(full_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            shard_dir = os.path.join(directory, "questions")
+            with open(os.devnull, "w") as devnull:
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    write_manifest_and_shards(data, shard_dir)
+                finally:
+                    sys.stdout = stdout
+            manifest_path = os.path.join(shard_dir, "manifest.json")
+            first_shard = os.path.join(shard_dir, f"module_{data['modules'][0]['id']}.json")
+
+            startup = best_of(lambda: ScoringEngine(QuestionBank.from_file(full_path)))
+            bank = QuestionBank.from_file(full_path)
+            first = best_of(lambda: bank.modules[0]['questions'][0])
+            print(f"{scale:>4}x     {'complet':<12}{startup:>9.1f} ms{first:>9.3f} ms"
+                  f"{os.path.getsize(full_path) / 1024:>11.0f} KB")
+
+            startup = best_of(lambda: ScoringEngine(QuestionBank.from_manifest(manifest_path)))
+
+            def open_first_module():
+                QuestionBank.from_manifest(manifest_path).modules[0]['questions'][0]
+
+            first = best_of(open_first_module) - best_of(lambda: QuestionBank.from_manifest(manifest_path))
+            read_bytes = os.path.getsize(manifest_path) + os.path.getsize(first_shard)
+            print(f"{scale:>4}x     {'manifeste':<12}{startup:>9.1f} ms{max(first, 0):>9.3f} ms"
+                  f"{read_bytes / 1024:>11.0f} KB")
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
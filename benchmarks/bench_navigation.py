@@ -0,0 +1,77 @@
+"""
+Benchmark : coût de la navigation rapide par rerun
+
+Ouvre le thème 6 (100 questions) puis la partie 2 d'un examen blanc
+(64 questions) avec streamlit.testing (AppTest), répond à quelques questions
+et mesure à chaque rerun :
+- le nombre d'éléments et de widgets de la page
+- la taille des protos des éléments envoyés au navigateur (octets)
+- la durée médiane du rendu de la carte question (fragment)
+
+La progression est gardée en mémoire (AMF_PROGRESS_BACKEND=memory) : le
+dossier checkpoint n'est pas touché.
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_navigation.py
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ["AMF_PROGRESS_BACKEND"] = "memory"
+
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import Widget
+from modules.timing import reset_timings, timing_summary
+
+RERUNS = 6
+APP_TIMEOUT = 120
+
+
+def click(at, label):
+    button = next(b for b in at.button if label in b.label)
+    button.click().run(timeout=APP_TIMEOUT)
+    assert not at.exception, at.exception
+
+
+def page_size(at):
+    """(éléments, widgets, octets des protos) de la page affichée"""
+    elements = widgets = size = 0
+    for node in at._tree:
+        proto = getattr(node, 'proto', None)
+        if proto is None:
+            continue
+        elements += 1
+        widgets += isinstance(node, Widget) or getattr(node, 'type', None) == 'component_instance'
+        size += proto.ByteSize()
+    return elements, widgets, size
+
+
+def measure(at, title, fragment):
+    reset_timings()
+    for i in range(RERUNS):
+        at.radio[0].set_value("ABC"[i % 3]).run(timeout=APP_TIMEOUT)
+        assert not at.exception, at.exception
+    elements, widgets, size = page_size(at)
+    card = timing_summary()[fragment]['median_ms']
+    print(f"{title:<28}{elements:>10}{widgets:>10}{size / 1024:>11.1f} KB{card:>11.1f} ms")
+
+
+def main():
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=APP_TIMEOUT)
+    at.run()
+    assert not at.exception, at.exception
+
+    print(f"{'page':<28}{'éléments':>10}{'widgets':>10}{'protos':>14}{'fragment':>14}")
+    click(at, "🎯 Commencer Thème 6")
+    measure(at, "Thème 6 (100 questions)", "fragment:quiz")
+
+    click(at, "🏠 Retour au menu")
+    click(at, "🚀 Commencer l'Examen #1")
+    click(at, "Partie 2")
+    measure(at, "Examen #1, partie 2 (64)", "fragment:exam")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark : détection des quasi-doublons, comparaison deux à deux vs MinHash + LSH
+
+Génère des banques synthétiques de questions (phrases tirées du vocabulaire
+de la banque réelle) dont 10 % sont des variantes d'une autre question :
+quelques fautes de frappe et options permutées. Mesure pour chaque taille :
+- la durée de la comparaison exacte de toutes les paires (jusqu'à
+  PAIRWISE_LIMIT questions, au-delà elle est trop longue)
+- la durée de find_near_duplicates (MinHash + LSH, puis vérification exacte)
+- le rappel : part des variantes plantées retrouvées dans le cluster de leur
+  question d'origine
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_near_duplicates.py
+"""
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "data"))
+
+from near_duplicates import DEFAULT_THRESHOLD, comparable_text, find_near_duplicates, shingles
+
+QUESTIONS_FILE = os.path.join(ROOT, "data", "questions.json")
+SIZES = [500, 2000, 8000, 32000]
+PAIRWISE_LIMIT = 2000
+VARIANT_RATIO = 0.1
+TYPOS = 3
+
+
+def vocabulary():
+    with open(QUESTIONS_FILE, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    words = set()
+    for module in raw['modules']:
+        for question in module['questions']:
+            words.update(question['question'].split())
+            for option in question['options'].values():
+                words.update(option.split())
+    return sorted(words)
+
+
+def sentence(rng, words, low, high):
+    return ' '.join(rng.choice(words) for _ in range(rng.randint(low, high)))
+
+
+def with_typos(rng, text):
+    """Supprime, double ou remplace TYPOS caractères"""
+    chars = list(text)
+    for _ in range(TYPOS):
+        i = rng.randrange(len(chars))
+        action = rng.randrange(3)
+        if action == 0:
+            del chars[i]
+        elif action == 1:
+            chars.insert(i, chars[i])
+        else:
+            chars[i] = rng.choice('abcdefghijklmnopqrstuvwxyz')
+    return ''.join(chars)
+
+
+def synthetic_bank(size, words, rng):
+    """Banque de `size` questions et liste des paires (origine, variante) plantées"""
+    questions, planted = [], []
+    for index in range(size):
+        if questions and rng.random() < VARIANT_RATIO:
+            origin = rng.randrange(len(questions))
+            source = questions[origin]
+            options = list(source['options'].values())
+            rng.shuffle(options)
+            questions.append({
+                'question': with_typos(rng, source['question']),
+                'options': dict(zip('ABC', options))
+            })
+            planted.append((origin, index))
+        else:
+            questions.append({
+                'question': sentence(rng, words, 10, 25),
+                'options': {letter: sentence(rng, words, 4, 12) for letter in 'ABC'}
+            })
+    return questions, planted
+
+
+def pairwise(questions, threshold):
+    """Référence O(n²) : similarité de Jaccard exacte de toutes les paires"""
+    sets = [shingles(comparable_text(question)) for question in questions]
+    pairs = []
+    for i in range(len(sets)):
+        for j in range(i + 1, len(sets)):
+            if len(sets[i] & sets[j]) / len(sets[i] | sets[j]) >= threshold:
+                pairs.append((i, j))
+    return pairs
+
+
+def recall(clusters, planted):
+    cluster_of = {}
+    for number, cluster in enumerate(clusters):
+        for index in cluster['members']:
+            cluster_of[index] = number
+    found = sum(origin in cluster_of and cluster_of.get(origin) == cluster_of.get(variant) for origin, variant in planted)
+    return found / len(planted) if planted else 1.0
+
+
+def main():
+    words = vocabulary()
+    rng = random.Random(42)
+    print(f"seuil {DEFAULT_THRESHOLD}, {TYPOS} fautes de frappe par variante, options permutées\n")
+    print(f"{'questions':>10}{'paires':>14}{'MinHash+LSH':>14}{'clusters':>10}{'rappel':>9}")
+    for size in SIZES:
+        questions, planted = synthetic_bank(size, words, rng)
+
+        if size <= PAIRWISE_LIMIT:
+            start = time.perf_counter()
+            pairwise(questions, DEFAULT_THRESHOLD)
+            pairwise_text = f"{(time.perf_counter() - start) * 1e3:.0f} ms"
+        else:
+            pairwise_text = "-"
+
+        start = time.perf_counter()
+        clusters = find_near_duplicates(questions, DEFAULT_THRESHOLD)
+        lsh_ms = (time.perf_counter() - start) * 1e3
+
+        print(f"{size:>10}{pairwise_text:>14}{lsh_ms:>11.0f} ms{len(clusters):>10}{recall(clusters, planted):>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
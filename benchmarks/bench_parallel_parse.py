@@ -0,0 +1,91 @@
+"""
+Benchmark : analyse et validation des sources en parallèle, selon le nombre de processus
+
+Écrit des sources synthétiques 10x et 100x (voir bench_parser.write_sources)
+dans un dossier temporaire, puis mesure pour 1, 2, 4... processus (jusqu'au
+nombre de cœurs, au moins 2) la durée de :
+- parse_questions_by_theme + validate_questions sur questions.txt
+- parse_exam_questions + validate_exam_questions sur examen.txt (dont le
+  dédoublonnage, qui reste en série)
+Chaque durée est le meilleur de REPEATS exécutions, démarrage des processus
+compris. La dernière colonne compare questions, blocs signalés et erreurs à
+ceux de l'analyse en série (1 processus).
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_parallel_parse.py
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "data"))
+
+from bench_parser import write_sources
+from process_data import parse_questions_by_theme, validate_questions
+from process_exam import parse_exam_questions, validate_exam_questions
+
+SCALES = [10, 100]
+REPEATS = 3
+
+
+def worker_counts():
+    cores = os.cpu_count() or 1
+    counts = {1, max(cores, 2)}
+    count = 2
+    while count < cores:
+        counts.add(count)
+        count *= 2
+    return sorted(counts)
+
+
+def build_questions(path, workers):
+    issues = []
+    with open(path, "r", encoding="utf-8") as f:
+        themes = parse_questions_by_theme(f, issues, workers=workers)
+    return themes, issues, validate_questions(themes, issues)
+
+
+def build_exam(path, workers):
+    issues = []
+    with open(path, "r", encoding="utf-8") as f:
+        themes = parse_exam_questions(f, issues, workers=workers)
+    return themes, issues, validate_exam_questions(themes, issues)
+
+
+def timed(build, path, workers):
+    """(meilleure durée en ms, résultat sérialisé)"""
+    best = float("inf")
+    for _ in range(REPEATS):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = build(path, workers)
+            best = min(best, time.perf_counter() - start)
+    return best * 1e3, json.dumps(result, ensure_ascii=False, default=str)
+
+
+def main():
+    counts = worker_counts()
+    print(f"{os.cpu_count()} cœurs disponibles\n")
+    print(f"{'source':<22}{'processus':>10}{'durée':>12}{'accélération':>14}{'résultat':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in SCALES:
+            questions_path, exam_path = write_sources(tmp, scale)
+            for label, build, path in (("questions.txt", build_questions, questions_path),
+                                       ("examen.txt", build_exam, exam_path)):
+                serial_ms = serial = None
+                for workers in counts:
+                    duration, result = timed(build, path, workers)
+                    if serial is None:
+                        serial_ms, serial = duration, result
+                    same = "identique" if result == serial else "différent"
+                    print(f"{label + f' {scale}x':<22}{workers:>10}{duration:>9.0f} ms{serial_ms / duration:>13.2f}x{same:>12}")
+
+
+if __name__ == "__main__":
+    main()
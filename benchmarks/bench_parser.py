@@ -0,0 +1,171 @@
+"""
+Benchmark : parseurs des sources texte, regex sur le fichier complet vs automate en flux
+
+Écrit des sources synthétiques 1x, 10x et 100x (questions.txt avec des thèmes
+renumérotés, examen.txt recopié) dans un dossier temporaire, puis mesure pour
+chaque parseur :
+- la durée (meilleur de REPEATS exécutions)
+- le pic mémoire (tracemalloc) du parse complet, et celui de l'automate seul
+  quand les questions ne sont pas conservées (il ne reste alors que la liste
+  des blocs signalés, 480 par copie de examen.txt)
+La dernière colonne compare le JSON produit par les deux parseurs. Sur
+examen.txt recopié, l'ancienne regex laisse un bloc « Enoncé » (sans accent,
+non reconnu) absorber le texte jusqu'à l'énoncé de la copie suivante : ses
+sorties diffèrent à partir de 10x, l'automate écarte et signale ces blocs.
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_parser.py
+"""
+import contextlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "data"))
+
+from process_data import parse_questions_by_theme
+from process_exam import parse_exam_questions, remove_duplicates_from_questions
+from question_parser import iter_question_blocks
+
+QUESTIONS_FILE = "data/questions.txt"
+EXAM_FILE = "data/examen.txt"
+SCALES = [1, 10, 100]
+REPEATS = 3
+
+THEME_PATTERN = r"Thème (\d+)\s*:\s*(.+?)(?=\n|$)"
+QUESTION_PATTERN = r"Question (\d+)\s*\n*Énoncé de la question \d+\s*:\s*(.*?)\s*A\s*-\s*(.*?)\s*B\s*-\s*(.*?)\s*C\s*-\s*(.*?)\s*Réponse attendue\s*:\s*([ABC])"
+EXAM_PATTERN = r"Question (\d+)\s*\n*Thème\s*:\s*(.*?)\s*\n*Énoncé de la question\s*:\s*(.*?)\s*A\s*-\s*(.*?)\s*B\s*-\s*(.*?)\s*C\s*-\s*(.*?)\s*Réponse attendue\s*:\s*([ABC])"
+
+
+def regex_parse_questions(text_content):
+    """Ancien parseur de questions.txt : sections par thème puis re.findall DOTALL"""
+    themes = {}
+    current_theme = current_title = None
+    section = []
+
+    def save():
+        if current_theme is not None and section:
+            themes[current_theme] = {'title': current_title, 'content': '\n'.join(section), 'questions': []}
+
+    for line in text_content.strip().split('\n'):
+        line = line.strip()
+        match = re.match(THEME_PATTERN, line)
+        if match:
+            save()
+            current_theme, current_title, section = int(match.group(1)), match.group(2).strip(), []
+        elif line:
+            section.append(line)
+    save()
+
+    for theme_id, theme in themes.items():
+        theme['questions'] = [
+            {"id": int(number), "theme_id": theme_id, "question": text.strip(),
+             "options": {"A": a.strip(), "B": b.strip(), "C": c.strip()},
+             "correct_answer": answer.strip(), "explanation": ""}
+            for number, text, a, b, c, answer in re.findall(QUESTION_PATTERN, theme['content'], re.DOTALL)
+        ]
+    return themes
+
+
+def regex_parse_exam(text_content):
+    """Ancien parseur de examen.txt : re.findall DOTALL sur le fichier complet puis dédoublonnage"""
+    themes = {}
+    for number, theme, text, a, b, c, answer in re.findall(EXAM_PATTERN, text_content.strip(), re.DOTALL):
+        theme = theme.strip()
+        questions = themes.setdefault(theme, {'title': theme, 'questions': []})['questions']
+        questions.append({
+            "id": len(questions) + 1, "original_id": int(number), "theme": theme,
+            "question": text.strip(), "options": {"A": a.strip(), "B": b.strip(), "C": c.strip()},
+            "correct_answer": answer.strip(), "explanation": ""
+        })
+    for theme, data in themes.items():
+        data['questions'], _ = remove_duplicates_from_questions(data['questions'], theme)
+    return themes
+
+
+def write_sources(directory, scale):
+    """Sources synthétiques : questions.txt avec thèmes renumérotés, examen.txt recopié"""
+    with open(QUESTIONS_FILE, "r", encoding="utf-8") as f:
+        questions = f.read()
+    with open(EXAM_FILE, "r", encoding="utf-8") as f:
+        exam = f.read()
+
+    paths = (os.path.join(directory, f"questions_{scale}x.txt"), os.path.join(directory, f"examen_{scale}x.txt"))
+    with open(paths[0], "w", encoding="utf-8") as f:
+        for copy in range(scale):
+            f.write(re.sub(r"^Thème (\d+)", lambda m: f"Thème {copy * 100 + int(m.group(1))}", questions, flags=re.M))
+            f.write("\n")
+    with open(paths[1], "w", encoding="utf-8") as f:
+        for _ in range(scale):
+            f.write(exam)
+            f.write("\n")
+    return paths
+
+
+def regex_run(parser, path):
+    with open(path, "r", encoding="utf-8") as f:
+        return parser(f.read())
+
+
+def stream_run(parser, path):
+    with open(path, "r", encoding="utf-8") as f:
+        return parser(f)
+
+
+def blocks_only(path, **options):
+    """Automate seul : compte les questions sans les conserver"""
+    with open(path, "r", encoding="utf-8") as f:
+        return sum(kind == 'question' for kind, _ in iter_question_blocks(f, **options))
+
+
+def measure(func):
+    """(meilleur temps en ms, pic mémoire en Mo, résultat)"""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - start) * 1e3
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 2**20, result
+
+
+def output_json(themes):
+    """JSON des questions tel qu'écrit par les scripts (hors clé 'content' de l'ancien parseur)"""
+    return json.dumps({key: [theme['title'], theme['questions']] for key, theme in themes.items()},
+                      ensure_ascii=False, indent=2)
+
+
+def main():
+    print(f"{'source':<22}{'regex':>12}{'flux':>12}{'pic regex':>13}{'pic flux':>12}{'automate seul':>16}{'JSON':>14}")
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, "w") as devnull:
+        for scale in SCALES:
+            questions_path, exam_path = write_sources(directory, scale)
+            cases = [
+                ("questions.txt", questions_path, regex_parse_questions, parse_questions_by_theme,
+                 {'compact': True, 'section_pattern': re.compile(THEME_PATTERN)}),
+                ("examen.txt", exam_path, regex_parse_exam, parse_exam_questions, {'theme_line': True}),
+            ]
+            for name, path, old, new, options in cases:
+                # Le dédoublonnage de examen.txt affiche chaque groupe : sortie masquée
+                with contextlib.redirect_stdout(devnull):
+                    old_ms, old_peak, old_result = measure(lambda: regex_run(old, path))
+                    new_ms, new_peak, new_result = measure(lambda: stream_run(new, path))
+                    _, blocks_peak, _ = measure(lambda: blocks_only(path, **options))
+                same = "identique" if output_json(old_result) == output_json(new_result) else "différent"
+                label = f"{name} {scale}x"
+                print(f"{label:<22}{old_ms:>9.0f} ms{new_ms:>9.0f} ms{old_peak:>10.1f} Mo{new_peak:>9.1f} Mo"
+                      f"{blocks_peak:>13.2f} Mo{same:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark : probabilité de réussite à l'examen, simulation question par question vs NumPy vectorisé
+
+Boucle : chaque examen simulé tire 56 + 64 questions sans remise
+(random.sample) puis une bonne ou mauvaise réponse par question ; mesurée
+sur LOOP_SIMULATIONS examens puis ramenée à 100 000. Vectorisé :
+estimate_pass_probability (loi exacte des questions réussies de la partie,
+puis tirage hypergéométrique des questions de l'examen) sur 100 000 examens.
+
+Probabilités de bonne réponse : PROFILES apprenants (taux de réussite de
+partie, dont une partie des questions déjà répondues en examen blanc).
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_pass_estimator.py
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.answer_store import EXAM_PART_SIZES
+from modules.pass_estimator import SIMULATIONS, estimate_pass_probability, pass_threshold, question_estimates
+
+POOL_SIZES = {1: 171, 2: 161}
+LOOP_SIMULATIONS = 5_000
+REPEATS = 10
+PROFILES = {
+    'débutant': (0.60, 0.55),
+    'en progrès': (0.80, 0.76),
+    'prêt': (0.90, 0.88),
+}
+
+
+def profile_estimates(priors, rng):
+    """Probabilités par question : un tiers des questions déjà vues en examen blanc"""
+    estimates = {}
+    for part, prior in zip((1, 2), priors):
+        seen = rng.sample(range(POOL_SIZES[part]), POOL_SIZES[part] // 3)
+        evidence = {index: (int(rng.random() < prior), 1) for index in seen}
+        estimates[part] = question_estimates(POOL_SIZES[part], prior, evidence)
+    return estimates
+
+
+def loop_pass_probability(estimates, simulations, rng):
+    pools = {part: list(values) for part, values in estimates.items()}
+    passed = 0
+    for _ in range(simulations):
+        ok = True
+        for part, pool in pools.items():
+            drawn = rng.sample(pool, EXAM_PART_SIZES[part])
+            correct = sum(rng.random() < p for p in drawn)
+            ok = ok and correct >= pass_threshold(EXAM_PART_SIZES[part])
+        passed += ok
+    return passed / simulations
+
+
+def main():
+    rng = random.Random(7)
+    print(f"{'profil':<14}{'boucle (100k)':>16}{'NumPy (100k)':>16}{'gain':>9}{'P boucle':>11}{'P NumPy':>10}")
+    for label, priors in PROFILES.items():
+        estimates = profile_estimates(priors, rng)
+
+        start = time.perf_counter()
+        loop_probability = loop_pass_probability(estimates, LOOP_SIMULATIONS, rng)
+        loop_ms = (time.perf_counter() - start) * 1e3 * SIMULATIONS / LOOP_SIMULATIONS
+
+        durations = []
+        for repeat in range(REPEATS):
+            start = time.perf_counter()
+            result = estimate_pass_probability(estimates, seed=repeat)
+            durations.append(time.perf_counter() - start)
+        numpy_ms = statistics.median(durations) * 1e3
+
+        print(f"{label:<14}{loop_ms:>13.0f} ms{numpy_ms:>13.1f} ms{loop_ms / numpy_ms:>8.0f}x"
+              f"{loop_probability:>11.1%}{result['probability']:>10.1%}")
+
+
+if __name__ == "__main__":
+    main()
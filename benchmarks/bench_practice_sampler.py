@@ -0,0 +1,101 @@
+"""
+Benchmark : tirage pondéré de l'entraînement mixte, liste de poids vs arbres de Fenwick
+
+Liste : poids de toutes les questions (poids de la question × facteur du
+module) recalculés puis tirage random.choices à chaque question, comme le
+ferait un tirage naïf après chaque réponse. Fenwick : PracticeSampler, un
+tirage (descente des arbres) puis une mise à jour du poids de la question et
+du facteur de son module.
+
+Banques de 560 questions (1x), 5 600 (10x) et 56 000 (100x) réparties en
+12 modules ; chaque durée est la médiane de REPEATS couples tirage + réponse.
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_practice_sampler.py
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.practice_sampler import (
+    CORRECT_WEIGHT, ERROR_WEIGHT, UNSEEN_WEIGHT, PracticeSampler, module_factor
+)
+
+MODULES = 12
+QUESTIONS = 560
+SCALES = [1, 10, 100]
+REPEATS = 300
+
+
+def initial_state(scale, rng):
+    """Poids et compteurs de modules d'un apprenant ayant répondu à un tiers de la banque"""
+    per_module = QUESTIONS * scale // MODULES
+    weights = {}
+    counters = {}
+    for module_id in range(1, MODULES + 1):
+        module_weights = [rng.choice((UNSEEN_WEIGHT, UNSEEN_WEIGHT, CORRECT_WEIGHT, ERROR_WEIGHT))
+                          for _ in range(per_module)]
+        weights[module_id] = module_weights
+        answered = sum(weight != UNSEEN_WEIGHT for weight in module_weights)
+        correct = sum(weight == CORRECT_WEIGHT for weight in module_weights)
+        counters[module_id] = [correct, answered]
+    return weights, counters
+
+
+def answer(counters, module_id, rng):
+    """Nouveau poids de la question tirée et facteur de son module"""
+    correct = rng.random() < 0.7
+    counters[module_id][0] += correct
+    counters[module_id][1] += 1
+    return (CORRECT_WEIGHT if correct else ERROR_WEIGHT), module_factor(*counters[module_id])
+
+
+def list_step(weights, counters, rng):
+    refs = [(module_id, position) for module_id, module_weights in weights.items()
+            for position in range(len(module_weights))]
+    factors = {module_id: module_factor(*counters[module_id]) for module_id in weights}
+    flat = [weight * factors[module_id] for module_id, module_weights in weights.items() for weight in module_weights]
+    module_id, position = rng.choices(refs, weights=flat)[0]
+    weights[module_id][position], _ = answer(counters, module_id, rng)
+
+
+def fenwick_step(sampler, counters, rng):
+    module_id, position = sampler.sample(rng)
+    weight, factor = answer(counters, module_id, rng)
+    sampler.update(module_id, position, weight, factor)
+
+
+def median_us(step):
+    durations = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        step()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1e6
+
+
+def main():
+    print(f"{'banque':<18}{'liste':>12}{'Fenwick':>12}{'gain':>9}{'construction':>15}")
+    for scale in SCALES:
+        rng = random.Random(scale)
+        weights, counters = initial_state(scale, rng)
+        list_us = median_us(lambda: list_step(weights, counters, rng))
+
+        weights, counters = initial_state(scale, random.Random(scale))
+        start = time.perf_counter()
+        sampler = PracticeSampler(
+            weights, {module_id: module_factor(*counts) for module_id, counts in counters.items()}
+        )
+        build_ms = (time.perf_counter() - start) * 1e3
+        fenwick_us = median_us(lambda: fenwick_step(sampler, counters, rng))
+
+        label = f"{len(sampler)} questions"
+        print(f"{label:<18}{list_us:>9.1f} µs{fenwick_us:>9.1f} µs{list_us / fenwick_us:>8.1f}x{build_ms:>12.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark : backends de progression (json, journal, sqlite, memory)
+
+Pour chaque backend et plusieurs tailles d'historique, mesure la latence d'une
+écriture d'une réponse validée (ce que fait le thread de sauvegarde pour un
+lot d'un seul événement) et l'amplification d'écriture : octets réellement
+écrits sur disque / octets de l'événement.
+
+Les octets écrits sont lus dans /proc/self/io (Linux) ; ailleurs la colonne
+affiche « n/d ».
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_progress_store.py
+"""
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.progress_store import PROGRESS_BACKENDS, create_progress_store
+from modules.question_bank import QuestionBank
+
+QUESTIONS_FILE = "data/questions.json"
+HISTORY_SIZES = [100, 1000, 5000]
+WRITES = 200
+LEARNER_ID = "bench"
+
+
+def written_bytes():
+    """Octets écrits par le processus depuis son démarrage (None si non disponible)"""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            for line in f:
+                if line.startswith('wchar:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def training_keys(bank):
+    return [f"{module['id']}_{question['id']}" for module in bank.modules for question in module['questions']]
+
+
+def history(keys, size, rng):
+    """Historique de `size` réponses (clés d'entraînement puis clés d'examen fictives)"""
+    answers = {}
+    for i in range(size):
+        key = keys[i] if i < len(keys) else f"exam{i // 120 + 1}_{'env' if i % 120 < 56 else 'tech'}_{i % 120 % 64 + 1}"
+        answers[key] = rng.choice('ABC')
+    return answers
+
+
+def measure(backend, keys, size):
+    directory = tempfile.mkdtemp(prefix=f"bench_{backend}_")
+    try:
+        rng = random.Random(size)
+        store = create_progress_store(backend, directory)
+        store.import_answers(LEARNER_ID, history(keys, size, rng))
+        store.start_session(LEARNER_ID)
+
+        events = [{'k': rng.choice(keys), 'v': rng.choice('ABC')} for _ in range(WRITES)]
+        payload = sum(len(json.dumps(event)) + 1 for event in events)
+
+        before = written_bytes()
+        start = time.perf_counter()
+        for event in events:
+            store.apply_events(LEARNER_ID, [event])
+        latency = (time.perf_counter() - start) / WRITES * 1e3
+        after = written_bytes()
+        store.close()
+
+        amplification = None if before is None else (after - before) / payload
+        return latency, amplification
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    bank = QuestionBank.from_file(QUESTIONS_FILE)
+    keys = training_keys(bank)
+
+    print(f"{WRITES} réponses validées écrites une à une, par taille d'historique")
+    print(f"{'backend':<10}{'historique':>12}{'latence':>14}{'amplification':>16}")
+    for backend in PROGRESS_BACKENDS:
+        for size in HISTORY_SIZES:
+            latency, amplification = measure(backend, keys, size)
+            amplification_text = "n/d" if amplification is None else f"{amplification:.0f}x"
+            print(f"{backend:<10}{size:>12}{latency:>11.3f} ms{amplification_text:>16}")
+
+if __name__ == "__main__":
+    main()
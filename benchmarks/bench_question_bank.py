@@ -0,0 +1,84 @@
+"""
+Benchmark : copie par rerun (st.cache_data) vs banque partagée (QuestionBank)
+
+st.cache_data renvoie à chaque appel une copie dé-sérialisée de la valeur mise
+en cache. On simule ce comportement par pickle.loads() sur les octets en cache,
+et on le compare au renvoi de la même instance QuestionBank immuable.
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_question_bank.py
+"""
+import json
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.question_bank import QuestionBank
+
+QUESTIONS_FILE = "data/questions.json"
+RERUNS_PER_LEARNER = 20
+LEARNER_COUNTS = [1, 10, 50, 100]
+
+
+def make_loaders():
+    """Retourne les deux stratégies de chargement à comparer"""
+    with open(QUESTIONS_FILE, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    cached_bytes = pickle.dumps(raw, protocol=pickle.HIGHEST_PROTOCOL)
+    shared_bank = QuestionBank(raw)
+
+    def cache_data_loader():
+        return pickle.loads(cached_bytes)
+
+    def shared_loader():
+        return shared_bank.data
+
+    return {"cache_data (copie)": cache_data_loader, "QuestionBank (partagée)": shared_loader}
+
+
+def simulate_learner(loader):
+    """Simule les reruns d'une session : charge la banque et lit le premier module"""
+    durations = []
+    data = None
+    for _ in range(RERUNS_PER_LEARNER):
+        start = time.perf_counter()
+        data = loader()
+        _ = data['modules'][0]['questions'][0]['correct_answer']
+        durations.append(time.perf_counter() - start)
+    # La session garde la dernière valeur (comme st.session_state.current_module)
+    return durations, data
+
+
+def run(loader, learners):
+    """Exécute `learners` sessions concurrentes et mesure latence et allocations"""
+    tracemalloc.start()
+    with ThreadPoolExecutor(max_workers=learners) as pool:
+        results = list(pool.map(lambda _: simulate_learner(loader), range(learners)))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    durations = sorted(d for session_durations, _ in results for d in session_durations)
+    median_ms = durations[len(durations) // 2] * 1000
+    p95_ms = durations[int(len(durations) * 0.95)] * 1000
+    retained_kb = current / learners / 1024
+    return median_ms, p95_ms, retained_kb, peak / 1024
+
+
+def main():
+    loaders = make_loaders()
+    print(f"{'Stratégie':<26}{'Sessions':>9}{'médiane':>11}{'p95':>11}{'retenu/session':>17}{'pic':>12}")
+    for learners in LEARNER_COUNTS:
+        for name, loader in loaders.items():
+            median_ms, p95_ms, retained_kb, peak_kb = run(loader, learners)
+            print(f"{name:<26}{learners:>9}{median_ms:>9.3f}ms{p95_ms:>9.3f}ms"
+                  f"{retained_kb:>14.1f} KB{peak_kb:>9.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark : file des révisions, parcours de toutes les fiches vs tas par échéance
+
+Parcours : la prochaine fiche due est le minimum des échéances de toutes les
+fiches, les fiches du jour sont filtrées puis triées. Tas : ReviewScheduler
+(next_due, due(limit=...) et review d'une fiche, entrées périmées comprises).
+
+Fiches des 560 questions d'entraînement plus 200 erreurs d'examen (1x), puis
+recopiées 10x et 100x ; échéances étalées sur 60 jours, ~5 % dues aujourd'hui.
+Chaque durée est la médiane de REPEATS mesures.
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_review_scheduler.py
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.review_scheduler import DUE, ReviewScheduler, exam_card_key, today_number
+
+TRAINING_CARDS = 560
+EXAM_ERROR_CARDS = 200
+SCALES = [1, 10, 100]
+REPEATS = 200
+DAILY_LIMIT = 30
+SPREAD_DAYS = 60
+
+
+def make_cards(scale, today, rng):
+    """Fiches aux échéances aléatoires (jusqu'à SPREAD_DAYS jours de retard ou d'avance)"""
+    cards = {}
+    for copy in range(scale):
+        keys = [f"{copy * 100 + i // 50 + 1}_{i % 50 + 1}" for i in range(TRAINING_CARDS)]
+        keys += [exam_card_key(copy * 100 + 1 + i % 2, i) for i in range(EXAM_ERROR_CARDS)]
+        for key in keys:
+            due = today + rng.randint(-SPREAD_DAYS // 20, SPREAD_DAYS)
+            cards[key] = [1, 6, 2.5, due, 0, due - 6]
+    return cards
+
+
+def linear_next_due(cards):
+    return min((card[DUE], key) for key, card in cards.items())
+
+
+def linear_due(cards, today, limit):
+    return [key for _, key in sorted((card[DUE], key) for key, card in cards.items() if card[DUE] <= today)][:limit]
+
+
+def median_us(function):
+    durations = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1e6
+
+
+def bench(scale):
+    rng = random.Random(scale)
+    today = today_number()
+    cards = make_cards(scale, today, rng)
+    scheduler = ReviewScheduler(cards)
+    keys = list(cards)
+
+    assert scheduler.next_due() == linear_next_due(cards)
+    assert scheduler.due(today, DAILY_LIMIT) == linear_due(cards, today, DAILY_LIMIT)
+
+    def review_one():
+        scheduler.review(rng.choice(keys), rng.random() < 0.8, today)
+
+    rows = [
+        ("prochaine fiche due", median_us(lambda: linear_next_due(scheduler.cards)), median_us(scheduler.next_due)),
+        (f"série du jour ({DAILY_LIMIT} fiches)", median_us(lambda: linear_due(scheduler.cards, today, DAILY_LIMIT)),
+         median_us(lambda: scheduler.due(today, DAILY_LIMIT))),
+        ("révision d'une fiche", None, median_us(review_one)),
+    ]
+    due_today = len(linear_due(scheduler.cards, today, None))
+    print(f"\n{scale}x : {len(cards)} fiches, {due_today} dues aujourd'hui")
+    print(f"{'opération':<32}{'parcours':>12}{'tas':>12}{'gain':>9}")
+    for label, scan, heap in rows:
+        if scan is None:
+            print(f"{label:<32}{'-':>12}{heap:>9.1f} µs{'-':>9}")
+        else:
+            print(f"{label:<32}{scan:>9.1f} µs{heap:>9.1f} µs{scan / heap:>8.1f}x")
+
+
+def main():
+    for scale in SCALES:
+        bench(scale)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark : score par boucle Python vs moteur vectorisé (ScoringEngine)
+
+Compare le calcul des scores de tous les modules, tel que fait par le tableau
+de bord, sur la banque réelle puis sur des banques synthétiques plus grandes.
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_scoring.py
+"""
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.question_bank import QuestionBank
+from modules.scoring import ScoringEngine
+
+QUESTIONS_FILE = "data/questions.json"
+SCALE_FACTORS = [1, 10, 50]
+ANSWERED_RATIO = 0.6
+REPEATS = 20
+
+
+def scale_bank(raw, factor):
+    """Duplique chaque module `factor` fois pour simuler une banque plus grande"""
+    modules = []
+    for module in raw['modules']:
+        questions = []
+        for copy in range(factor):
+            for question in module['questions']:
+                questions.append(dict(question, id=copy * len(module['questions']) + question['id']))
+        modules.append(dict(module, questions=questions, total_questions=len(questions)))
+    total = sum(len(m['questions']) for m in modules)
+    return {'metadata': dict(raw['metadata'], total_questions=total), 'modules': modules}
+
+
+def random_answers(raw, rng):
+    """Génère des réponses aléatoires pour une partie des questions"""
+    answers = {}
+    for module in raw['modules']:
+        for question in module['questions']:
+            if rng.random() < ANSWERED_RATIO:
+                answers[f"{module['id']}_{question['id']}"] = rng.choice('ABC')
+    return answers
+
+
+def loop_scores(raw, user_answers):
+    """Ancienne implémentation : une f-string et une recherche par question"""
+    scores = {}
+    for module in raw['modules']:
+        correct = total = 0
+        for question in module['questions']:
+            unique_q_id = f"{module['id']}_{question['id']}"
+            if unique_q_id in user_answers:
+                total += 1
+                if user_answers[unique_q_id] == question['correct_answer']:
+                    correct += 1
+        scores[module['id']] = (correct, total)
+    return scores
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        result = func(*args)
+    return (time.perf_counter() - start) / REPEATS * 1000, result
+
+
+def main():
+    with open(QUESTIONS_FILE, "r", encoding="utf-8") as f:
+        base = json.load(f)
+
+    rng = random.Random(0)
+    print(f"{'Questions':>10}{'boucle':>12}{'encodage':>12}{'vectorisé':>12}{'scores seuls':>14}")
+    for factor in SCALE_FACTORS:
+        raw = scale_bank(base, factor)
+        engine = ScoringEngine(QuestionBank(raw))
+        user_answers = random_answers(raw, rng)
+
+        loop_ms, expected = timed(loop_scores, raw, user_answers)
+        encode_ms, answers = timed(engine.encode_answers, user_answers)
+        vector_ms, result = timed(engine.scores_by_module, answers)
+        assert result == expected
+
+        print(f"{len(engine.answer_key):>10}{loop_ms:>10.3f}ms{encode_ms:>10.3f}ms"
+              f"{encode_ms + vector_ms:>10.3f}ms{vector_ms:>12.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark : recherche par mots-clés, parcours du texte vs index inversé positionnel
+
+Parcours : chaque question (énoncé + options) est normalisée une fois
+(fold_text), puis chaque requête teste la présence de chaque mot dans le
+texte de chaque question. Index : SearchIndex chargé depuis le JSON écrit au
+build, requête sur les postings de ses termes (ET, expressions entre
+guillemets, complétion du dernier mot).
+
+Banques d'entraînement 1x (560 questions) et 10x (modules recopiés), plus
+la banque d'examen ; chaque durée est la médiane de REPEATS requêtes. Le
+script vérifie d'abord que les index écrits par data/search_build.py sont
+identiques à ceux que construit SearchIndex.
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_search.py
+"""
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.search_index import SearchIndex, fold_text, question_fields
+
+QUESTIONS_FILE = "data/questions.json"
+EXAM_QUESTIONS_FILE = "data/exam_questions.json"
+INDEX_FILES = {QUESTIONS_FILE: "data/questions_index.json", EXAM_QUESTIONS_FILE: "data/exam_questions_index.json"}
+SCALES = [1, 10]
+REPEATS = 200
+QUERIES = ["dépositaire", "OPCVM prospectus", "dépos", "\"abus de marché\"", "autorité des marchés financiers", "de"]
+
+
+def scaled_bank(data, scale):
+    """Banque recopiée scale fois (identifiants de modules décalés)"""
+    modules = []
+    for copy in range(scale):
+        for module in data['modules']:
+            modules.append(dict(module, id=module['id'] + copy * 100))
+    return {'metadata': data['metadata'], 'modules': modules}
+
+
+def linear_search(documents, query):
+    """Questions dont le texte normalisé contient tous les mots de la requête"""
+    words = fold_text(query.replace('"', ' ')).split()
+    return [reference for reference, text in documents if all(word in text for word in words)]
+
+
+def median_us(search, query):
+    durations = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        search(query)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1e6
+
+
+def bench(label, data):
+    documents = [
+        ((module['id'], question['id']), ' '.join(fold_text(text) for text in question_fields(question)))
+        for module in data['modules'] for question in module['questions']
+    ]
+    start = time.perf_counter()
+    serialized = json.dumps(SearchIndex.from_bank_data(data).to_dict(), separators=(',', ':'))
+    build_ms = (time.perf_counter() - start) * 1e3
+    start = time.perf_counter()
+    index = SearchIndex.from_dict(json.loads(serialized))
+    load_ms = (time.perf_counter() - start) * 1e3
+
+    print(f"\n{label} : {len(documents)} questions, {len(index.vocabulary)} termes, "
+          f"index {len(serialized) / 1024:.0f} Ko (build {build_ms:.0f} ms, chargement {load_ms:.0f} ms)")
+    print(f"{'requête':<34}{'parcours':>12}{'index':>12}{'gain':>9}{'résultats':>11}")
+    for query in QUERIES:
+        scan = median_us(lambda q: linear_search(documents, q), query)
+        indexed = median_us(index.search, query)
+        found = len(index.search(query))
+        print(f"{query:<34}{scan:>9.0f} µs{indexed:>9.0f} µs{scan / indexed:>8.1f}x{found:>11}")
+
+
+def check_build_index(bank_file, data):
+    """L'index du build (format écrit sans le paquet modules) doit être celui de SearchIndex"""
+    with open(INDEX_FILES[bank_file], "r", encoding="utf-8") as f:
+        written = json.load(f)
+    written.pop('source', None)
+    assert written == SearchIndex.from_bank_data(data).to_dict(), f"{INDEX_FILES[bank_file]} diffère de SearchIndex"
+
+
+def main():
+    with open(QUESTIONS_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    with open(EXAM_QUESTIONS_FILE, "r", encoding="utf-8") as f:
+        exam_data = json.load(f)
+    check_build_index(QUESTIONS_FILE, data)
+    check_build_index(EXAM_QUESTIONS_FILE, exam_data)
+    print("✅ Index du build identiques à SearchIndex")
+    for scale in SCALES:
+        bench(f"Entraînement {scale}x", scaled_bank(data, scale))
+    bench("Examens", exam_data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark : octets envoyés au navigateur par rerun, CSS injecté vs feuille de style statique
+
+Affiche l'accueil, le thème 6 et un examen blanc avec streamlit.testing
+(AppTest) et additionne la taille des protos des éléments de chaque rerun :
+- « injecté » : server.enableStaticServing désactivé, la feuille de style
+  complète est envoyée à chaque rerun (comportement précédent)
+- « statique » : feuille de style générée une fois dans static/ (nom haché)
+  et posée dans la page par le composant theme_link ; l'accusé du navigateur
+  est simulé après l'accueil, les reruns suivants n'envoient plus rien
+
+La progression est gardée en mémoire (AMF_PROGRESS_BACKEND=memory) : le
+dossier checkpoint n'est pas touché.
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/bench_stylesheet.py
+"""
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ["AMF_PROGRESS_BACKEND"] = "memory"
+
+from streamlit import config as st_config
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from streamlit.testing.v1 import AppTest
+
+APP_TIMEOUT = 120
+
+
+def click(at, label):
+    button = next(b for b in at.button if label in b.label)
+    button.click().run(timeout=APP_TIMEOUT)
+    assert not at.exception, at.exception
+
+
+def stylesheet_links(at):
+    """Éléments du composant theme_link de la page"""
+    return [node for node in at._tree if getattr(node, 'type', None) == 'component_instance'
+            and node.proto.component_name.endswith('theme_link')]
+
+
+def acknowledge_stylesheet(at):
+    """Renvoie la valeur que le composant envoie une fois la balise <link> posée"""
+    for node in stylesheet_links(at):
+        states = at._tree.get_widget_states()
+        href = json.loads(node.proto.json_args)['href']
+        states.widgets.append(WidgetState(id=node.proto.id, json_value=json.dumps(href)))
+        at._run(states)
+        assert not at.exception, at.exception
+
+
+def rerun_bytes(at):
+    """(octets des protos de la page, octets des éléments <style> et du composant theme_link)"""
+    links = {id(node) for node in stylesheet_links(at)}
+    total = style = 0
+    for node in at._tree:
+        proto = getattr(node, 'proto', None)
+        if proto is None:
+            continue
+        size = proto.ByteSize()
+        total += size
+        if '<style' in getattr(proto, 'body', '') or id(node) in links:
+            style += size
+    return total, style
+
+
+def measure_pages(static_serving):
+    st_config.set_option("server.enableStaticServing", static_serving)
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=APP_TIMEOUT)
+    at.run()
+    assert not at.exception, at.exception
+    pages = [("Accueil", rerun_bytes(at))]
+    acknowledge_stylesheet(at)
+    click(at, "🎯 Commencer Thème 6")
+    at.radio[0].set_value("A").run(timeout=APP_TIMEOUT)
+    pages.append(("Thème 6", rerun_bytes(at)))
+    click(at, "🏠 Retour au menu")
+    click(at, "🚀 Commencer l'Examen #1")
+    pages.append(("Examen #1", rerun_bytes(at)))
+    return pages
+
+
+def main():
+    before = measure_pages(False)
+    after = measure_pages(True)
+
+    print(f"{'page':<12}{'injecté':>14}{'dont CSS':>12}{'statique':>14}{'dont CSS':>12}")
+    for (page, (total_before, css_before)), (_, (total_after, css_after)) in zip(before, after):
+        print(f"{page:<12}{total_before:>11} o{css_before:>10} o{total_after:>11} o{css_after:>10} o")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+# data/build_cache.py
+"""
+Cache de build incrémental des scripts de conversion
+
+Chaque bloc « Question N » de la source est identifié par le hachage SHA-256
+de ses lignes : un bloc déjà vu au build précédent reprend son résultat
+d'analyse (question, blocs signalés) sans repasser par l'automate, seuls les
+blocs nouveaux ou modifiés sont analysés. Les étapes plus coûteuses
+(dédoublonnage, quasi-doublons) sont mémorisées de la même façon, par hachage
+de leurs entrées. Le cache est un fichier JSON par source dans
+CACHE_DIRECTORY ; il est invalidé dès que le code des scripts change.
+
+Un résultat mémorisé garde la liste des entrées lues ou écrites pendant son
+calcul (memoize) : quand il est repris, elles sont reprises avec lui, pour
+que le prochain build qui le recalcule les retrouve.
+
+Les sorties sont écrites de façon atomique (fichier temporaire puis
+os.replace) et seulement si leur contenu change.
+"""
+import glob
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, List, Optional
+
+from question_parser import QUESTION_LINE
+
+CACHE_DIRECTORY = ".build_cache"
+CACHE_ENV = "AMF_BUILD_CACHE"
+MAX_LISTED_CHANGES = 10
+
+
+def _code_fingerprint():
+    """Hachage du code des scripts de data/ : une modification invalide le cache"""
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*.py"))):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def content_hash(*data) -> str:
+    """Hachage SHA-256 d'une valeur sérialisable en JSON"""
+    text = json.dumps(data, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def block_hash(options: List, length: int, block_lines: List[str]) -> str:
+    """Hachage SHA-256 d'un bloc de la source et des options d'analyse"""
+    digest = hashlib.sha256(f"{options}:{length}".encode('utf-8'))
+    for line in block_lines:
+        digest.update(b"\0")
+        digest.update(line.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def write_json_atomic(path: str, data, indent: Optional[int] = 2) -> bool:
+    """
+    Écrit data en JSON (ensure_ascii=False) si le contenu change
+
+    Le fichier est d'abord écrit à côté puis renommé : un lecteur voit
+    l'ancienne ou la nouvelle version, jamais un fichier partiel.
+
+    Returns:
+        True si le fichier a été (ré)écrit, False s'il était identique
+    """
+    text = json.dumps(data, ensure_ascii=False, indent=indent)
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            if f.read() == text:
+                return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
+
+
+class BuildCache:
+    """
+    Cache de build d'une source (questions.txt, examen.txt)
+
+    Seules les entrées utilisées par le build courant sont réécrites par
+    save() : le cache ne grossit pas avec les versions successives.
+    """
+
+    def __init__(self, source_name: str, directory: str = CACHE_DIRECTORY):
+        self.path = os.path.join(directory, f"{source_name}.json")
+        self.fingerprint = _code_fingerprint()
+        self.previous = {'blocks': {}, 'memo': {}, 'dependencies': {}, 'order': []}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get('fingerprint') == self.fingerprint:
+                self.previous = cached
+        except (FileNotFoundError, ValueError):
+            pass
+
+        self.blocks = {}
+        self.memo = {}
+        self.dependencies = {}
+        self.order = []
+        self.outputs = {}
+        self._recorders = []
+        self.changed = []  # (ligne, numéro de question ou None) des blocs analysés
+
+    @property
+    def cold(self) -> bool:
+        """Aucun build précédent réutilisable"""
+        return not self.previous['order']
+
+    def get(self, key: str):
+        """Résultat mémorisé pour cette clé (None si absent)"""
+        if key not in self.memo:
+            if key not in self.previous['memo']:
+                return None
+            self._keep(key)
+        self._record(key)
+        return self.memo[key]
+
+    def put(self, key: str, value) -> None:
+        self.memo[key] = value
+        self._record(key)
+
+    def memoize(self, key: str, compute):
+        """
+        compute() mémorisé sous cette clé
+
+        Les entrées lues ou écrites pendant le calcul sont rattachées au
+        résultat : elles restent dans le cache tant qu'il est repris.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        used = []
+        self._recorders.append(used)
+        try:
+            value = compute()
+        finally:
+            self._recorders.pop()
+        if used:
+            self.dependencies[key] = used
+        self.put(key, value)
+        return value
+
+    def _record(self, key: str) -> None:
+        for used in self._recorders:
+            used.append(key)
+
+    def _keep(self, key: str) -> None:
+        """Reprend une entrée du build précédent et celles dont elle dépend"""
+        pending = [key]
+        while pending:
+            key = pending.pop()
+            if key in self.memo or key not in self.previous['memo']:
+                continue
+            self.memo[key] = self.previous['memo'][key]
+            used = self.previous.get('dependencies', {}).get(key)
+            if used:
+                self.dependencies[key] = used
+                pending.extend(used)
+
+    def block_key(self, options: List, first_line: int, block_lines: List[str], end_line: int) -> str:
+        """Clé d'un bloc de iter_raw_blocks : ses lignes, sa longueur et les options d'analyse"""
+        return block_hash(options, end_line - first_line, block_lines)
+
+    def cached_block(self, key: str) -> Optional[Dict]:
+        """Résultat de parse_block d'un bloc déjà analysé (None si nouveau ou modifié)"""
+        return self.blocks.get(key) or self.previous['blocks'].get(key)
+
+    def use_block(self, key: str, entry: Dict, first_line: int, block_lines: List[str], parsed: bool) -> None:
+        """
+        Garde le résultat d'un bloc du build courant
+
+        Le résultat est gardé avec des numéros de ligne relatifs au début du
+        bloc : un bloc simplement déplacé (lignes ajoutées avant lui) reste
+        en cache.
+        """
+        self.blocks[key] = entry
+        self.order.append(key)
+        if parsed:
+            header = QUESTION_LINE.match(block_lines[0].strip())
+            self.changed.append((first_line, int(header.group(1)) if header else None))
+
+    def print_changes(self) -> None:
+        """Affiche ce qui a changé depuis le build précédent"""
+        reused = len(self.order) - len(self.changed)
+        if self.cold:
+            print(f"🆕 Cache de build créé: {len(self.order)} blocs analysés")
+            return
+        removed = len(set(self.previous['order']) - set(self.order))
+        print(f"♻️  Cache de build: {reused} blocs inchangés, {len(self.changed)} nouveaux ou modifiés (analysés), "
+              f"{removed} anciennes versions retirées")
+        for line, number in self.changed[:MAX_LISTED_CHANGES]:
+            label = f"Question {number}" if number is not None else "Texte hors question"
+            print(f"   ✏️  {label} (ligne {line}): nouveau ou modifié")
+        if len(self.changed) > MAX_LISTED_CHANGES:
+            print(f"   ... et {len(self.changed) - MAX_LISTED_CHANGES} autres blocs")
+
+    def write_json(self, path: str, data, indent: Optional[int] = 2) -> bool:
+        """
+        write_json_atomic, sans même resérialiser une sortie inchangée
+
+        L'indentation force l'encodeur JSON pur Python : une sortie dont le
+        hachage (encodage compact, rapide) et le fichier sont ceux du build
+        précédent n'est pas régénérée.
+        """
+        digest = content_hash(data)
+        previous = self.previous.get('outputs', {}).get(path)
+        try:
+            stat = os.stat(path)
+            signature = [digest, stat.st_size, stat.st_mtime_ns]
+        except FileNotFoundError:
+            signature = None
+        if signature is not None and signature == previous:
+            self.outputs[path] = previous
+            return False
+
+        rewritten = write_json_atomic(path, data, indent)
+        stat = os.stat(path)
+        self.outputs[path] = [digest, stat.st_size, stat.st_mtime_ns]
+        return rewritten
+
+    def save(self) -> None:
+        """Écrit (atomiquement) les entrées utilisées par ce build"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        write_json_atomic(self.path, {
+            'fingerprint': self.fingerprint,
+            'order': self.order,
+            'blocks': self.blocks,
+            'memo': self.memo,
+            'dependencies': self.dependencies,
+            'outputs': self.outputs,
+        }, indent=None)
+
+
+def open_build_cache(source_name: str) -> Optional[BuildCache]:
+    """Cache de build de la source, ou None si désactivé (AMF_BUILD_CACHE=0)"""
+    if os.environ.get(CACHE_ENV, "1") == "0":
+        return None
+    return BuildCache(source_name)
+
+
+def cached_stage(cache: Optional[BuildCache], stage: str, questions: List[Dict], label: str, compute, *params):
+    """
+    Étape de filtrage (dédoublonnage) mémorisée par hachage de ses entrées
+
+    Args:
+        cache: Cache de build (None : calcul direct)
+        stage: Nom de l'étape
+        questions: Questions filtrées
+        label: Nom du thème pour l'affichage
+        compute: Fonction questions -> (questions_gardées, nombre_supprimées)
+        params: Paramètres de l'étape entrant dans la clé (seuil...)
+
+    Returns:
+        tuple: (questions_gardées, nombre_supprimées), identifiants réattribués 1..n
+    """
+    if cache is None:
+        return compute(questions)
+
+    key = content_hash(stage, params, questions)
+    if cache.get(key) is not None:
+        print(f"♻️  {label}: {stage} repris du cache")
+
+    def kept_indices():
+        unique, _ = compute(questions)
+        unique_ids = {id(question) for question in unique}
+        return [i for i, question in enumerate(questions) if id(question) in unique_ids]
+
+    kept = cache.memoize(key, kept_indices)
+
+    unique = [questions[i] for i in kept]
+    for i, question in enumerate(unique, 1):
+        question['id'] = i
+    return unique, len(questions) - len(unique)
@@ -0,0 +1,199 @@
+# data/near_duplicates.py
+"""
+Détection des quasi-doublons : shingles de caractères, MinHash et buckets LSH
+
+Chaque question (énoncé + options triées, normalisés) devient l'ensemble de
+ses shingles de SHINGLE_SIZE caractères, résumé par une signature MinHash de
+NUM_PERM valeurs. La signature est découpée en bandes : deux questions qui
+partagent une bande tombent dans le même bucket et deviennent candidates.
+Seules les candidates sont comparées (similarité de Jaccard exacte des
+shingles), ce qui évite les n² comparaisons deux à deux. Les paires au-dessus
+du seuil sont regroupées en clusters (union-find).
+
+Avec un cache de build, les signatures et les similarités déjà vérifiées sont
+reprises : seules les questions nouvelles ou modifiées sont re-shinglées.
+"""
+import base64
+import hashlib
+import os
+import zlib
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_THRESHOLD = 0.8
+THRESHOLD_ENV = "AMF_NEAR_DUPLICATE_THRESHOLD"
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+
+# Famille de hachage (a * x + b) mod p : p premier sur 31 bits, x sur 32 bits,
+# le produit tient dans un entier 64 bits
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20250522)
+_A = _rng.randint(1, _PRIME, size=NUM_PERM, dtype=np.int64)
+_B = _rng.randint(0, _PRIME, size=NUM_PERM, dtype=np.int64)
+
+
+def threshold_from_env(default: float = DEFAULT_THRESHOLD) -> float:
+    """Seuil de similarité (0-1), réglable par la variable AMF_NEAR_DUPLICATE_THRESHOLD"""
+    value = os.environ.get(THRESHOLD_ENV)
+    if not value:
+        return default
+    threshold = float(value)
+    if not 0 < threshold <= 1:
+        raise ValueError(f"{THRESHOLD_ENV} doit être compris entre 0 et 1 (reçu: {value})")
+    return threshold
+
+
+def comparable_text(question: Dict) -> str:
+    """Énoncé et options (triées : l'ordre A/B/C n'importe pas), en minuscules et espaces réduits"""
+    options = sorted(' '.join(text.lower().split()) for text in question.get('options', {}).values())
+    return ' | '.join([' '.join(question.get('question', '').lower().split())] + options)
+
+
+def shingles(text: str) -> set:
+    """Ensemble des hachages 32 bits des sous-chaînes de SHINGLE_SIZE caractères"""
+    if len(text) <= SHINGLE_SIZE:
+        return {zlib.crc32(text.encode('utf-8'))}
+    return {zlib.crc32(text[i:i + SHINGLE_SIZE].encode('utf-8')) for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(shingle_set: set) -> np.ndarray:
+    """Signature MinHash : minimum de chaque fonction de hachage sur les shingles"""
+    values = np.fromiter(shingle_set, dtype=np.int64, count=len(shingle_set))
+    return ((_A[:, None] * values[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+
+
+def lsh_bands(threshold: float, num_perm: int = NUM_PERM) -> Tuple[int, int]:
+    """
+    Choisit (bandes, lignes par bande) pour le seuil
+
+    Deux questions de similarité s deviennent candidates avec la probabilité
+    1 - (1 - s^lignes)^bandes, qui bascule vers (1 / bandes)^(1 / lignes).
+    On retient le découpage dont ce point de bascule est le plus proche du
+    seuil par en dessous : peu de faux négatifs, les faux positifs étant
+    écartés par la comparaison exacte.
+    """
+    best = (num_perm, 1)
+    best_point = 0.0
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        point = (1 / bands) ** (1 / rows)
+        if best_point < point <= threshold:
+            best, best_point = (bands, rows), point
+    return best
+
+
+def _find(parents, i):
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+
+def find_near_duplicates(questions: Sequence[Dict], threshold: float = DEFAULT_THRESHOLD, cache=None) -> List[Dict]:
+    """
+    Regroupe les questions dont la similarité de Jaccard atteint le seuil
+
+    Args:
+        questions: Liste de questions ({'question', 'options', ...})
+        threshold: Similarité minimale (0-1) entre deux questions d'un même cluster
+        cache: Objet get(clé) / put(clé, valeur) (BuildCache) gardant signatures
+            et similarités d'un build à l'autre
+
+    Returns:
+        Liste de clusters {'members': [indices triés], 'similarity': plus faible
+        similarité des paires qui ont formé le cluster}, triée par premier indice
+    """
+    texts = [comparable_text(question) for question in questions]
+    keys = [hashlib.sha1(text.encode('utf-8')).hexdigest() for text in texts]
+    sets = {}
+
+    def shingle_set(index):
+        if index not in sets:
+            sets[index] = shingles(texts[index])
+        return sets[index]
+
+    def signature_of(index):
+        cached = cache.get(f"minhash:{keys[index]}") if cache is not None else None
+        if cached is not None:
+            return np.frombuffer(base64.b64decode(cached), dtype=np.uint32)
+        signature = minhash_signature(shingle_set(index)).astype(np.uint32)
+        if cache is not None:
+            cache.put(f"minhash:{keys[index]}", base64.b64encode(signature.tobytes()).decode('ascii'))
+        return signature
+
+    def jaccard_of(i, j):
+        pair_key = "jaccard:" + ":".join(sorted((keys[i], keys[j])))
+        cached = cache.get(pair_key) if cache is not None else None
+        if cached is not None:
+            return cached
+        a, b = shingle_set(i), shingle_set(j)
+        jaccard = len(a & b) / len(a | b)
+        if cache is not None:
+            cache.put(pair_key, jaccard)
+        return jaccard
+
+    bands, rows = lsh_bands(threshold)
+
+    buckets = {}
+    for index in range(len(questions)):
+        signature = signature_of(index)
+        for band in range(bands):
+            key = (band, signature[band * rows:(band + 1) * rows].tobytes())
+            buckets.setdefault(key, []).append(index)
+
+    parents = list(range(len(questions)))
+    similarity = {}
+    compared = set()
+    seen_buckets = set()
+    for members in buckets.values():
+        # Des questions identiques partagent toutes leurs bandes : un même
+        # groupe n'est parcouru qu'une fois
+        if len(members) < 2 or tuple(members) in seen_buckets:
+            continue
+        seen_buckets.add(tuple(members))
+        for position, i in enumerate(members):
+            for j in members[position + 1:]:
+                if (i, j) in compared:
+                    continue
+                compared.add((i, j))
+                root_i, root_j = _find(parents, i), _find(parents, j)
+                if root_i == root_j:
+                    continue
+                jaccard = jaccard_of(i, j)
+                if jaccard < threshold:
+                    continue
+                root = min(root_i, root_j)
+                similarity[root] = min(jaccard, similarity.get(root_i, 1.0), similarity.get(root_j, 1.0))
+                parents[root_i] = parents[root_j] = root
+
+    clusters = {}
+    for index in range(len(questions)):
+        clusters.setdefault(_find(parents, index), []).append(index)
+    return [
+        {'members': members, 'similarity': similarity[root]}
+        for root, members in sorted(clusters.items()) if len(members) > 1
+    ]
+
+
+def print_cluster_report(label: str, clusters: List[Dict], questions: Sequence[Dict], describe) -> None:
+    """
+    Affiche le rapport des clusters de quasi-doublons
+
+    Args:
+        label: Nom de l'ensemble analysé (thème, module mixte...)
+        clusters: Résultat de find_near_duplicates
+        questions: Questions analysées
+        describe: Fonction question -> texte court (identifiants, aperçu)
+    """
+    if not clusters:
+        print(f"✅ {label}: Aucun quasi-doublon ({len(questions)} questions)")
+        return
+    print(f"🔍 {label}: {len(clusters)} clusters de quasi-doublons")
+    for cluster in clusters:
+        print(f"   📋 Cluster de {len(cluster['members'])} questions (similarité ≥ {cluster['similarity']:.2f}):")
+        for position, index in enumerate(cluster['members'], 1):
+            print(f"      {position}. {describe(questions[index])}")
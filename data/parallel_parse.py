@@ -0,0 +1,224 @@
+# data/parallel_parse.py
+"""
+Analyse des sources de questions par lots, dans plusieurs processus
+
+La source est découpée en lots contigus à des lignes « Question N » : à ces
+frontières l'automate repart de zéro, chaque lot peut donc être analysé seul
+(iter_question_blocks) par un processus d'un ProcessPoolExecutor, qui renvoie
+sections, questions et blocs signalés. Les résultats sont fusionnés dans
+l'ordre de la source : ils sont exactement ceux d'une analyse en série.
+
+Avec un cache de build, les blocs sont recherchés un à un dans le cache et
+seuls les blocs nouveaux ou modifiés sont envoyés aux processus (parse_block).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from question_parser import (QUESTION_LINE, MalformedBlock, iter_question_blocks, iter_raw_blocks, parse_block,
+                             replay_block, source_lines)
+
+# Lots par processus : assez pour équilibrer la charge, assez peu pour
+# limiter les allers-retours
+CHUNKS_PER_WORKER = 4
+# En dessous, démarrer les processus coûte plus que l'analyse elle-même
+MIN_PARALLEL_BLOCKS = 200
+MIN_PARALLEL_LINES = 5000
+
+
+def resolve_workers(workers: int) -> int:
+    """Nombre de processus demandé (0 : un par cœur disponible)"""
+    if workers < 0:
+        raise ValueError(f"Nombre de processus invalide: {workers}")
+    if workers == 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def split_chunks(blocks: List, count: int) -> List[List]:
+    """Découpe la liste en au plus count lots contigus de tailles voisines"""
+    size = -(-len(blocks) // max(count, 1))
+    return [blocks[start:start + size] for start in range(0, len(blocks), size)] if blocks else []
+
+
+def split_source(lines: List[str], count: int, section_pattern=None) -> List[Tuple[int, int]]:
+    """
+    Découpe la source en au plus count lots (début, fin) d'indices de lignes
+
+    Chaque lot suivant commence à une ligne « Question N » qui ne suit pas
+    directement un en-tête de section : l'automate y est dans le même état
+    quelle que soit la partie de la source déjà lue.
+    """
+    starts = [0]
+    for k in range(1, count):
+        index = max(k * len(lines) // count, starts[-1] + 1)
+        while index < len(lines):
+            stripped = lines[index].strip()
+            if QUESTION_LINE.match(stripped) and not _follows_section(lines, index, section_pattern):
+                break
+            index += 1
+        if index >= len(lines):
+            break
+        starts.append(index)
+    return list(zip(starts, starts[1:] + [len(lines)]))
+
+
+def _follows_section(lines, index, section_pattern):
+    """La dernière ligne non vide avant index est un en-tête de section"""
+    if section_pattern is None:
+        return False
+    index -= 1
+    while index >= 0 and not lines[index].strip():
+        index -= 1
+    return index >= 0 and section_pattern.match(lines[index].strip()) is not None
+
+
+def _parse_text_chunk(text: str, first_line: int, end_line: Optional[int], compact: bool,
+                      theme_line: bool, section_pattern) -> List[Tuple[str, object]]:
+    """
+    Tâche d'un processus : automate sur un lot de la source
+
+    Les blocs signalés sont insérés entre les événements ('issue', bloc), à
+    l'endroit où l'automate les a signalés. Un objet Match ne passe pas entre
+    processus : une section est renvoyée avec le texte de son en-tête.
+    """
+    issues = []
+    events = []
+    for kind, payload in iter_question_blocks(source_lines(text), issues, compact=compact, theme_line=theme_line,
+                                              section_pattern=section_pattern, first_line=first_line,
+                                              end_line=end_line):
+        events.extend(('issue', issue) for issue in issues)
+        issues.clear()
+        if kind == 'section':
+            line_no, match = payload
+            payload = (line_no, match.string)
+        events.append((kind, payload))
+    events.extend(('issue', issue) for issue in issues)
+    return events
+
+
+def _parse_chunk(chunk: List[Tuple[int, List[str], int]], compact: bool, theme_line: bool) -> List[Dict]:
+    """Tâche d'un processus : parse_block de chaque bloc du lot"""
+    return [parse_block(block_lines, first_line, end_line, compact, theme_line)
+            for first_line, block_lines, end_line in chunk]
+
+
+def parse_blocks_in_pool(blocks: List[Tuple[int, List[str], int]], compact: bool = False,
+                         theme_line: bool = False, workers: int = 1) -> List[Dict]:
+    """
+    parse_block de chaque bloc, réparti entre `workers` processus
+
+    Returns:
+        Résultats dans l'ordre des blocs (en série si un seul processus ou
+        trop peu de blocs)
+    """
+    if workers <= 1 or len(blocks) < MIN_PARALLEL_BLOCKS:
+        return _parse_chunk(blocks, compact, theme_line)
+
+    chunks = split_chunks(blocks, workers * CHUNKS_PER_WORKER)
+    entries = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map rend les lots dans l'ordre de soumission : fusion déterministe
+        for chunk_entries in executor.map(_parse_chunk, chunks,
+                                          [compact] * len(chunks), [theme_line] * len(chunks)):
+            entries.extend(chunk_entries)
+    return entries
+
+
+def iter_parsed_blocks(lines: Iterable[str],
+                       issues: Optional[List[MalformedBlock]] = None,
+                       compact: bool = False,
+                       theme_line: bool = False,
+                       section_pattern=None,
+                       workers: int = 1,
+                       cache=None) -> Iterator[Tuple[str, object]]:
+    """
+    Mêmes événements que iter_question_blocks, avec cache et/ou plusieurs processus
+
+    Sans cache ni processus supplémentaire, c'est iter_question_blocks (en flux).
+
+    Args:
+        lines, issues, compact, theme_line, section_pattern: voir iter_question_blocks
+        workers: Processus d'analyse ; au-delà de 1 la source est lue en entier
+            avant d'être répartie en lots
+        cache: Cache de build (BuildCache) : la source est analysée bloc par
+            bloc, les blocs inchangés ne sont pas réanalysés
+
+    Yields:
+        ('section', (ligne, match)) ou ('question', {...}), dans l'ordre de la source
+    """
+    if issues is None:
+        issues = []
+    if cache is None:
+        if workers <= 1:
+            yield from iter_question_blocks(lines, issues, compact, theme_line, section_pattern)
+        else:
+            yield from _iter_chunks_in_pool(list(lines), issues, compact, theme_line, section_pattern, workers)
+        return
+
+    options = [compact, theme_line]
+    events = iter_raw_blocks(lines, section_pattern)
+    keys = {}
+    parsed = {}
+    if workers > 1:
+        events = list(events)
+        pending = []
+        for kind, payload in events:
+            if kind != 'block':
+                continue
+            keys[payload[0]] = key = cache.block_key(options, *payload)
+            if cache.cached_block(key) is None:
+                pending.append(payload)
+        entries = parse_blocks_in_pool(pending, compact, theme_line, workers)
+        parsed = {first_line: entry for (first_line, _, _), entry in zip(pending, entries)}
+
+    pending_section = None
+    for kind, payload in events:
+        if kind == 'section':
+            pending_section = payload
+            continue
+
+        first_line, block_lines, end_line = payload
+        # Comme l'automate, une section n'est produite qu'avec du contenu
+        if pending_section is not None and any(line.strip() for line in block_lines):
+            yield 'section', pending_section
+            pending_section = None
+
+        key = keys.pop(first_line, None) or cache.block_key(options, *payload)
+        entry = cache.cached_block(key)
+        is_new = entry is None
+        if is_new:
+            entry = parsed.pop(first_line, None) or parse_block(block_lines, first_line, end_line, compact, theme_line)
+        cache.use_block(key, entry, first_line, block_lines, parsed=is_new)
+
+        question = replay_block(entry, first_line, issues)
+        if question is not None:
+            yield 'question', question
+
+
+def _iter_chunks_in_pool(lines: List[str], issues: List[MalformedBlock], compact: bool, theme_line: bool,
+                         section_pattern, workers: int) -> Iterator[Tuple[str, object]]:
+    """Analyse sans cache : un lot de texte par tâche, fusion dans l'ordre de la source"""
+    if len(lines) < MIN_PARALLEL_LINES:
+        yield from iter_question_blocks(lines, issues, compact, theme_line, section_pattern)
+        return
+
+    chunks = split_source(lines, workers * CHUNKS_PER_WORKER, section_pattern)
+    texts = [''.join(lines[start:end]) for start, end in chunks]
+    first_lines = [start + 1 for start, _ in chunks]
+    end_lines = [end + 1 for _, end in chunks[:-1]] + [None]
+    del lines
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_parse_text_chunk, texts, first_lines, end_lines, [compact] * len(texts),
+                               [theme_line] * len(texts), [section_pattern] * len(texts))
+        # map rend les lots dans l'ordre de soumission : fusion déterministe
+        for events in results:
+            for kind, payload in events:
+                if kind == 'issue':
+                    issues.append(payload)
+                    continue
+                if kind == 'section':
+                    line_no, header = payload
+                    payload = (line_no, section_pattern.match(header))
+                yield kind, payload
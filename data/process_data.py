@@ -1,95 +1,68 @@
 # data/process_data.py
-import json
+import argparse
+import sys
+import os
 import re
-from typing import List, Dict, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-def parse_questions_by_theme(text_content: str) -> Dict:
+from question_parser import MalformedBlock, ignored_summary, source_lines
+from near_duplicates import DEFAULT_THRESHOLD, find_near_duplicates, print_cluster_report, threshold_from_env
+from build_cache import BuildCache, content_hash, open_build_cache, write_json_atomic
+from parallel_parse import iter_parsed_blocks, resolve_workers
+from search_build import index_path, write_search_index
+
+# En-tête de thème (« Thème N : titre »)
+THEME_PATTERN = re.compile(r"Thème (\d+)\s*:\s*(.+?)(?=\n|$)")
+
+def parse_questions_by_theme(source: Union[str, Iterable[str]], issues: Optional[List[MalformedBlock]] = None,
+                             cache: Optional[BuildCache] = None, workers: int = 1) -> Dict:
     """
-    Parse le fichier avec détection automatique des thèmes et questions
+    Parse le fichier en flux avec détection automatique des thèmes et questions
+    
+    Les lignes sont lues une à une (voir question_parser) : seule la question
+    en cours d'analyse est gardée en mémoire en plus du résultat.
     
     Args:
-        text_content: Contenu du fichier questions.txt
+        source: Fichier questions.txt ouvert (ou son contenu complet)
+        issues: Liste complétée avec les blocs mal formés (numéro de ligne, raison)
+        cache: Cache de build : seuls les blocs modifiés depuis le build précédent sont analysés
+        workers: Processus d'analyse : au-delà de 1, les blocs « Question N »
+            sont analysés par lots en parallèle (résultat identique)
         
     Returns:
         Dict contenant les thèmes et leurs questions
     """
-    
-    # Nettoyer le texte
-    text_content = text_content.strip()
-    
-    # Pattern pour détecter les thèmes
-    theme_pattern = r"Thème (\d+)\s*:\s*(.+?)(?=\n|$)"
-    
-    # Pattern pour détecter les questions complètes
-    question_pattern = r"Question (\d+)\s*\n*Énoncé de la question \d+\s*:\s*(.*?)\s*A\s*-\s*(.*?)\s*B\s*-\s*(.*?)\s*C\s*-\s*(.*?)\s*Réponse attendue\s*:\s*([ABC])"
+    if issues is None:
+        issues = []
     
     themes = {}
     current_theme = None
-    current_theme_title = None
-    
-    # Diviser le texte en sections par thème
-    lines = text_content.split('\n')
-    current_section = []
     
-    for line in lines:
-        line = line.strip()
-        
-        # Détecter un nouveau thème
-        theme_match = re.match(theme_pattern, line)
-        if theme_match:
-            # Sauvegarder le thème précédent s'il existe
-            if current_theme is not None and current_section:
-                section_text = '\n'.join(current_section)
-                themes[current_theme] = {
-                    'title': current_theme_title,
-                    'content': section_text,
-                    'questions': []
-                }
-            
-            # Initialiser le nouveau thème
+    blocks = iter_parsed_blocks(source_lines(source), issues, compact=True, section_pattern=THEME_PATTERN,
+                                workers=workers, cache=cache)
+    for kind, payload in blocks:
+        if kind == 'section':
+            # Un thème n'est retenu que s'il a au moins une ligne de contenu
+            _, theme_match = payload
             current_theme = int(theme_match.group(1))
-            current_theme_title = theme_match.group(2).strip()
-            current_section = []
-        else:
-            # Ajouter la ligne à la section actuelle
-            if line:  # Ignorer les lignes vides
-                current_section.append(line)
-    
-    # Sauvegarder le dernier thème
-    if current_theme is not None and current_section:
-        section_text = '\n'.join(current_section)
-        themes[current_theme] = {
-            'title': current_theme_title,
-            'content': section_text,
-            'questions': []
-        }
-    
-    # Parser les questions pour chaque thème
-    for theme_id, theme_data in themes.items():
-        content = theme_data['content']
-        
-        # Trouver toutes les questions dans ce thème
-        questions = re.findall(question_pattern, content, re.DOTALL)
-        
-        parsed_questions = []
-        for question_match in questions:
-            question_id, question_text, option_a, option_b, option_c, correct_answer = question_match
-            
-            question_data = {
-                "id": int(question_id),
-                "theme_id": theme_id,
-                "question": question_text.strip(),
-                "options": {
-                    "A": option_a.strip(),
-                    "B": option_b.strip(),
-                    "C": option_c.strip()
-                },
-                "correct_answer": correct_answer.strip(),
-                "explanation": ""
+            themes[current_theme] = {
+                'title': theme_match.group(2).strip(),
+                'questions': []
             }
-            parsed_questions.append(question_data)
+            continue
         
-        theme_data['questions'] = parsed_questions
+        if current_theme is None:
+            issues.append(MalformedBlock(payload['line'], f"Question {payload['number']}: hors de tout thème"))
+            continue
+        
+        themes[current_theme]['questions'].append({
+            "id": payload['number'],
+            "theme_id": current_theme,
+            "question": payload['question'],
+            "options": payload['options'],
+            "correct_answer": payload['answer'],
+            "explanation": ""
+        })
     
     return themes
 
@@ -124,14 +97,28 @@ def create_modules_from_themes(themes_data: Dict) -> List[Dict]:
     
     return modules
 
-def validate_questions(themes_data: Dict) -> Tuple[bool, List[str]]:
+def validate_questions(themes_data: Dict, issues: Iterable[MalformedBlock] = ()) -> Tuple[bool, List[str]]:
     """
     Valide la structure des questions détectées
     
+    Args:
+        themes_data: Données des thèmes avec leurs questions
+        issues: Blocs signalés par le parseur (seuls les blocs écartés non ignorés sont des erreurs)
+    
     Returns:
         Tuple (is_valid, errors_list)
     """
     errors = []
+    for issue in issues:
+        if issue.ignored:
+            continue
+        if issue.rejected:
+            errors.append(f"❌ Bloc mal formé, {issue}")
+        else:
+            print(f"⚠️ Bloc à vérifier, {issue}")
+    warning = ignored_summary(issues)
+    if warning:
+        print(warning)
     total_questions = 0
     
     for theme_id, theme in themes_data.items():
@@ -162,6 +149,37 @@ def validate_questions(themes_data: Dict) -> Tuple[bool, List[str]]:
     
     return is_valid, errors
 
+def report_near_duplicates(themes_data: Dict, threshold: float = DEFAULT_THRESHOLD,
+                           cache: Optional[BuildCache] = None) -> List[Dict]:
+    """
+    Signale les quasi-doublons de la banque d'entraînement, dans un thème et entre thèmes
+    
+    Rien n'est supprimé : les identifiants des questions sont les clés de la
+    progression des apprenants, les doublons se corrigent dans questions.txt.
+    
+    Returns:
+        Liste des clusters (voir near_duplicates.find_near_duplicates)
+    """
+    questions = [q for theme_id in sorted(themes_data) for q in themes_data[theme_id]['questions']]
+    if cache is not None:
+        clusters = cache.memoize(content_hash('near_duplicates', threshold, questions),
+                                 lambda: find_near_duplicates(questions, threshold, cache))
+    else:
+        clusters = find_near_duplicates(questions, threshold)
+    
+    print(f"\n🔄 QUASI-DOUBLONS (seuil {threshold:.2f}):")
+    print_cluster_report("Banque d'entraînement", clusters, questions, describe_question)
+    cross_theme = sum(len({questions[i]['theme_id'] for i in cluster['members']}) > 1 for cluster in clusters)
+    if cross_theme:
+        print(f"   🔀 dont {cross_theme} clusters entre plusieurs thèmes")
+    return clusters
+
+def describe_question(question: Dict) -> str:
+    """Ligne de rapport d'une question : thème, numéro et aperçu de l'énoncé"""
+    text = question['question']
+    preview = text[:60] + "..." if len(text) > 60 else text
+    return f"[Thème {question['theme_id']}, Q{question['id']}] {preview}"
+
 def display_summary(themes_data: Dict):
     """
     Affiche un résumé de la conversion
@@ -183,32 +201,92 @@ def display_summary(themes_data: Dict):
     
     print("\n" + "="*60)
 
+def build_manifest_and_shards(data: Dict) -> Tuple[Dict, Dict[str, Dict]]:
+    """
+    Découpe la banque en un manifeste léger et un shard par module
+    
+    Le manifeste ne contient que ce dont l'accueil et le score ont besoin
+    (titres, nombres de questions, identifiants et corrigé de chaque module) ;
+    les énoncés et options restent dans les shards, chargés à la demande.
+    
+    Returns:
+        Tuple (manifest, {nom_du_shard: contenu})
+    """
+    manifest_modules = []
+    shards = {}
+    
+    for module in data['modules']:
+        shard_name = f"module_{module['id']}.json"
+        summary = {key: value for key, value in module.items() if key != 'questions'}
+        summary['question_ids'] = [q['id'] for q in module['questions']]
+        summary['answer_key'] = ''.join(q['correct_answer'] for q in module['questions'])
+        summary['shard'] = shard_name
+        manifest_modules.append(summary)
+        shards[shard_name] = {"id": module['id'], "questions": module['questions']}
+    
+    manifest = {"metadata": data['metadata'], "modules": manifest_modules}
+    return manifest, shards
+
+def write_manifest_and_shards(data: Dict, output_dir: str = "questions", cache: Optional[BuildCache] = None):
+    """
+    Écrit le manifeste (manifest.json) et les shards de modules dans output_dir
+    
+    Avec un cache de build, les shards des modules inchangés ne sont pas resérialisés.
+    """
+    manifest, shards = build_manifest_and_shards(data)
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Écritures atomiques, seulement pour les fichiers dont le contenu change
+    write_json = cache.write_json if cache is not None else write_json_atomic
+    rewritten = sum(
+        write_json(os.path.join(output_dir, shard_name), shard)
+        for shard_name, shard in shards.items()
+    )
+    
+    # Manifeste écrit en dernier : il ne référence que des shards déjà présents
+    rewritten += write_json(os.path.join(output_dir, "manifest.json"), manifest)
+    
+    print(f"🧩 Manifeste et {len(shards)} shards dans: {output_dir}/ ({rewritten} fichiers réécrits)")
+
 # Exemple d'utilisation et script principal
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Conversion de questions.txt en questions.json")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processus d'analyse en parallèle (0 : un par cœur, défaut : 1)")
+    parser.add_argument("-y", "--yes", action="store_true",
+                        help="continuer sans confirmation malgré les erreurs de validation")
+    args = parser.parse_args()
+    if args.workers < 0:
+        parser.error("--workers doit être positif ou nul")
+    workers = resolve_workers(args.workers)
+    
     print("🚀 Démarrage de la conversion des questions par thème...")
     
-    # Lire le fichier de questions
+    # Lire et parser le fichier de questions ligne à ligne
+    print("🔍 Analyse des thèmes et questions...")
+    cache = open_build_cache("questions.txt")
+    issues = []
     try:
         with open("questions.txt", "r", encoding="utf-8") as f:
-            content = f.read()
+            themes_data = parse_questions_by_theme(f, issues, cache, workers)
     except FileNotFoundError:
         print("❌ Erreur: Fichier 'questions.txt' non trouvé!")
         print("📝 Veuillez créer le fichier 'questions.txt' avec vos questions.")
         exit(1)
     except UnicodeDecodeError:
         print("❌ Erreur d'encodage. Essayons avec 'latin-1'...")
+        cache = open_build_cache("questions.txt")
+        issues = []
         try:
             with open("questions.txt", "r", encoding="latin-1") as f:
-                content = f.read()
+                themes_data = parse_questions_by_theme(f, issues, cache, workers)
         except Exception as e:
             print(f"❌ Impossible de lire le fichier: {e}")
             exit(1)
     
     print("📖 Fichier lu avec succès!")
-    
-    # Parser les thèmes et questions
-    print("🔍 Analyse des thèmes et questions...")
-    themes_data = parse_questions_by_theme(content)
+    if cache is not None:
+        cache.print_changes()
     
     if not themes_data:
         print("❌ Aucun thème détecté! Vérifiez le format de votre fichier.")
@@ -221,7 +299,7 @@ if __name__ == "__main__":
     
     # Validation
     print("✔️  Validation des données...")
-    is_valid, errors = validate_questions(themes_data)
+    is_valid, errors = validate_questions(themes_data, issues)
     
     if not is_valid:
         print("❌ Erreurs détectées:")
@@ -230,10 +308,19 @@ if __name__ == "__main__":
         if len(errors) > 10:
             print(f"   ... et {len(errors) - 10} autres erreurs")
         
-        print("\n🤔 Voulez-vous continuer malgré les erreurs? (o/n)")
-        response = input().lower()
-        if response != 'o':
+        if args.yes:
+            print("\n⏩ --yes : conversion poursuivie malgré les erreurs")
+        elif not sys.stdin.isatty():
+            print("\n❌ Conversion interrompue (pas de terminal pour confirmer) : relancez avec --yes pour continuer malgré les erreurs")
             exit(1)
+        else:
+            print("\n🤔 Voulez-vous continuer malgré les erreurs? (o/n)")
+            response = input().lower()
+            if response != 'o':
+                exit(1)
+    
+    # Quasi-doublons (rapport seulement)
+    report_near_duplicates(themes_data, threshold_from_env(), cache)
     
     # Créer les modules
     print("🏗️  Création de la structure des modules...")
@@ -258,15 +345,24 @@ if __name__ == "__main__":
         "modules": modules
     }
     
-    # Sauvegarder en JSON
+    # Sauvegarder en JSON (atomique, seulement si le contenu change)
     output_file = "questions.json"
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    output_changed = (cache.write_json if cache is not None else write_json_atomic)(output_file, data)
+    
+    # Manifeste + shards par module (chargement paresseux côté application)
+    write_manifest_and_shards(data, cache=cache)
+    
+    # Index de recherche plein texte (page Recherche)
+    if write_search_index(data, output_file, cache):
+        print(f"🔎 Index de recherche écrit: {index_path(output_file)}")
+    
+    if cache is not None:
+        cache.save()
     
     # Afficher le résumé
     display_summary(themes_data)
     
-    print(f"💾 Fichier sauvegardé: {output_file}")
+    print(f"💾 Fichier sauvegardé: {output_file}" if output_changed else f"💾 {output_file} inchangé")
     print("🎉 Conversion terminée avec succès!")
     
     # Instructions pour la suite
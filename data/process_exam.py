@@ -1,10 +1,16 @@
 # data/process_exam.py
-import json
-import re
+import argparse
+import sys
 import hashlib
-from typing import List, Dict, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from collections import defaultdict
 
+from question_parser import MalformedBlock, ignored_summary, source_lines
+from near_duplicates import DEFAULT_THRESHOLD, find_near_duplicates, print_cluster_report, threshold_from_env
+from build_cache import BuildCache, cached_stage, content_hash, open_build_cache, write_json_atomic
+from parallel_parse import iter_parsed_blocks, resolve_workers
+from search_build import index_path, write_search_index
+
 def normalize_text(text):
     """Normalise le texte pour la comparaison (supprime espaces, ponctuation, casse)"""
     if not text:
@@ -109,35 +115,83 @@ def remove_duplicates_from_questions(questions, theme_name=""):
     
     return unique_questions, removed_count
 
-def parse_exam_questions(text_content: str) -> Dict:
+def report_near_duplicates(questions, theme_name="", threshold=DEFAULT_THRESHOLD, cache=None):
     """
-    Parse le fichier examen.txt avec détection des questions d'examen blanc
+    Signale les quasi-doublons (reformulations, fautes de frappe, options permutées)
+    
+    Les clusters sont trouvés par MinHash + LSH (voir near_duplicates) et
+    affichés ; une question dont la réponse attendue diffère de celle de la
+    première du cluster est signalée à part (une négation change le sens d'un
+    énoncé proche).
+    
+    Rien n'est supprimé : la position d'une question dans la banque détermine
+    les tirages d'examen (exam_layout) et donc les réponses déjà enregistrées
+    et les fiches de révision des erreurs. Les doublons se corrigent dans
+    examen.txt.
     
     Args:
-        text_content: Contenu du fichier examen.txt
-        
+        questions: Liste des questions
+        theme_name: Nom du thème pour l'affichage
+        threshold: Similarité minimale (0-1) entre deux questions d'un cluster
+        cache: Cache de build (clusters et signatures MinHash des questions inchangées)
+    
     Returns:
-        Dict contenant les thèmes et leurs questions d'examen
+        Liste des clusters (voir near_duplicates.find_near_duplicates)
     """
+    if not questions:
+        return []
     
-    # Nettoyer le texte
-    text_content = text_content.strip()
-    
-    # Pattern pour détecter une question complète d'examen
-    question_pattern = r"Question (\d+)\s*\n*Thème\s*:\s*(.*?)\s*\n*Énoncé de la question\s*:\s*(.*?)\s*A\s*-\s*(.*?)\s*B\s*-\s*(.*?)\s*C\s*-\s*(.*?)\s*Réponse attendue\s*:\s*([ABC])"
+    if cache is not None:
+        clusters = cache.memoize(content_hash('near_duplicates', threshold, questions),
+                                 lambda: find_near_duplicates(questions, threshold, cache))
+    else:
+        clusters = find_near_duplicates(questions, threshold)
+    print_cluster_report(theme_name, clusters, questions, describe_exam_question)
+    
+    for cluster in clusters:
+        kept = questions[cluster['members'][0]]
+        kept_answer = normalize_text(kept['options'].get(kept['correct_answer'], ''))
+        for index in cluster['members'][1:]:
+            question = questions[index]
+            if normalize_text(question['options'].get(question['correct_answer'], '')) != kept_answer:
+                print(f"      ⚠️ Réponse attendue différente: ID original {question.get('original_id', 'N/A')}, à vérifier")
+    return clusters
+
+def describe_exam_question(question):
+    """Ligne de rapport d'une question d'examen : ID original et aperçu de l'énoncé"""
+    text = question.get('question', '')
+    preview = text[:60] + "..." if len(text) > 60 else text
+    return f"[ID orig: {question.get('original_id', 'N/A')}] {preview}"
+
+def parse_exam_questions(source: Union[str, Iterable[str]], issues: Optional[List[MalformedBlock]] = None,
+                         near_duplicate_threshold: float = DEFAULT_THRESHOLD,
+                         cache: Optional[BuildCache] = None, workers: int = 1) -> Dict:
+    """
+    Parse le fichier examen.txt en flux avec détection des questions d'examen blanc
     
-    # Trouver toutes les questions
-    questions = re.findall(question_pattern, text_content, re.DOTALL)
+    Args:
+        source: Fichier examen.txt ouvert (ou son contenu complet)
+        issues: Liste complétée avec les blocs mal formés (numéro de ligne, raison)
+        near_duplicate_threshold: Seuil de similarité des quasi-doublons signalés
+        cache: Cache de build : analyse des blocs et dédoublonnage des thèmes
+            inchangés repris du build précédent
+        workers: Processus d'analyse : au-delà de 1, les blocs « Question N »
+            sont analysés par lots en parallèle (résultat identique)
+        
+    Returns:
+        Dict contenant les thèmes et leurs questions d'examen
+    """
+    if issues is None:
+        issues = []
     
     # Organiser les questions par thème avec IDs séquentiels
     themes_data = {}
     theme_counters = {}  # Compteur d'ID par thème
     
-    for question_match in questions:
-        original_question_id, theme_name, question_text, option_a, option_b, option_c, correct_answer = question_match
-        
-        # Nettoyer le nom du thème
-        theme_name = theme_name.strip()
+    # Lecture en flux : chaque question est produite dès sa réponse attendue lue
+    blocks = iter_parsed_blocks(source_lines(source), issues, theme_line=True, workers=workers, cache=cache)
+    for _, block in blocks:
+        theme_name = block['theme']
         
         # Initialiser le thème s'il n'existe pas
         if theme_name not in themes_data:
@@ -154,15 +208,11 @@ def parse_exam_questions(text_content: str) -> Dict:
         # Créer la question avec l'ID unique
         question_data = {
             "id": unique_question_id,
-            "original_id": int(original_question_id),  # Garder l'ID original pour référence
+            "original_id": block['number'],  # Garder l'ID original pour référence
             "theme": theme_name,
-            "question": question_text.strip(),
-            "options": {
-                "A": option_a.strip(),
-                "B": option_b.strip(),
-                "C": option_c.strip()
-            },
-            "correct_answer": correct_answer.strip(),
+            "question": block['question'],
+            "options": block['options'],
+            "correct_answer": block['answer'],
             "explanation": ""
         }
         
@@ -174,9 +224,9 @@ def parse_exam_questions(text_content: str) -> Dict:
     
     for theme_name, theme_data in themes_data.items():
         original_count = len(theme_data['questions'])
-        unique_questions, removed_count = remove_duplicates_from_questions(
-            theme_data['questions'], 
-            theme_name
+        unique_questions, removed_count = cached_stage(
+            cache, "dédoublonnage", theme_data['questions'], theme_name,
+            lambda questions: remove_duplicates_from_questions(questions, theme_name)
         )
         theme_data['questions'] = unique_questions
         total_removed += removed_count
@@ -189,6 +239,15 @@ def parse_exam_questions(text_content: str) -> Dict:
     else:
         print(f"\n✨ Aucun doublon détecté dans l'ensemble des questions")
     
+    # Quasi-doublons restants (reformulations, options permutées...)
+    print(f"\n🔄 QUASI-DOUBLONS PAR THÈME (seuil {near_duplicate_threshold:.2f}, rapport seulement):")
+    total_near = 0
+    for theme_name, theme_data in themes_data.items():
+        total_near += len(report_near_duplicates(theme_data['questions'], theme_name, near_duplicate_threshold, cache))
+    
+    if total_near > 0:
+        print(f"\n🎯 RÉSUMÉ: {total_near} clusters de quasi-doublons à corriger dans examen.txt")
+    
     return themes_data
 
 def create_exam_modules(themes_data: Dict) -> List[Dict]:
@@ -227,12 +286,13 @@ def create_exam_modules(themes_data: Dict) -> List[Dict]:
     
     return modules
 
-def create_mixed_exam_module(themes_data: Dict) -> Dict:
+def create_mixed_exam_module(themes_data: Dict, near_duplicate_threshold: float = DEFAULT_THRESHOLD) -> Dict:
     """
     Crée un module d'examen blanc mixte avec toutes les questions mélangées
     
     Args:
         themes_data: Données des thèmes avec leurs questions
+        near_duplicate_threshold: Seuil de similarité des quasi-doublons inter-thèmes signalés
         
     Returns:
         Module d'examen blanc mixte
@@ -259,6 +319,8 @@ def create_mixed_exam_module(themes_data: Dict) -> Dict:
     else:
         print(f"✅ Module Mixte: Aucun doublon inter-thème trouvé ({len(unique_questions)} questions)")
     
+    report_near_duplicates(unique_questions, "Module Mixte", near_duplicate_threshold)
+    
     # Trier par ID original pour garder un ordre cohérent
     unique_questions.sort(key=lambda x: x.get('original_id', 0))
     
@@ -279,14 +341,28 @@ def create_mixed_exam_module(themes_data: Dict) -> Dict:
     
     return mixed_module
 
-def validate_exam_questions(themes_data: Dict) -> Tuple[bool, List[str]]:
+def validate_exam_questions(themes_data: Dict, issues: Iterable[MalformedBlock] = ()) -> Tuple[bool, List[str]]:
     """
     Valide la structure des questions d'examen détectées
     
+    Args:
+        themes_data: Données des thèmes avec leurs questions d'examen
+        issues: Blocs signalés par le parseur (seuls les blocs écartés non ignorés sont des erreurs)
+    
     Returns:
         Tuple (is_valid, errors_list)
     """
     errors = []
+    for issue in issues:
+        if issue.ignored:
+            continue
+        if issue.rejected:
+            errors.append(f"❌ Bloc mal formé, {issue}")
+        else:
+            print(f"⚠️ Bloc à vérifier, {issue}")
+    warning = ignored_summary(issues)
+    if warning:
+        print(warning)
     total_questions = 0
     
     expected_themes = ["Environnement réglementaire", "Connaissances techniques"]
@@ -358,13 +434,27 @@ def display_exam_summary(themes_data: Dict):
 
 # Script principal pour les examens blancs
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Conversion de examen.txt en exam_questions.json")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processus d'analyse en parallèle (0 : un par cœur, défaut : 1)")
+    parser.add_argument("-y", "--yes", action="store_true",
+                        help="continuer sans confirmation malgré les erreurs de validation")
+    args = parser.parse_args()
+    if args.workers < 0:
+        parser.error("--workers doit être positif ou nul")
+    workers = resolve_workers(args.workers)
+    
     print("🎯 Démarrage de la conversion des questions d'examen blanc...")
     print("🧹 Suppression automatique des doublons activée")
     
-    # Lire le fichier d'examen
+    # Lire et parser le fichier d'examen ligne à ligne (avec suppression des doublons)
+    print("🔍 Analyse des questions d'examen blanc...")
+    threshold = threshold_from_env()
+    cache = open_build_cache("examen.txt")
+    issues = []
     try:
         with open("examen.txt", "r", encoding="utf-8") as f:
-            content = f.read()
+            themes_data = parse_exam_questions(f, issues, threshold, cache, workers)
     except FileNotFoundError:
         print("❌ Erreur: Fichier 'examen.txt' non trouvé!")
         print("📝 Veuillez créer le fichier 'examen.txt' avec vos questions d'examen.")
@@ -379,18 +469,18 @@ if __name__ == "__main__":
         exit(1)
     except UnicodeDecodeError:
         print("❌ Erreur d'encodage. Essayons avec 'latin-1'...")
+        cache = open_build_cache("examen.txt")
+        issues = []
         try:
             with open("examen.txt", "r", encoding="latin-1") as f:
-                content = f.read()
+                themes_data = parse_exam_questions(f, issues, threshold, cache, workers)
         except Exception as e:
             print(f"❌ Impossible de lire le fichier: {e}")
             exit(1)
     
     print("📖 Fichier examen.txt lu avec succès!")
-    
-    # Parser les questions d'examen (avec suppression des doublons)
-    print("🔍 Analyse des questions d'examen blanc...")
-    themes_data = parse_exam_questions(content)
+    if cache is not None:
+        cache.print_changes()
     
     if not themes_data:
         print("❌ Aucune question d'examen détectée! Vérifiez le format de votre fichier.")
@@ -406,7 +496,7 @@ if __name__ == "__main__":
     
     # Validation
     print("✔️  Validation des questions d'examen...")
-    is_valid, errors = validate_exam_questions(themes_data)
+    is_valid, errors = validate_exam_questions(themes_data, issues)
     
     if not is_valid:
         print("❌ Erreurs détectées:")
@@ -415,10 +505,16 @@ if __name__ == "__main__":
         if len(errors) > 10:
             print(f"   ... et {len(errors) - 10} autres erreurs")
         
-        print("\n🤔 Voulez-vous continuer malgré les erreurs? (o/n)")
-        response = input().lower()
-        if response != 'o':
+        if args.yes:
+            print("\n⏩ --yes : conversion poursuivie malgré les erreurs")
+        elif not sys.stdin.isatty():
+            print("\n❌ Conversion interrompue (pas de terminal pour confirmer) : relancez avec --yes pour continuer malgré les erreurs")
             exit(1)
+        else:
+            print("\n🤔 Voulez-vous continuer malgré les erreurs? (o/n)")
+            response = input().lower()
+            if response != 'o':
+                exit(1)
     
     # Créer les modules d'examen
     print("🏗️  Création de la structure des modules d'examen...")
@@ -426,7 +522,7 @@ if __name__ == "__main__":
     
     # Optionnel : Créer le module d'examen mixte (décommentez si souhaité)
     # print("🎯 Création du module d'examen blanc complet...")
-    # mixed_exam = create_mixed_exam_module(themes_data)
+    # mixed_exam = create_mixed_exam_module(themes_data, threshold)
     # exam_modules.append(mixed_exam)
     
     # Créer la structure de données finale pour les examens
@@ -450,15 +546,21 @@ if __name__ == "__main__":
         "modules": exam_modules
     }
     
-    # Sauvegarder en JSON
+    # Sauvegarder en JSON (atomique, seulement si le contenu change)
     output_file = "exam_questions.json"
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(exam_data, f, ensure_ascii=False, indent=2)
+    output_changed = (cache.write_json if cache is not None else write_json_atomic)(output_file, exam_data)
+    
+    # Index de recherche plein texte (page Recherche)
+    if write_search_index(exam_data, output_file, cache):
+        print(f"🔎 Index de recherche écrit: {index_path(output_file)}")
+    
+    if cache is not None:
+        cache.save()
     
     # Afficher le résumé
     display_exam_summary(themes_data)
     
-    print(f"💾 Fichier sauvegardé: {output_file}")
+    print(f"💾 Fichier sauvegardé: {output_file}" if output_changed else f"💾 {output_file} inchangé")
     print("🎉 Conversion des questions d'examen terminée avec succès!")
     
     # Instructions pour la suite
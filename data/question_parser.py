@@ -0,0 +1,307 @@
+# data/question_parser.py
+"""
+Analyse en flux des fichiers de questions (questions.txt, examen.txt)
+
+Automate ligne à ligne : chaque bloc « Question N » passe par les états
+en-tête → énoncé → option A → option B → option C → réponse attendue, et
+est produit dès sa ligne « Réponse attendue » lue. Seul le bloc en cours est
+gardé en mémoire. Un bloc incomplet ou dans le désordre est signalé avec son
+numéro de ligne, puis ignoré jusqu'au prochain « Question N ».
+"""
+import io
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+QUESTION_LINE = re.compile(r"Question (\d+)\s*$")
+THEME_LINE = re.compile(r"Thème\s*:\s*(.*)")
+STATEMENT_LINE = re.compile(r"Énoncé de la question(?:\s+\d+)?\s*:\s*(.*)")
+# Variante sans accent d'examen.txt : ces blocs n'ont jamais fait partie des
+# banques livrées (identifiants et tirages d'examen en dépendent), ils restent
+# écartés mais ne bloquent pas la conversion
+UNACCENTED_STATEMENT_LINE = re.compile(r"Enoncé de la question(?:\s+\d+)?\s*:")
+OPTION_LINE = re.compile(r"([ABC])\s*-")
+ANSWER_LINE = re.compile(r"Réponse attendue\s*:")
+
+# Lignes listées dans l'avertissement des blocs ignorés
+MAX_LISTED_IGNORED = 10
+
+# États de l'automate
+OUTSIDE, HEADER, STATEMENT, OPTION_A, OPTION_B, OPTION_C, ANSWER, SKIP = range(8)
+
+# Champ rempli par chaque état de texte et marqueur qui le termine. Comme les
+# anciennes regex, le marqueur est cherché n'importe où dans la ligne
+# (« ESMA - European » coupe l'énoncé) : le découpage reste identique, mais le
+# bloc est signalé.
+_FIELDS = {STATEMENT: 'question', OPTION_A: 'A', OPTION_B: 'B', OPTION_C: 'C'}
+_END_MARKERS = {
+    STATEMENT: re.compile(r"A\s*-\s*"),
+    OPTION_A: re.compile(r"B\s*-\s*"),
+    OPTION_B: re.compile(r"C\s*-\s*"),
+    OPTION_C: re.compile(r"Réponse attendue\s*:\s*"),
+}
+# Lettre du marqueur attendu dans chaque état d'option
+_NEXT_OPTION = {STATEMENT: 'A', OPTION_A: 'B', OPTION_B: 'C'}
+_MISSING = {
+    HEADER: "énoncé manquant",
+    STATEMENT: "options A, B et C manquantes",
+    OPTION_A: "options B et C manquantes",
+    OPTION_B: "option C manquante",
+    OPTION_C: "réponse attendue manquante",
+    ANSWER: "réponse attendue manquante",
+}
+
+
+class MalformedBlock(NamedTuple):
+    """
+    Bloc signalé : ligne de son « Question N », raison, s'il a été écarté et ligne du problème
+
+    ignored : bloc écarté connu (« Enoncé » sans accent), simple avertissement
+    """
+    line: int
+    reason: str
+    rejected: bool = True
+    at: Optional[int] = None
+    ignored: bool = False
+
+    def __str__(self):
+        if self.at is None:
+            return f"ligne {self.line}: {self.reason}"
+        return f"ligne {self.line}: {self.reason} (ligne {self.at})"
+
+
+def ignored_summary(issues: Iterable[MalformedBlock]) -> Optional[str]:
+    """Avertissement unique pour les blocs ignorés (None s'il n'y en a aucun)"""
+    lines = [issue.line for issue in issues if issue.ignored]
+    if not lines:
+        return None
+    listed = ", ".join(str(line) for line in lines[:MAX_LISTED_IGNORED])
+    more = f" ... (+{len(lines) - MAX_LISTED_IGNORED})" if len(lines) > MAX_LISTED_IGNORED else ""
+    return f"⚠️ {len(lines)} blocs « Enoncé » sans accent ignorés (lignes {listed}{more})"
+
+
+def _skipped_marker(state, stripped):
+    """Ligne qui commence par un marqueur situé après celui attendu (option sautée)"""
+    if state not in _NEXT_OPTION:
+        return False
+    if ANSWER_LINE.match(stripped):
+        return True
+    match = OPTION_LINE.match(stripped)
+    return match is not None and match.group(1) > _NEXT_OPTION[state]
+
+
+def source_lines(source: Union[str, Iterable[str]]) -> Iterable[str]:
+    """Accepte le contenu complet (str) ou un itérable de lignes (fichier ouvert)"""
+    if isinstance(source, str):
+        return io.StringIO(source)
+    return source
+
+
+def iter_raw_blocks(lines: Iterable[str],
+                    section_pattern: Optional[re.Pattern] = None) -> Iterator[Tuple[str, object]]:
+    """
+    Découpe les lignes aux mêmes frontières que l'automate, sans les analyser
+
+    Les frontières sont les lignes « Question N » et les en-têtes de section.
+    Chaque bloc peut ensuite être analysé seul (parse_block), ce que font le
+    cache de build et l'analyse parallèle.
+
+    Yields:
+        ('section', (ligne, match)) pour un en-tête de section, ou
+        ('block', (première ligne, lignes, ligne de la frontière suivante)) ;
+        le premier bloc d'une section peut ne contenir aucune question
+    """
+    block_lines = []
+    first_line = 1
+    line_no = 0
+    for line_no, line in enumerate(lines, 1):
+        stripped = line.strip()
+        section = section_pattern.match(stripped) if section_pattern is not None else None
+        if section or QUESTION_LINE.match(stripped):
+            if block_lines:
+                yield 'block', (first_line, block_lines, line_no)
+            block_lines = []
+            if section:
+                yield 'section', (line_no, section)
+                first_line = line_no + 1
+                continue
+            first_line = line_no
+        block_lines.append(line)
+    if block_lines:
+        yield 'block', (first_line, block_lines, line_no)
+
+
+def iter_question_blocks(lines: Iterable[str],
+                         issues: Optional[List[MalformedBlock]] = None,
+                         compact: bool = False,
+                         theme_line: bool = False,
+                         section_pattern: Optional[re.Pattern] = None,
+                         first_line: int = 1,
+                         end_line: Optional[int] = None) -> Iterator[Tuple[str, object]]:
+    """
+    Parcourt les lignes et produit les sections et les questions au fil de l'eau
+
+    Args:
+        lines: itérable de lignes (fichier ouvert, StringIO...)
+        issues: liste complétée avec un MalformedBlock par bloc signalé
+        compact: ignorer les lignes vides et les espaces de bord (questions.txt) ;
+            sinon l'intérieur des textes multilignes est conservé tel quel (examen.txt)
+        theme_line: chaque question porte une ligne « Thème : » avant son énoncé
+        section_pattern: en-tête de section (« Thème N : titre »), produit à la
+            première ligne non vide qui le suit
+        first_line: numéro de la première ligne (analyse d'un bloc isolé)
+        end_line: ligne où un bloc resté incomplet est signalé (par défaut la dernière)
+
+    Yields:
+        ('section', (ligne, match)) ou ('question', {'line', 'number', 'theme',
+        'question', 'options', 'answer'})
+    """
+    if issues is None:
+        issues = []
+
+    state = OUTSIDE
+    block = None
+    parts = None
+    pending_section = None
+
+    def report(reason, line_no, rejected=True, ignored=False):
+        issues.append(MalformedBlock(block['line'], f"Question {block['number']}: {reason}", rejected, line_no, ignored))
+        return SKIP
+
+    line_no = first_line - 1
+    for line_no, line in enumerate(lines, first_line):
+        text = line.rstrip('\n')
+        stripped = text.strip()
+        if compact:
+            if not stripped:
+                continue
+            text = stripped
+
+        if section_pattern is not None:
+            match = section_pattern.match(stripped)
+            if match:
+                if state not in (OUTSIDE, SKIP):
+                    report(_MISSING[state], line_no)
+                state = OUTSIDE
+                pending_section = (line_no, match)
+                continue
+            if pending_section is not None and stripped:
+                yield 'section', pending_section
+                pending_section = None
+
+        match = QUESTION_LINE.match(stripped)
+        if match:
+            if state not in (OUTSIDE, SKIP):
+                report(_MISSING[state], line_no)
+            block = {'line': line_no, 'number': int(match.group(1)), 'theme': None,
+                     'question': None, 'options': {}, 'answer': None}
+            state = HEADER
+            continue
+
+        if state in (OUTSIDE, SKIP):
+            continue
+
+        if state == HEADER:
+            if not stripped:
+                continue
+            if theme_line and block['theme'] is None:
+                match = THEME_LINE.match(stripped)
+                if match:
+                    block['theme'] = match.group(1).strip()
+                else:
+                    state = report("ligne « Thème : » attendue", line_no)
+                continue
+            match = STATEMENT_LINE.match(stripped)
+            if not match:
+                if UNACCENTED_STATEMENT_LINE.match(stripped):
+                    state = report("« Enoncé » sans accent, bloc ignoré", line_no, ignored=True)
+                else:
+                    state = report("ligne « Énoncé de la question » attendue", line_no)
+                continue
+            parts = []
+            text = match.group(1)
+            state = STATEMENT
+
+        # Texte de l'énoncé ou d'une option, éventuellement coupé par un ou
+        # plusieurs marqueurs sur la même ligne
+        while state in _FIELDS:
+            match = _END_MARKERS[state].search(text)
+            if match is None:
+                if _skipped_marker(state, stripped):
+                    state = report(f"option {_NEXT_OPTION[state]} attendue", line_no)
+                else:
+                    parts.append(text)
+                break
+            before = text[:match.start()]
+            if before.strip() and state != OPTION_C:
+                report(f"marqueur « {match.group().strip()} » en milieu de ligne", line_no, rejected=False)
+            parts.append(before)
+            field = _FIELDS[state]
+            value = '\n'.join(parts).strip()
+            if field == 'question':
+                block['question'] = value
+            else:
+                block['options'][field] = value
+            parts = []
+            text = text[match.end():]
+            state += 1
+
+        if state == ANSWER:
+            answer = text.strip()
+            if not answer:
+                continue
+            if answer[0] in 'ABC':
+                block['answer'] = answer[0]
+                yield 'question', block
+                state = OUTSIDE
+            else:
+                state = report(f"réponse invalide ({answer})", line_no)
+
+    if state not in (OUTSIDE, SKIP):
+        report(_MISSING[state], end_line or line_no)
+
+
+def parse_block(block_lines: List[str], first_line: int, end_line: int,
+                compact: bool = False, theme_line: bool = False) -> Dict:
+    """
+    Analyse un bloc isolé de iter_raw_blocks
+
+    Returns:
+        {'question': question ou None, 'issues': [[ligne, raison, écarté, ligne
+        du problème, ignoré], ...]}, numéros de ligne relatifs à first_line : le
+        résultat reste valable si le bloc est déplacé dans la source
+    """
+    block_issues = []
+    questions = [
+        payload for _, payload in iter_question_blocks(
+            block_lines, block_issues, compact=compact, theme_line=theme_line,
+            first_line=first_line, end_line=end_line
+        )
+    ]
+    question = None
+    if questions:
+        question = dict(questions[0], line=questions[0]['line'] - first_line)
+    return {
+        'question': question,
+        'issues': [
+            [issue.line - first_line, issue.reason, issue.rejected,
+             None if issue.at is None else issue.at - first_line, issue.ignored]
+            for issue in block_issues
+        ]
+    }
+
+
+def replay_block(entry: Dict, first_line: int, issues: List[MalformedBlock]) -> Optional[Dict]:
+    """
+    Ajoute à issues les blocs signalés d'un résultat de parse_block et renvoie sa question
+
+    Les numéros de ligne sont recalés sur first_line ; la question renvoyée
+    est une copie.
+    """
+    for line, reason, rejected, at, ignored in entry['issues']:
+        issues.append(MalformedBlock(line + first_line, reason, rejected,
+                                     None if at is None else at + first_line, ignored))
+    if entry['question'] is None:
+        return None
+    question = dict(entry['question'], line=entry['question']['line'] + first_line)
+    question['options'] = dict(question['options'])
+    return question
@@ -0,0 +1,99 @@
+# data/search_build.py
+"""
+Index de recherche plein texte écrit à côté de chaque banque
+
+Le format est celui que lit modules/search_index.py (SearchIndex.from_dict) :
+même version, même normalisation (casse, accents, ponctuation) et mêmes
+positions. Le build reste autonome (pas d'import du paquet de
+l'application) ; benchmarks/bench_search.py vérifie que l'index écrit est
+identique à celui que construirait l'application.
+"""
+import os
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+from build_cache import BuildCache, write_json_atomic
+
+# Version du format (modules/search_index.INDEX_VERSION)
+INDEX_VERSION = 1
+
+# Champs indexés, dans l'ordre des positions
+INDEXED_OPTIONS = ('A', 'B', 'C')
+# Saut de position entre deux champs : une expression ne chevauche pas l'énoncé et une option
+FIELD_GAP = 1
+
+_TOKEN = re.compile(r"[0-9a-z]+")
+# Diacritiques séparés par la décomposition NFKD (accents, cédille, tréma)
+_COMBINING = re.compile(r"[\u0300-\u036f]")
+
+
+def fold_text(text: str) -> str:
+    """Minuscules sans accents ni ligatures (« Société » → « societe »)"""
+    if not text:
+        return ""
+    text = text.lower().replace('œ', 'oe').replace('æ', 'ae')
+    return _COMBINING.sub('', unicodedata.normalize('NFKD', text))
+
+
+def tokenize(text: str) -> List[str]:
+    """Termes normalisés du texte, dans l'ordre (la ponctuation sépare les mots)"""
+    return _TOKEN.findall(fold_text(text))
+
+
+def question_fields(question: Dict) -> List[str]:
+    """Textes indexés d'une question : énoncé puis options"""
+    options = question.get('options', {})
+    return [question.get('question', '')] + [options.get(key, '') for key in INDEXED_OPTIONS]
+
+
+def build_search_index(data: Dict) -> Dict:
+    """
+    Index positionnel d'une banque, sous forme JSON
+
+    Returns:
+        {'version', 'documents': [[module_id, question_id], ...],
+         'postings': {terme: [[document, positions...], ...]}}, termes triés
+    """
+    documents = []
+    postings: Dict[str, Dict[int, List[int]]] = {}
+    for module in data['modules']:
+        for question in module['questions']:
+            doc = len(documents)
+            documents.append([module['id'], question['id']])
+            positions: Dict[str, List[int]] = {}
+            position = 0
+            for text in question_fields(question):
+                for position, term in enumerate(tokenize(text), position):
+                    positions.setdefault(term, []).append(position)
+                position += 1 + FIELD_GAP
+            for term, term_positions in positions.items():
+                postings.setdefault(term, {})[doc] = term_positions
+    return {
+        'version': INDEX_VERSION,
+        'documents': documents,
+        'postings': {
+            term: [[doc, *postings[term][doc]] for doc in sorted(postings[term])]
+            for term in sorted(postings)
+        },
+    }
+
+
+def index_path(bank_file: str) -> str:
+    """Fichier d'index d'une banque (questions.json → questions_index.json)"""
+    return os.path.splitext(bank_file)[0] + "_index.json"
+
+
+def write_search_index(data: Dict, bank_file: str, cache: Optional[BuildCache] = None) -> bool:
+    """
+    Construit l'index positionnel de la banque et l'écrit en JSON compact
+
+    Returns:
+        True si le fichier a été (ré)écrit, False s'il était identique
+    """
+    index = build_search_index(data)
+    index['source'] = os.path.basename(bank_file)
+    path = index_path(bank_file)
+    if cache is not None:
+        return cache.write_json(path, index, indent=None)
+    return write_json_atomic(path, index, indent=None)
@@ -0,0 +1,290 @@
+import re
+from functools import lru_cache
+
+# Codage 2 bits des réponses : 0 = non répondu
+ANSWER_CODES = {'A': 1, 'B': 2, 'C': 3}
+ANSWER_LETTERS = (None, 'A', 'B', 'C')
+
+# Structure d'un examen blanc : partie 1 (env) puis partie 2 (tech)
+EXAM_PARTS = {'env': 1, 'tech': 2}
+EXAM_PART_PREFIXES = {1: 'env', 2: 'tech'}
+EXAM_PART_SIZES = {1: 56, 2: 64}
+EXAM_PART_OFFSETS = {1: 0, 2: EXAM_PART_SIZES[1]}
+EXAM_SIZE = EXAM_PART_SIZES[1] + EXAM_PART_SIZES[2]
+
+# Clés d'examen blanc : "exam{seed}_env_{i}" / "exam{seed}_tech_{i}" (i à partir de 1)
+EXAM_KEY_PATTERN = re.compile(r"^(?:exam(\d+)_)?(env|tech)_(\d+)$")
+
+# Nombre de champs 2 bits non nuls (réponses) dans chaque valeur d'octet
+_ANSWERED_PER_BYTE = bytes(
+    sum(1 for shift in (0, 2, 4, 6) if (byte >> shift) & 3) for byte in range(256)
+)
+
+# Vecteur répondu / non répondu ("a" / "u") des 4 champs de chaque valeur d'octet
+_STATUS_PER_BYTE = tuple(
+    ''.join('a' if (byte >> shift) & 3 else 'u' for shift in (0, 2, 4, 6)) for byte in range(256)
+)
+
+
+@lru_cache(maxsize=8192)
+def parse_exam_key(unique_question_id):
+    """
+    Décode une clé d'examen blanc
+
+    Returns:
+        tuple: (seed, part, position) ou None si ce n'est pas une clé d'examen
+    """
+    match = EXAM_KEY_PATTERN.match(unique_question_id)
+    if not match:
+        return None
+    seed = int(match.group(1)) if match.group(1) else None
+    return seed, EXAM_PARTS[match.group(2)], int(match.group(3)) - 1
+
+
+def exam_key(seed, part, position):
+    """Construit la clé d'une question d'examen (position à partir de 0)"""
+    prefix = EXAM_PART_PREFIXES[part]
+    if seed:
+        return f"exam{seed}_{prefix}_{position + 1}"
+    return f"{prefix}_{position + 1}"
+
+
+class PackedAnswers:
+    """
+    Réponses d'un espace de noms : 2 bits par question dans un bytearray
+
+    Le nombre total de réponses (`answered`) est tenu à jour à chaque écriture.
+    """
+
+    __slots__ = ('size', 'data', 'answered')
+
+    def __init__(self, size):
+        self.size = size
+        self.data = bytearray((size + 3) // 4)
+        self.answered = 0
+
+    def get(self, slot):
+        return (self.data[slot >> 2] >> ((slot & 3) << 1)) & 3
+
+    def set(self, slot, code):
+        shift = (slot & 3) << 1
+        old_byte = self.data[slot >> 2]
+        self.answered += (code != 0) - (((old_byte >> shift) & 3) != 0)
+        self.data[slot >> 2] = (old_byte & ~(3 << shift) & 0xFF) | (code << shift)
+
+    def count(self, start=0, end=None):
+        """Nombre de réponses dans [start, end) : compteur pour l'espace entier, sinon octets via une table"""
+        end = self.size if end is None else end
+        if start == 0 and end == self.size:
+            return self.answered
+        total = 0
+        while start < end and start & 3:
+            total += self.get(start) != 0
+            start += 1
+        while end > start and end & 3:
+            end -= 1
+            total += self.get(end) != 0
+        if start < end:
+            total += sum(self.data[start >> 2:end >> 2].translate(_ANSWERED_PER_BYTE))
+        return total
+
+    def clear(self, start=0, end=None):
+        """Efface les réponses dans [start, end) : octets entiers remis à zéro par tranche"""
+        end = self.size if end is None else end
+        while start < end and start & 3:
+            self.set(start, 0)
+            start += 1
+        while end > start and end & 3:
+            end -= 1
+            self.set(end, 0)
+        if start < end:
+            self.answered -= sum(self.data[start >> 2:end >> 2].translate(_ANSWERED_PER_BYTE))
+            self.data[start >> 2:end >> 2] = bytes((end - start) >> 2)
+
+    def status(self, start=0, end=None):
+        """Chaîne "a" (répondu) / "u" (non répondu) des slots [start, end), par octets entiers"""
+        end = self.size if end is None else end
+        if start >= end:
+            return ''
+        first = start >> 2
+        vector = ''.join(_STATUS_PER_BYTE[byte] for byte in self.data[first:(end + 3) >> 2])
+        return vector[start - (first << 2):end - (first << 2)]
+
+    def answered_slots(self):
+        """Itère sur (slot, code) des questions répondues"""
+        for byte_index, byte in enumerate(self.data):
+            if not byte:
+                continue
+            for offset in range(4):
+                code = (byte >> (offset << 1)) & 3
+                if code:
+                    yield (byte_index << 2) + offset, code
+
+
+class AnswerStore:
+    """
+    Réponses d'un apprenant indexées par slot entier
+
+    - espace d'entraînement : un slot par question de la QuestionBank
+    - un espace par seed d'examen blanc : 56 + 64 slots
+
+    Expose l'interface d'un dictionnaire {clé: lettre} pour les clés historiques
+    ("7_42", "exam10345_tech_12") ; les clés non indexables (questions retirées
+    de la banque) sont conservées telles quelles dans un dictionnaire annexe.
+    """
+
+    def __init__(self, bank):
+        self._bank = bank
+        self.training = PackedAnswers(len(bank))
+        self.exams = {}  # seed -> PackedAnswers
+        self._extra = {}
+
+    @classmethod
+    def from_dict(cls, bank, user_answers):
+        """Construit le store depuis un dictionnaire {clé: lettre} (fichier de progression)"""
+        store = cls(bank)
+        for key, choice in user_answers.items():
+            store[key] = choice
+        return store
+
+    def _locate(self, key, create=False):
+        """Retourne (espace, slot) pour une clé, ou (None, None) si non indexable"""
+        slot = self._bank.slot_for_key(key)
+        if slot is not None:
+            return self.training, slot
+
+        parsed = parse_exam_key(key)
+        if parsed is None:
+            return None, None
+        seed, part, position = parsed
+        if not 0 <= position < EXAM_PART_SIZES[part]:
+            return None, None
+        packed = self.exams.get(seed)
+        if packed is None:
+            if not create:
+                return None, None
+            packed = self.exams[seed] = PackedAnswers(EXAM_SIZE)
+        return packed, EXAM_PART_OFFSETS[part] + position
+
+    # Interface dictionnaire (clés historiques)
+
+    def __getitem__(self, key):
+        packed, slot = self._locate(key)
+        if packed is None:
+            return self._extra[key]
+        code = packed.get(slot)
+        if not code:
+            raise KeyError(key)
+        return ANSWER_LETTERS[code]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        packed, slot = self._locate(key)
+        if packed is None:
+            return key in self._extra
+        return packed.get(slot) != 0
+
+    def __setitem__(self, key, choice):
+        code = ANSWER_CODES.get(choice)
+        packed, slot = self._locate(key, create=code is not None)
+        if packed is None or code is None:
+            self._extra[key] = choice
+            return
+        packed.set(slot, code)
+
+    def __delitem__(self, key):
+        packed, slot = self._locate(key)
+        if packed is None:
+            del self._extra[key]
+            return
+        if not packed.get(slot):
+            raise KeyError(key)
+        packed.set(slot, 0)
+
+    def __len__(self):
+        return (self.training.count()
+                + sum(packed.count() for packed in self.exams.values())
+                + len(self._extra))
+
+    def __iter__(self):
+        for slot, _ in self.training.answered_slots():
+            yield self._bank.key_for_slot(slot)
+        for seed, packed in self.exams.items():
+            for slot, _ in packed.answered_slots():
+                yield self._exam_slot_key(seed, slot)
+        yield from list(self._extra)
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        for slot, code in self.training.answered_slots():
+            yield self._bank.key_for_slot(slot), ANSWER_LETTERS[code]
+        for seed, packed in self.exams.items():
+            for slot, code in packed.answered_slots():
+                yield self._exam_slot_key(seed, slot), ANSWER_LETTERS[code]
+        yield from list(self._extra.items())
+
+    def to_dict(self):
+        """Export {clé: lettre} pour la sauvegarde JSON"""
+        return dict(self.items())
+
+    @staticmethod
+    def _exam_slot_key(seed, slot):
+        part = 1 if slot < EXAM_PART_OFFSETS[2] else 2
+        return exam_key(seed, part, slot - EXAM_PART_OFFSETS[part])
+
+    # Accès direct par module / examen (sans construction de clé)
+
+    def module_choice(self, module_id, question_id):
+        """Lettre répondue pour une question d'entraînement (None si non répondue)"""
+        slot = self._bank.slot(module_id, question_id)
+        if slot is None:
+            return self._extra.get(f"{module_id}_{question_id}")
+        return ANSWER_LETTERS[self.training.get(slot)]
+
+    def count_module(self, module_id):
+        start, end = self._bank.module_range(module_id)
+        return self.training.count(start, end)
+
+    def reset_module(self, module_id):
+        """Efface toutes les réponses d'un module (tranche de slots)"""
+        start, end = self._bank.module_range(module_id)
+        self.training.clear(start, end)
+        prefix = f"{module_id}_"
+        for key in [key for key in self._extra if key.startswith(prefix)]:
+            del self._extra[key]
+
+    def count_exam(self, seed):
+        """Nombre de réponses d'un examen blanc (compteur de l'espace du seed, O(1))"""
+        packed = self.exams.get(seed)
+        return packed.answered if packed else 0
+
+    def module_status(self, module_id):
+        """Vecteur "a" / "u" des questions d'un module, dans l'ordre du module"""
+        start, end = self._bank.module_range(module_id)
+        return self.training.status(start, end)
+
+    def exam_status(self, seed, part):
+        """Vecteur "a" / "u" d'une partie d'examen blanc, dans l'ordre de l'examen"""
+        start = EXAM_PART_OFFSETS[part]
+        packed = self.exams.get(seed)
+        if packed is None:
+            return 'u' * EXAM_PART_SIZES[part]
+        return packed.status(start, start + EXAM_PART_SIZES[part])
+
+    def reset_exam(self, seed):
+        """Efface toutes les réponses d'un examen blanc (suppression de l'espace du seed)"""
+        self.exams.pop(seed, None)
+        prefix = f"exam{seed}_"
+        for key in [key for key in self._extra if key.startswith(prefix)]:
+            del self._extra[key]
+
+    def nbytes(self):
+        """Taille des tableaux compacts (hors dictionnaire annexe)"""
+        return len(self.training.data) + sum(len(packed.data) for packed in self.exams.values())
@@ -1,8 +1,19 @@
-import streamlit as st
+import hashlib
 import json
 import os
-from datetime import datetime
-from pathlib import Path
+import streamlit as st
+import streamlit.components.v1 as components
+from functools import lru_cache
+
+# Dossier servi par Streamlit sous /app/static (server.enableStaticServing)
+STATIC_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+STYLESHEET_PREFIX = "amf_theme"
+# Balise <link> de la feuille de style dans la page (composant theme_link)
+STYLESHEET_LINK_ID = "amf-theme-stylesheet"
+
+_theme_link = components.declare_component(
+    "theme_link", path=os.path.join(os.path.dirname(__file__), "components", "theme_link")
+)
 
 def get_theme_colors():
     """Détecte le thème actuel et retourne les couleurs appropriées"""
@@ -41,12 +52,17 @@ def get_theme_colors():
         }
     }
 
-def inject_custom_css():
-    """Injecte le CSS personnalisé adaptatif"""
-    colors = get_theme_colors()
-    
-    st.markdown(f"""
-    <style>
+def build_stylesheet(colors):
+    """
+    Construit la feuille de style de l'application à partir de la palette
+
+    Args:
+        colors: palette retournée par get_theme_colors()
+
+    Returns:
+        str: CSS (sans balise <style>)
+    """
+    return f"""
         /* Variables CSS pour les thèmes */
         :root {{
             --primary-color: {colors['light']['primary']};
@@ -370,15 +386,88 @@ def inject_custom_css():
             border-radius: 8px;
             animation: slideIn 0.3s ease;
         }}
-    </style>
-    """, unsafe_allow_html=True)
+    """
+
+@lru_cache(maxsize=4)
+def _stylesheet_asset(palette_json):
+    """
+    Génère (une fois par palette) la feuille de style dans un fichier statique nommé par son hash
+
+    Returns:
+        tuple: (css, nom du fichier ou None si l'écriture est impossible)
+    """
+    css = build_stylesheet(json.loads(palette_json))
+    digest = hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+    filename = f"{STYLESHEET_PREFIX}.{digest}.css"
+    path = os.path.join(STATIC_DIRECTORY, filename)
+    try:
+        if not os.path.exists(path):
+            os.makedirs(STATIC_DIRECTORY, exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(css)
+            os.replace(temp_path, path)
+            print(f"🎨 Feuille de style générée : {filename}")
+        # Supprimer les versions précédentes (ancienne palette)
+        for name in os.listdir(STATIC_DIRECTORY):
+            if name.startswith(f"{STYLESHEET_PREFIX}.") and name.endswith(".css") and name != filename:
+                os.remove(os.path.join(STATIC_DIRECTORY, name))
+    except OSError as e:
+        print(f"⚠️ Feuille de style statique indisponible, CSS injecté dans la page : {e}")
+        return css, None
+    return css, filename
+
+def stylesheet_url(filename):
+    """URL publique d'un fichier du dossier static (tient compte de server.baseUrlPath)"""
+    base_path = (st.get_option("server.baseUrlPath") or "").strip("/")
+    prefix = f"/{base_path}" if base_path else ""
+    return f"{prefix}/app/static/{filename}"
+
+@lru_cache(maxsize=None)
+def static_serves_css():
+    """
+    Le serveur sert-il les .css de static/ en text/css ?
+
+    Le serveur Tornado des versions de Streamlit qui le fournissent encore sert
+    les extensions hors de sa liste blanche en text/plain avec
+    X-Content-Type-Options: nosniff : le navigateur ignorerait la feuille.
+    """
+    try:
+        from streamlit.web.server.app_static_file_handler import SAFE_APP_STATIC_FILE_EXTENSIONS
+    except ImportError:
+        # Serveur Starlette : type déduit de l'extension
+        return True
+    return ".css" in SAFE_APP_STATIC_FILE_EXTENSIONS
+
+def inject_custom_css():
+    """
+    Injecte le CSS personnalisé adaptatif
+
+    La feuille de style est générée une seule fois par palette dans
+    static/ (nom contenant le hash du contenu, mis en cache par le
+    navigateur) et posée une fois par session dans la page par le composant
+    theme_link : les reruns suivants n'envoient plus rien. Si le serveur ne
+    sert pas les fichiers statiques, ou pas en text/css, le CSS complet est
+    injecté à chaque rerun comme avant.
+    """
+    css, filename = _stylesheet_asset(json.dumps(get_theme_colors(), sort_keys=True))
+    
+    if not (filename and st.get_option("server.enableStaticServing") and static_serves_css()):
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+        return
+    
+    url = stylesheet_url(filename)
+    if st.session_state.get('theme_stylesheet') == url:
+        return
+    # Rendu jusqu'à ce que le navigateur confirme la balise en place
+    if _theme_link(href=url, link_id=STYLESHEET_LINK_ID, key="theme_link", default=None) == url:
+        st.session_state.theme_stylesheet = url
 
 def initialize_session_state():
     """Initialise toutes les variables de session state"""
     defaults = {
         'current_module': None,
         'current_question_idx': 0,
-        'user_answers': {},
         'quiz_mode': 'practice',
         'quiz_started': False,
         'quiz_completed': False,
@@ -388,141 +477,15 @@ def initialize_session_state():
         'randomize_questions': False,
         'exam_blanc_data': None,
         'exam_blanc_part': 1,
-        'exam_blanc_questions': None
+        'exam_blanc_questions': None,
+        'show_search': False
     }
     
     for key, value in defaults.items():
         if key not in st.session_state:
             st.session_state[key] = value
-
-# Fonctions de sauvegarde simple et efficace
-def load_progress():
-    """Charge la progression sauvegardée"""
-    try:
-        if os.path.exists("user_progress.json"):
-            with open("user_progress.json", "r", encoding="utf-8") as f:
-                data = json.load(f)
-                print(f"✅ Progression chargée: {len(data.get('user_answers', {}))} réponses")
-                return data.get("user_answers", {})
-        else:
-            print("📝 Aucun fichier de sauvegarde trouvé")
-    except Exception as e:
-        print(f"❌ Erreur lors du chargement: {e}")
-    return {}
-
-def save_progress():
-    """Sauvegarde la progression actuelle"""
-    try:
-        data = {
-            "user_answers": st.session_state.get("user_answers", {}),
-            "last_saved": str(datetime.now())
-        }
-        with open("user_progress.json", "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"💾 Sauvegarde réussie: {len(data['user_answers'])} réponses")
-        return True
-    except Exception as e:
-        print(f"❌ Erreur lors de la sauvegarde: {e}")
-        return False
-
-def auto_save():
-    """Sauvegarde automatique à chaque réponse"""
-    if 'user_answers' in st.session_state:
-        current_count = len(st.session_state.user_answers)
-        last_count = st.session_state.get('last_save_count', 0)
-        
-        print(f"🔍 Auto-save: {current_count} réponses actuelles, {last_count} dernière sauvegarde")
-        
-        # Sauvegarder à chaque nouvelle réponse
-        if current_count > last_count:
-            if save_progress():
-                st.session_state.last_save_count = current_count
-                print(f"💾 Sauvegarde automatique réussie: {current_count} réponses")
-
-def force_save():
-    """Force la sauvegarde immédiate"""
-    if save_progress():
-        current_count = len(st.session_state.get("user_answers", {}))
-        st.session_state.last_save_count = current_count
-        st.sidebar.success(f"💾 Sauvegarde forcée! ({current_count} réponses)")
-        return True
-    else:
-        st.sidebar.error("❌ Erreur de sauvegarde")
-        return False
-    
-# Configuration pour compatibilité
-CHECKPOINT_DIR = "checkpoint"
-PROGRESS_FILE = f"{CHECKPOINT_DIR}/user_progress.json"
-
-def ensure_checkpoint_dir():
-    """Crée le dossier checkpoint s'il n'existe pas"""
-    try:
-        Path(CHECKPOINT_DIR).mkdir(parents=True, exist_ok=True)
-        return True
-    except Exception as e:
-        print(f"Erreur création dossier checkpoint: {e}")
-        return False
-
-def save_progress():
-    """Sauvegarde la progression (compatibilité ancienne fonction)"""
-    try:
-        ensure_checkpoint_dir()
-        
-        # Préparer les données
-        progress_data = {
-            "user_answers": st.session_state.get('user_answers', {}),
-            "last_updated": datetime.now().isoformat(),
-            "version": "1.0"
-        }
-        
-        # Sauvegarder
-        with open(PROGRESS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(progress_data, f, ensure_ascii=False, indent=2)
-        
-        print(f"✅ Progression sauvegardée: {len(progress_data['user_answers'])} réponses")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Erreur sauvegarde: {e}")
-        return False
-
-def load_progress():
-    """Charge la progression (compatibilité ancienne fonction)"""
-    # Ne pas recharger si déjà en mémoire
-    if st.session_state.get('user_answers') and len(st.session_state.user_answers) > 0:
-        return st.session_state.user_answers
     
-    try:
-        if os.path.exists(PROGRESS_FILE):
-            with open(PROGRESS_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            user_answers = data.get('user_answers', {})
-            print(f"✅ Progression chargée: {len(user_answers)} réponses")
-            return user_answers
-        else:
-            print("📝 Aucune progression sauvegardée trouvée")
-            return {}
-            
-    except Exception as e:
-        print(f"❌ Erreur chargement: {e}")
-        return {}
-
-def auto_save():
-    """Sauvegarde automatique (compatibilité)"""
-    # Éviter les sauvegardes trop fréquentes
-    current_count = len(st.session_state.get('user_answers', {}))
-    last_saved_count = st.session_state.get('last_auto_save_count', 0)
-    
-    # Sauvegarder seulement si nouvelle réponse
-    if current_count > last_saved_count:
-        print(f"🔍 Auto-save: {current_count} réponses actuelles, {last_saved_count} dernière sauvegarde")
-        if save_progress():
-            st.session_state.last_auto_save_count = current_count
-            print(f"💾 Sauvegarde automatique réussie: {current_count} réponses")
-    else:
-        print(f"⏭️ Auto-save ignoré: pas de nouvelles réponses ({current_count})")
-
-def force_save():
-    """Sauvegarde forcée (compatibilité)"""
-    return save_progress()
\ No newline at end of file
+    # Store compact des réponses (créé seulement s'il n'existe pas encore)
+    if 'user_answers' not in st.session_state:
+        from modules.progress import create_answer_store
+        st.session_state.user_answers = create_answer_store()
@@ -0,0 +1,255 @@
+import streamlit as st
+from datetime import date, datetime
+from modules.data_loader import get_exam_bank, get_question_bank
+from modules.persistence import on_answer_validated, save_user_progress
+from modules.progress import get_review_scheduler, record_answer, record_review
+from modules.quiz_common import render_question_header, render_question_card, rerun_question
+from modules.review_scheduler import DUE, parse_card_key, today_number
+from modules.timing import timed
+
+DAILY_REVIEW_MODE = 'daily_review'
+
+# Fiches échues proposées au plus par série de révision
+DAILY_REVIEW_LIMIT = 30
+
+
+def review_question(card_key):
+    """
+    Question d'une fiche de révision
+
+    Returns:
+        tuple: (module, question, origine 'training' / 'exam') ou None si la question n'existe plus
+    """
+    parsed = parse_card_key(card_key)
+    if parsed is None:
+        return None
+    origin, module_id, question_id = parsed
+    bank = get_question_bank() if origin == 'training' else get_exam_bank()
+    if bank is None:
+        return None
+    question = bank.question(module_id, question_id)
+    if question is None:
+        return None
+    return bank.module(module_id), question, origin
+
+
+def start_daily_review():
+    """
+    Lance la révision du jour : les fiches échues, la plus en retard d'abord
+
+    Returns:
+        bool: False s'il n'y a aucune fiche à revoir
+    """
+    keys = [key for key in get_review_scheduler().due(limit=DAILY_REVIEW_LIMIT) if review_question(key)]
+    if not keys:
+        return False
+    st.session_state.daily_review = {'keys': keys, 'answers': {}}
+    st.session_state.current_module = None
+    st.session_state.current_question_idx = 0
+    st.session_state.quiz_started = True
+    st.session_state.quiz_completed = False
+    st.session_state.start_time = datetime.now()
+    st.session_state.quiz_mode = DAILY_REVIEW_MODE
+    # Nettoyer les données d'examen blanc
+    st.session_state.exam_blanc_questions = None
+    st.session_state.current_exam_blanc_id = None
+    return True
+
+
+def end_daily_review():
+    """Quitte la révision du jour (retour au tableau de bord)"""
+    st.session_state.quiz_started = False
+    st.session_state.quiz_completed = False
+    st.session_state.quiz_mode = 'practice'
+    if 'daily_review' in st.session_state:
+        del st.session_state.daily_review
+
+
+def daily_review_score():
+    """(bonnes réponses, réponses, fiches de la série) de la révision en cours"""
+    session = st.session_state.daily_review
+    correct = 0
+    for key, choice in session['answers'].items():
+        entry = review_question(key)
+        if entry and choice == entry[1]['correct_answer']:
+            correct += 1
+    return correct, len(session['answers']), len(session['keys'])
+
+
+def format_due_day(day_number):
+    """Échéance lisible (aujourd'hui, demain ou date)"""
+    delta = day_number - today_number()
+    if delta <= 0:
+        return "aujourd'hui"
+    if delta == 1:
+        return "demain"
+    return date.fromordinal(day_number).strftime("%d/%m/%Y")
+
+
+def _grade(card_key, choice, question, origin):
+    """
+    Enregistre la réponse donnée pendant la révision
+
+    Une question d'entraînement passe par record_answer (réponse du module
+    mise à jour, fiche révisée) ; une erreur d'examen ne met à jour que sa
+    fiche, l'examen blanc d'origine restant inchangé.
+    """
+    if origin == 'training':
+        record_answer(card_key, choice, question['correct_answer'])
+    else:
+        record_review(card_key, choice == question['correct_answer'])
+    st.session_state.daily_review['answers'][card_key] = choice
+    on_answer_validated()
+
+
+@st.fragment
+@timed("fragment:daily_review")
+def show_daily_review_interface():
+    """
+    Série de révision du jour, construite depuis la file des échéances
+
+    Les réponses sont tenues à part (daily_review['answers']) : une question
+    déjà répondue dans son module repart sans choix présélectionné.
+    """
+    session = st.session_state.get('daily_review')
+    if not session or not session['keys']:
+        end_daily_review()
+        st.rerun()
+        return
+
+    keys = session['keys']
+    current_idx = min(st.session_state.current_question_idx, len(keys) - 1)
+    card_key = keys[current_idx]
+    entry = review_question(card_key)
+    if entry is None:
+        st.error("❌ Question introuvable")
+        end_daily_review()
+        st.rerun()
+        return
+    module, question, origin = entry
+
+    origin_label = "Examen blanc" if origin == 'exam' else module['title']
+    render_question_header("📅 Révision du jour", subtitle=f"{origin_label} : {module['full_title']}")
+    st.progress(len(session['answers']) / len(keys))
+    st.caption(f"Question actuelle: {current_idx + 1} / {len(keys)}")
+
+    render_question_card(question['id'], question['question'])
+
+    options = question['options']
+    given = session['answers'].get(card_key)
+    option_keys = list(options.keys())
+    st.markdown("**Choisissez votre réponse :**")
+    user_choice = st.radio(
+        "Options",
+        option_keys,
+        format_func=lambda x: f"{x} - {options[x]}",
+        key=f"q_{card_key}_{DAILY_REVIEW_MODE}",
+        index=option_keys.index(given) if given in option_keys else None,
+        disabled=given is not None,
+        label_visibility="collapsed"
+    )
+
+    if given is not None:
+        correct_answer = question['correct_answer']
+        if given == correct_answer:
+            card = get_review_scheduler().get(card_key)
+            st.success(f"✅ **Correct !** Prochaine révision : {format_due_day(card[DUE])}" if card else "✅ **Correct !**")
+        else:
+            st.error(f"❌ **Incorrect** • Votre choix : {given} - {options[given]}")
+            st.info(f"🎯 **Bonne réponse :** {correct_answer} - {options[correct_answer]}")
+
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        if current_idx > 0 and st.button("⬅️ Précédent", use_container_width=True):
+            st.session_state.current_question_idx = current_idx - 1
+            rerun_question()
+    with col2:
+        if given is None:
+            if st.button("💾 Valider", type="primary", use_container_width=True, disabled=not user_choice):
+                _grade(card_key, user_choice, question, origin)
+                rerun_question(refresh_app=True)
+    with col3:
+        is_last = current_idx == len(keys) - 1
+        label = "🏁 Terminer" if is_last else "➡️ Suivant"
+        if st.button(label, type="primary" if given else "secondary", use_container_width=True):
+            if given is None:
+                st.warning("⚠️ Veuillez d'abord valider votre réponse")
+            elif is_last:
+                st.session_state.quiz_completed = True
+                st.rerun()
+            else:
+                st.session_state.current_question_idx = current_idx + 1
+                rerun_question()
+
+
+def show_daily_review_results():
+    """Bilan de la série : score, erreurs revues demain, prochaine échéance"""
+    session = st.session_state.get('daily_review')
+    if not session:
+        end_daily_review()
+        st.rerun()
+        return
+
+    correct, answered, total = daily_review_score()
+    st.markdown("""
+    <div class="results-header">
+        <h1>🎉 Révision terminée !</h1>
+        <h2>📅 Révision du jour</h2>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("✅ Bonnes réponses", f"{correct} / {total}")
+    with col2:
+        st.metric("❌ À revoir demain", answered - correct)
+    with col3:
+        st.metric("📅 Encore dues", get_review_scheduler().due_count())
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if get_review_scheduler().due_count() and st.button("➡️ Continuer la révision", type="primary",
+                                                            use_container_width=True):
+            start_daily_review()
+            st.rerun()
+    with col2:
+        if st.button("📚 Tableau de bord", use_container_width=True):
+            save_user_progress()
+            end_daily_review()
+            st.rerun()
+
+    for key, choice in session['answers'].items():
+        entry = review_question(key)
+        if entry is None or choice == entry[1]['correct_answer']:
+            continue
+        module, question, origin = entry
+        origin_label = "Examen blanc" if origin == 'exam' else module['title']
+        with st.expander(f"❌ {origin_label} - Question {question['id']}"):
+            st.write(question['question'])
+            st.error(f"**{choice}** - {question['options'][choice]}")
+            st.success(f"**{question['correct_answer']}** - {question['options'][question['correct_answer']]}")
+
+
+def show_daily_review_card():
+    """Encart du tableau de bord : fiches dues aujourd'hui et lancement de la série"""
+    scheduler = get_review_scheduler()
+    st.subheader("📅 Révision du jour")
+    if not len(scheduler):
+        st.caption("Les questions répondues entrent dans la révision espacée : revenez après un premier entraînement.")
+        return
+
+    due_count = scheduler.due_count()
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        st.metric("À revoir", due_count)
+    with col2:
+        st.metric("Questions suivies", len(scheduler))
+    with col3:
+        if due_count:
+            series = min(due_count, DAILY_REVIEW_LIMIT)
+            if st.button(f"🚀 Réviser {series} question(s)", type="primary", use_container_width=True):
+                start_daily_review()
+                st.rerun()
+        else:
+            next_due = scheduler.next_due()
+            st.success(f"✅ Rien à revoir aujourd'hui • prochaine révision : {format_due_day(next_due[0])}")
@@ -2,9 +2,265 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import time
 from datetime import datetime
-from modules.utils import get_user_progress, calculate_score, get_performance_level
+from modules.daily_review import show_daily_review_card
+from modules.data_loader import get_exam_bank, get_question_bank
+from modules.exam_layout import EXAM_PART_THEMES
+from modules.pass_estimator import (
+    EXAM_PART_MODULES, estimate_pass_probability, part_prior, question_estimates
+)
+from modules.utils import get_performance_level
+from modules.progress import get_progress, reset_exam_answers, set_exam_seed
+from modules.timing import timed
 
+# Nombre d'examens blancs proposés sur l'accueil
+EXAM_CARD_COUNT = 10
+
+def _memoized(name, fingerprint, build):
+    """
+    Valeur calculée par build() et gardée dans la session tant que l'empreinte ne change pas
+
+    Args:
+        name: nom de l'entrée du cache
+        fingerprint: empreinte de l'état dont dépend la valeur (version de la progression...)
+        build: fonction sans argument qui calcule la valeur
+
+    Returns:
+        La valeur en cache ou nouvellement calculée
+    """
+    cache = st.session_state.setdefault('dashboard_cache', {})
+    entry = cache.get(name)
+    if entry is None or entry[0] != fingerprint:
+        entry = cache[name] = (fingerprint, build())
+    return entry[1]
+
+def build_module_rows(data, progress):
+    """
+    Calcule les valeurs affichées pour chaque module (graphique et aperçu détaillé)
+
+    Returns:
+        list: une entrée par module (answered, correct, progress_pct, score_pct, color, status, level)
+    """
+    rows = []
+    for module in data['modules']:
+        module_progress = progress.module(module['id'])
+        correct, total_answered = module_progress['correct'], module_progress['answered']
+        progress_pct = (total_answered / module['total_questions']) * 100
+        score_pct = (correct / total_answered * 100) if total_answered > 0 else 0
+        
+        # Déterminer la couleur selon le score
+        if score_pct >= 80:
+            color = '#28a745'  # Vert pour excellent
+            status = 'Excellent'
+        elif score_pct >= 60:
+            color = '#ffc107'  # Jaune pour correct
+            status = 'Correct'
+        elif total_answered > 0:
+            color = '#dc3545'  # Rouge pour à améliorer
+            status = 'À améliorer'
+        else:
+            color = '#6c757d'  # Gris pour non commencé
+            status = 'Non commencé'
+        
+        rows.append({
+            'module': module,
+            'answered': total_answered,
+            'correct': correct,
+            'progress_pct': progress_pct,
+            'score_pct': score_pct,
+            'color': color,
+            'status': status,
+            'level': get_performance_level(score_pct)[0] if total_answered > 0 else None
+        })
+    return rows
+
+def build_progress_figure(module_rows):
+    """Construit le graphique de progression par module (barres empilées)"""
+    df = pd.DataFrame([{
+        'Module': f"M{row['module']['id']}",
+        'Nom': row['module']['title'],
+        'Progression': row['progress_pct'],
+        'Restant': 100 - row['progress_pct'],
+        'Score': row['score_pct'],
+        'Couleur': row['color'],
+        'Questions': f"{row['answered']}/{row['module']['total_questions']}",
+        'Statut': row['status']
+    } for row in module_rows])
+    
+    # Graphique en barres optimisé
+    fig = go.Figure()
+    
+    # Barre de progression avec couleurs selon le score
+    fig.add_trace(go.Bar(
+        name='Progression',
+        x=df['Module'],
+        y=df['Progression'],
+        marker_color=df['Couleur'],
+        text=[f"{prog:.0f}%<br>{questions}" if prog > 8 else f"{prog:.0f}%" if prog > 0 else "" 
+              for prog, questions in zip(df['Progression'], df['Questions'])],
+        textposition='inside',
+        textfont=dict(color='white', size=12, family="Arial"),
+        hovertemplate='<b>%{customdata[0]}</b><br>' +
+                     'Progression: %{y:.1f}%<br>' +
+                     'Questions: %{customdata[1]}<br>' +
+                     'Score: %{customdata[2]:.1f}%<br>' +
+                     'Statut: %{customdata[3]}<br>' +
+                     '<extra></extra>',
+        customdata=list(zip(df['Nom'], df['Questions'], df['Score'], df['Statut'])),
+        showlegend=False
+    ))
+    
+    # Barre restante avec style subtil
+    fig.add_trace(go.Bar(
+        name='Restant',
+        x=df['Module'],
+        y=df['Restant'],
+        marker_color='rgba(108, 117, 125, 0.15)',
+        marker_line_color='rgba(108, 117, 125, 0.3)',
+        marker_line_width=1,
+        text=['Non commencé' if rest == 100 else '' for rest in df['Restant']],
+        textposition='inside',
+        textfont=dict(color='#6c757d', size=11),
+        hovertemplate='<b>%{customdata}</b><br>' +
+                     'Restant: %{y:.1f}%<br>' +
+                     '<extra></extra>',
+        customdata=df['Nom'],
+        showlegend=False
+    ))
+    
+    # Layout optimisé sans légendes d'axes
+    fig.update_layout(
+        barmode='stack',
+        xaxis={
+            'showgrid': False,
+            'zeroline': False,
+            'showline': False,
+            'ticks': '',
+            'showticklabels': True,
+            'tickfont': {'size': 13, 'color': '#2c3e50', 'family': 'Arial'},
+            'title': None
+        },
+        yaxis={
+            'showgrid': True,
+            'gridcolor': 'rgba(0,0,0,0.05)',
+            'gridwidth': 1,
+            'zeroline': False,
+            'showline': False,
+            'ticks': '',
+            'showticklabels': False,
+            'range': [0, 100],
+            'title': None
+        },
+        template="plotly_white",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font={'family': 'Arial', 'color': '#2c3e50'},
+        showlegend=False,
+        margin=dict(t=20, b=10, l=20, r=20),
+        height=350
+    )
+    
+    return fig
+
+def exam_card_progress():
+    """
+    Progression des examens blancs de l'accueil
+
+    Returns:
+        dict: {numéro d'examen: (seed utilisé, réponses, pourcentage)}
+    """
+    seed_mapping = st.session_state.get('exam_seed_mapping', {})
+    cards = {}
+    for exam_num in range(1, EXAM_CARD_COUNT + 1):
+        seed_to_use = seed_mapping.get(exam_num, exam_num)
+        answered_count = st.session_state.user_answers.count_exam(seed_to_use)
+        cards[exam_num] = (seed_to_use, answered_count, (answered_count / 120) * 100)  # 120 questions par examen
+    return cards
+
+# Réponses (entraînement + examens blancs) avant d'afficher une probabilité de réussite
+MIN_ANSWERS_FOR_ESTIMATE = 20
+
+def exam_question_evidence(progress):
+    """
+    Réponses déjà données à chaque question de la banque d'examen
+
+    Returns:
+        dict: {partie: {index dans la partie de la banque: (bonnes réponses, réponses)}}
+    """
+    from modules.exam_session import create_exam_session
+
+    evidence = {part: {} for part in EXAM_PART_MODULES}
+    store = st.session_state.user_answers
+    if not hasattr(store, 'exam_status'):
+        return evidence
+    for seed in progress.exams:
+        exam = create_exam_session(seed)
+        if exam is None:
+            continue
+        errors = progress.exam_errors.get(seed, ())
+        for part in evidence:
+            indices = exam.parts[part - 1]
+            for position, status in enumerate(store.exam_status(seed, part)):
+                if status != 'a':
+                    continue
+                correct, answered = evidence[part].get(indices[position], (0, 0))
+                evidence[part][indices[position]] = (correct + ((part, position) not in errors), answered + 1)
+    return evidence
+
+def build_pass_estimate(progress):
+    """
+    Probabilité de réussite à l'examen (simulation Monte Carlo) et durée du calcul
+
+    Returns:
+        dict: résultat de estimate_pass_probability complété par 'elapsed_ms', ou None
+    """
+    bank, exam_bank = get_question_bank(), get_exam_bank()
+    if bank is None or exam_bank is None:
+        return None
+    start = time.perf_counter()
+    evidence = exam_question_evidence(progress)
+    part_estimates = {}
+    for part, module_ids in EXAM_PART_MODULES.items():
+        pool = exam_bank.module_by_theme(EXAM_PART_THEMES[part])
+        if pool is None:
+            return None
+        prior = part_prior(
+            (len(bank.answer_key(module_id)), progress.module(module_id)['correct'], progress.module(module_id)['answered'])
+            for module_id in module_ids if bank.module(module_id)
+        )
+        part_estimates[part] = question_estimates(len(pool['questions']), prior, evidence[part])
+    estimate = estimate_pass_probability(part_estimates)
+    estimate['elapsed_ms'] = (time.perf_counter() - start) * 1e3
+    return estimate
+
+def show_pass_probability(progress):
+    """Encart : probabilité de valider les deux parties de l'examen (recalculée après chaque réponse)"""
+    st.subheader("🎯 Chances de réussite à l'examen")
+    total_answers = progress.total_module_answered() + sum(progress.exam_answered(seed) for seed in progress.exams)
+    if total_answers < MIN_ANSWERS_FOR_ESTIMATE:
+        st.caption(f"Estimation disponible après {MIN_ANSWERS_FOR_ESTIMATE} réponses validées "
+                   f"(entraînement ou examens blancs) : {total_answers} pour l'instant.")
+        return
+
+    # Recalcul seulement après une nouvelle réponse validée (version de la progression)
+    estimate = _memoized('pass_estimate', progress.version, lambda: build_pass_estimate(progress))
+    if estimate is None:
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Réussite des deux parties", f"{estimate['probability']:.0%}")
+    for column, part in ((col2, 1), (col3, 2)):
+        part_estimate = estimate['parts'][part]
+        with column:
+            st.metric(f"Partie {part} (≥ 80 %)", f"{part_estimate['probability']:.0%}",
+                      help=f"Score moyen simulé : {part_estimate['expected_score']:.1f} %")
+    simulations = f"{estimate['simulations']:,}".replace(',', ' ')
+    st.caption(f"{simulations} examens blancs simulés en {estimate['elapsed_ms']:.0f} ms, "
+               "d'après vos taux de réussite par module et vos réponses aux examens blancs")
+
+@timed("dashboard")
 def show_enhanced_dashboard(data):
     """Affiche le tableau de bord principal"""
     st.header("📊 Tableau de bord")
@@ -12,9 +268,16 @@ def show_enhanced_dashboard(data):
     # Métriques principales avec style amélioré
     col1, col2, col3, col4 = st.columns(4)
     
-    answered, total = get_user_progress(data)
+    # Compteurs incrémentaux de tous les modules
+    progress = get_progress()
+    answered = progress.total_module_answered()
+    total = data['metadata']['total_questions']
     completion_rate = (answered / total) * 100 if total > 0 else 0
     
+    # Valeurs par module, recalculées seulement quand la progression change
+    fingerprint = (progress.version, id(data))
+    module_rows = _memoized('module_rows', fingerprint, lambda: build_module_rows(data, progress))
+    
     with col1:
         st.markdown("""
         <div class="metric-card">
@@ -51,117 +314,20 @@ def show_enhanced_dashboard(data):
         </div>
         """.format(completion_rate), unsafe_allow_html=True)
     
+    # Questions dues aujourd'hui (file des échéances de la répétition espacée)
+    st.markdown("<br>", unsafe_allow_html=True)
+    show_daily_review_card()
+    
+    # Probabilité de réussite à l'examen (Monte Carlo, en cache jusqu'à la prochaine réponse)
+    show_pass_probability(progress)
+    
 
     # Graphique de progression global
     if answered > 0:
         st.markdown("<br>", unsafe_allow_html=True)  # Petit espace avant le titre
         st.subheader("📈 Progression par module")
         
-        module_data = []
-        for module in data['modules']:
-            correct, total_answered = calculate_score(module['questions'], st.session_state.user_answers, module['id'])
-            progress_pct = (total_answered / module['total_questions']) * 100
-            score_pct = (correct / total_answered * 100) if total_answered > 0 else 0
-            
-            # Déterminer la couleur selon le score
-            if score_pct >= 80:
-                color = '#28a745'  # Vert pour excellent
-                status = 'Excellent'
-            elif score_pct >= 60:
-                color = '#ffc107'  # Jaune pour correct
-                status = 'Correct'
-            elif total_answered > 0:
-                color = '#dc3545'  # Rouge pour à améliorer
-                status = 'À améliorer'
-            else:
-                color = '#6c757d'  # Gris pour non commencé
-                status = 'Non commencé'
-            
-            module_data.append({
-                'Module': f"M{module['id']}",
-                'Nom': module['title'],
-                'Progression': progress_pct,
-                'Restant': 100 - progress_pct,
-                'Score': score_pct,
-                'Couleur': color,
-                'Questions': f"{total_answered}/{module['total_questions']}",
-                'Statut': status
-            })
-        
-        df = pd.DataFrame(module_data)
-        
-        # Graphique en barres optimisé
-        fig = go.Figure()
-        
-        # Barre de progression avec couleurs selon le score
-        fig.add_trace(go.Bar(
-            name='Progression',
-            x=df['Module'],
-            y=df['Progression'],
-            marker_color=df['Couleur'],
-            text=[f"{prog:.0f}%<br>{questions}" if prog > 8 else f"{prog:.0f}%" if prog > 0 else "" 
-                  for prog, questions in zip(df['Progression'], df['Questions'])],
-            textposition='inside',
-            textfont=dict(color='white', size=12, family="Arial"),
-            hovertemplate='<b>%{customdata[0]}</b><br>' +
-                         'Progression: %{y:.1f}%<br>' +
-                         'Questions: %{customdata[1]}<br>' +
-                         'Score: %{customdata[2]:.1f}%<br>' +
-                         'Statut: %{customdata[3]}<br>' +
-                         '<extra></extra>',
-            customdata=list(zip(df['Nom'], df['Questions'], df['Score'], df['Statut'])),
-            showlegend=False
-        ))
-        
-        # Barre restante avec style subtil
-        fig.add_trace(go.Bar(
-            name='Restant',
-            x=df['Module'],
-            y=df['Restant'],
-            marker_color='rgba(108, 117, 125, 0.15)',
-            marker_line_color='rgba(108, 117, 125, 0.3)',
-            marker_line_width=1,
-            text=['Non commencé' if rest == 100 else '' for rest in df['Restant']],
-            textposition='inside',
-            textfont=dict(color='#6c757d', size=11),
-            hovertemplate='<b>%{customdata}</b><br>' +
-                         'Restant: %{y:.1f}%<br>' +
-                         '<extra></extra>',
-            customdata=df['Nom'],
-            showlegend=False
-        ))
-        
-        # Layout optimisé sans légendes d'axes
-        fig.update_layout(
-            barmode='stack',
-            xaxis={
-                'showgrid': False,
-                'zeroline': False,
-                'showline': False,
-                'ticks': '',
-                'showticklabels': True,
-                'tickfont': {'size': 13, 'color': '#2c3e50', 'family': 'Arial'},
-                'title': None
-            },
-            yaxis={
-                'showgrid': True,
-                'gridcolor': 'rgba(0,0,0,0.05)',
-                'gridwidth': 1,
-                'zeroline': False,
-                'showline': False,
-                'ticks': '',
-                'showticklabels': False,
-                'range': [0, 100],
-                'title': None
-            },
-            template="plotly_white",
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font={'family': 'Arial', 'color': '#2c3e50'},
-            showlegend=False,
-            margin=dict(t=20, b=10, l=20, r=20),
-            height=350
-        )
+        fig = _memoized('progress_figure', fingerprint, lambda: build_progress_figure(module_rows))
         
         st.plotly_chart(fig, use_container_width=True)
         
@@ -191,9 +357,9 @@ def show_enhanced_dashboard(data):
     st.markdown("<br>", unsafe_allow_html=True)
     st.subheader("🗂️ Aperçu détaillé des modules")
     
-    for i, module in enumerate(data['modules']):
-        correct, total_answered = calculate_score(module['questions'], st.session_state.user_answers, module['id'])
-        progress_pct = (total_answered / module['total_questions']) * 100
+    for i, row in enumerate(module_rows):
+        module = row['module']
+        total_answered, progress_pct = row['answered'], row['progress_pct']
         
         with st.expander(f"📝 {module['title']} - {module['full_title']}"):
             col1, col2 = st.columns([2, 1])
@@ -204,9 +370,7 @@ def show_enhanced_dashboard(data):
                 st.write(f"**Progression:** {progress_pct:.1f}%")
                 
                 if total_answered > 0:
-                    score_pct = (correct / total_answered) * 100
-                    level, level_type = get_performance_level(score_pct)
-                    st.write(f"**Score:** {score_pct:.1f}% - {level}")
+                    st.write(f"**Score:** {row['score_pct']:.1f}% - {row['level']}")
                 else:
                     st.write("**Score:** Non commencé")
                 
@@ -230,19 +394,20 @@ def show_enhanced_dashboard(data):
     st.subheader("🎓 Examens blancs disponibles")
     st.info("💡 Chaque examen blanc propose une sélection aléatoire différente de questions pour varier vos entraînements.")
     
+    # Progression des cartes (recalculée seulement si la progression ou les seeds changent)
+    seed_mapping = st.session_state.get('exam_seed_mapping', {})
+    exam_cards = _memoized(
+        'exam_cards',
+        (progress.version, tuple(sorted(seed_mapping.items()))),
+        exam_card_progress
+    )
+    
     # Fonction helper pour créer un examen blanc
     def create_exam_card(exam_num):
         """Crée une carte d'examen blanc avec barre de progression intégrée"""
         
-        # Calculer la progression pour cet examen
-        seed_to_use = exam_num
-        if 'exam_seed_mapping' in st.session_state:
-            seed_to_use = st.session_state.exam_seed_mapping.get(exam_num, exam_num)
-        
-        answered_count = sum(1 for key in st.session_state.user_answers.keys() 
-                           if key.startswith(f'exam{seed_to_use}_'))
-        
-        progress_pct = (answered_count / 120) * 100  # 120 questions par examen
+        # Progression de cet examen
+        seed_to_use, answered_count, progress_pct = exam_cards[exam_num]
         
         with st.container():
             # Carte complète avec barre de progression intégrée
@@ -284,8 +449,6 @@ def show_enhanced_dashboard(data):
                            use_container_width=True):
                     from modules.exam_blanc import create_exam_blanc
                     
-                    print(f"DEBUG: Lancement examen #{exam_num} avec seed {seed_to_use}")
-                    
                     # Créer l'examen avec le bon seed
                     exam_questions = create_exam_blanc(exam_id=seed_to_use)
                     if exam_questions:
@@ -315,27 +478,15 @@ def show_enhanced_dashboard(data):
                         
                         # Générer un seed complètement aléatoire pour de nouvelles questions
                         new_seed = rnd.randint(10000, 99999)
-                        print(f"DEBUG: Régénération examen #{exam_num} avec seed {new_seed}")
                         
                         new_exam = create_exam_blanc(exam_id=new_seed)
                         
                         if new_exam:
-                            # Créer un mapping pour que l'examen #X utilise le nouveau seed
-                            if 'exam_seed_mapping' not in st.session_state:
-                                st.session_state.exam_seed_mapping = {}
-                            
-                            # Supprimer les anciennes réponses avec l'ancien préfixe
-                            old_seed = st.session_state.exam_seed_mapping.get(exam_num, exam_num)
-                            keys_to_remove = []
-                            for key in st.session_state.user_answers.keys():
-                                if key.startswith(f'exam{old_seed}_'):
-                                    keys_to_remove.append(key)
-                            
-                            for key in keys_to_remove:
-                                del st.session_state.user_answers[key]
+                            # Supprimer les anciennes réponses de l'examen (espace de l'ancien seed)
+                            reset_exam_answers(seed_to_use)
                             
-                            # Mettre à jour le mapping
-                            st.session_state.exam_seed_mapping[exam_num] = new_seed
+                            # L'examen #X utilise désormais le nouveau seed (sauvegardé avec la progression)
+                            set_exam_seed(exam_num, new_seed)
                             
                             # Si c'est l'examen actuellement chargé, le remplacer
                             if st.session_state.get('current_exam_blanc_id') == exam_num:
@@ -357,7 +508,7 @@ def show_enhanced_dashboard(data):
                         st.warning(f"⚠️ Régénérer l'examen #{exam_num} avec de nouvelles questions ? Cela supprimera vos réponses actuelles.")
     
     # Créer une grille d'examens blancs - 2 par ligne
-    exam_numbers = list(range(1, 11))  # 10 examens blancs
+    exam_numbers = list(range(1, EXAM_CARD_COUNT + 1))
     
     for i in range(0, len(exam_numbers), 2):  # Traiter par paires
         col1, col2 = st.columns(2)
@@ -1,21 +1,81 @@
 import streamlit as st
-import json
+from modules.question_bank import QuestionBank
+from modules.scoring import ScoringEngine
+from modules.search_index import SearchIndex
 
-@st.cache_data
-def load_questions():
-    """Charge les questions depuis le fichier JSON"""
+QUESTIONS_FILE = "data/questions.json"
+QUESTIONS_MANIFEST = "data/questions/manifest.json"
+EXAM_QUESTIONS_FILE = "data/exam_questions.json"
+QUESTIONS_INDEX_FILE = "data/questions_index.json"
+EXAM_QUESTIONS_INDEX_FILE = "data/exam_questions_index.json"
+
+@st.cache_resource
+def get_question_bank():
+    """
+    Banque de questions d'entraînement, partagée par toutes les sessions du processus
+    
+    Lit le manifeste (shards chargés à la demande) s'il existe, sinon le
+    fichier questions.json complet.
+    """
     try:
-        with open("data/questions.json", "r", encoding="utf-8") as f:
-            return json.load(f)
+        return QuestionBank.from_manifest(QUESTIONS_MANIFEST)
+    except FileNotFoundError:
+        pass
+    try:
+        return QuestionBank.from_file(QUESTIONS_FILE)
     except FileNotFoundError:
-        st.error("❌ Fichier questions.json non trouvé. Veuillez d'abord convertir vos questions.")
         return None
 
-@st.cache_data
-def load_exam_questions():
-    """Charge les questions d'examen depuis le fichier JSON"""
+@st.cache_resource
+def get_exam_bank():
+    """Banque de questions d'examen, partagée par toutes les sessions du processus"""
     try:
-        with open("data/exam_questions.json", "r", encoding="utf-8") as f:
-            return json.load(f)
+        return QuestionBank.from_file(EXAM_QUESTIONS_FILE)
     except FileNotFoundError:
-        return None
\ No newline at end of file
+        return None
+
+@st.cache_resource
+def get_scoring_engine():
+    """Moteur de score vectorisé construit sur la banque d'entraînement partagée"""
+    bank = get_question_bank()
+    if bank is None:
+        return None
+    return ScoringEngine(bank)
+
+def _load_search_index(path, bank):
+    """Index écrit au build, reconstruit depuis la banque s'il manque ou ne lui correspond plus"""
+    try:
+        index = SearchIndex.from_file(path)
+        if len(index) == len(bank):
+            return index
+        print(f"⚠️ Index de recherche périmé, reconstruction: {path}")
+    except (FileNotFoundError, ValueError) as e:
+        print(f"⚠️ Index de recherche indisponible ({e}), reconstruction depuis la banque")
+    return SearchIndex.from_bank_data(bank.data)
+
+@st.cache_resource
+def get_search_indexes():
+    """Index plein texte des banques disponibles, partagés par toutes les sessions : {'training', 'exam'}"""
+    indexes = {}
+    bank = get_question_bank()
+    if bank is not None:
+        indexes['training'] = _load_search_index(QUESTIONS_INDEX_FILE, bank)
+    exam_bank = get_exam_bank()
+    if exam_bank is not None:
+        indexes['exam'] = _load_search_index(EXAM_QUESTIONS_INDEX_FILE, exam_bank)
+    return indexes
+
+def load_questions():
+    """Charge les questions depuis le fichier JSON (vue immuable partagée)"""
+    bank = get_question_bank()
+    if bank is None:
+        st.error("❌ Fichier questions.json non trouvé. Veuillez d'abord convertir vos questions.")
+        return None
+    return bank.data
+
+def load_exam_questions():
+    """Charge les questions d'examen depuis le fichier JSON (vue immuable partagée)"""
+    bank = get_exam_bank()
+    if bank is None:
+        return None
+    return bank.data
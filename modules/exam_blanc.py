@@ -1,92 +1,47 @@
 import streamlit as st
-import random
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
-from modules.data_loader import load_exam_questions
-from modules.config import auto_save
+from modules.exam_session import EXAM_PART_TITLES, create_exam_session
+from modules.navigation import NAV_PLAIN, navigation_status, question_navigator
+from modules.persistence import on_answer_validated
 from modules.quiz_common import (
     render_question_header, render_question_card, render_answer_options,
     render_answer_feedback, render_navigation_buttons, render_quick_navigation,
-    create_part_navigation_buttons
+    create_part_navigation_buttons, rerun_question
 )
+from modules.progress import get_progress, reset_exam_answers
+from modules.timing import timed
 
 def create_exam_blanc(exam_id=None):
     """
     Crée un examen blanc avec 56 questions Environnement réglementaire et 64 questions Connaissances techniques
-    """
-    exam_data = load_exam_questions()
-    if not exam_data:
-        return None
-    
-    # IMPORTANT: Réinitialiser le seed avant chaque sélection
-    if exam_id is not None:
-        random.seed(exam_id)
-        print(f"DEBUG: Seed {exam_id} appliqué pour sélection des questions")
-    
-    # Trouver les modules par thème
-    env_module = None
-    tech_module = None
-    
-    for module in exam_data['modules']:
-        if module.get('theme') == 'Environnement réglementaire':
-            env_module = module
-        elif module.get('theme') == 'Connaissances techniques':
-            tech_module = module
-    
-    if not env_module or not tech_module:
-        return None
-    
-    # Sélectionner aléatoirement les questions
-    env_questions = random.sample(env_module['questions'], min(56, len(env_module['questions'])))
-    tech_questions = random.sample(tech_module['questions'], min(64, len(tech_module['questions'])))
     
-    # Réassigner les IDs pour être séquentiels avec l'ID d'examen
-    for i, q in enumerate(env_questions, 1):
-        q['id'] = f"exam{exam_id}_env_{i}" if exam_id else f"env_{i}"
-        q['exam_part'] = 1
-        q['theme_display'] = 'Environnement réglementaire'
-    
-    for i, q in enumerate(tech_questions, 1):
-        q['id'] = f"exam{exam_id}_tech_{i}" if exam_id else f"tech_{i}"
-        q['exam_part'] = 2
-        q['theme_display'] = 'Connaissances techniques'
-    
-    return {
-        'part1': {
-            'title': 'Partie 1 - Environnement réglementaire',
-            'questions': env_questions,
-            'target_questions': 56,
-            'required_score': 80
-        },
-        'part2': {
-            'title': 'Partie 2 - Connaissances techniques', 
-            'questions': tech_questions,
-            'target_questions': 64,
-            'required_score': 80
-        },
-        'total_questions': len(env_questions) + len(tech_questions),
-        'time_limit_hours': 2,
-        'exam_id': exam_id
-    }
+    Returns:
+        ExamSession: seed + indices des questions dans la banque d'examen (None si indisponible)
+    """
+    return create_exam_session(exam_id)
 
+@st.fragment
+@timed("fragment:exam")
 def show_exam_blanc_interface():
-    """Interface principale pour l'examen blanc"""
+    """
+    Interface principale pour l'examen blanc
+    
+    Fragment Streamlit : seuls le changement de partie, la fin de l'examen et
+    une nouvelle réponse (compteurs de la sidebar) relancent toute l'application.
+    """
     if not st.session_state.exam_blanc_questions:
         st.error("❌ Données d'examen blanc non disponibles")
         return
     
-    exam_data = st.session_state.exam_blanc_questions
+    exam = st.session_state.exam_blanc_questions
     current_part = st.session_state.exam_blanc_part
     
-    # Déterminer les questions de la partie actuelle
-    if current_part == 1:
-        questions = exam_data['part1']['questions']
-        part_title = exam_data['part1']['title']
-    else:
-        questions = exam_data['part2']['questions']
-        part_title = exam_data['part2']['title']
+    # Questions de la partie actuelle (résolues à la demande dans la banque partagée)
+    questions = exam.questions(current_part)
+    part_title = EXAM_PART_TITLES[current_part]
     
     current_idx = st.session_state.current_question_idx
     
@@ -109,16 +64,19 @@ def show_exam_blanc_interface():
     render_question_header(f"🎓 {part_title}")
     
     # Navigation entre les parties
+    progress = get_progress()
     parts_data = [
         {
-            'title': '📋 Partie 1 - Environnement réglementaire',
-            'questions': exam_data['part1']['questions'],
-            'part_number': 1
+            'title': f"📋 {EXAM_PART_TITLES[1]}",
+            'questions': exam.questions(1),
+            'part_number': 1,
+            'answered': progress.exam_part(exam.seed, 1)['answered']
         },
         {
-            'title': '🔧 Partie 2 - Connaissances techniques',
-            'questions': exam_data['part2']['questions'],
-            'part_number': 2
+            'title': f"🔧 {EXAM_PART_TITLES[2]}",
+            'questions': exam.questions(2),
+            'part_number': 2,
+            'answered': progress.exam_part(exam.seed, 2)['answered']
         }
     ]
     
@@ -150,7 +108,8 @@ def show_exam_blanc_interface():
         has_next_part=(current_part == 1),
         next_part_label="Partie 2",
         is_last_section=(current_part == 2),
-        auto_save_func=auto_save
+        auto_save_func=on_answer_validated,
+        correct_answer=current_question['correct_answer']
     )
     
     # Gérer le passage à la partie suivante
@@ -172,25 +131,16 @@ def calculate_exam_blanc_score():
     if not st.session_state.exam_blanc_questions:
         return None
     
-    exam_data = st.session_state.exam_blanc_questions
+    exam = st.session_state.exam_blanc_questions
+    progress = get_progress()
     
     # Partie 1 - Environnement réglementaire
-    part1_correct = 0
-    part1_total = len(exam_data['part1']['questions'])
-    
-    for question in exam_data['part1']['questions']:
-        if question['id'] in st.session_state.user_answers:
-            if st.session_state.user_answers[question['id']] == question['correct_answer']:
-                part1_correct += 1
+    part1_correct = progress.exam_part(exam.seed, 1)['correct']
+    part1_total = exam.part_size(1)
     
     # Partie 2 - Connaissances techniques
-    part2_correct = 0
-    part2_total = len(exam_data['part2']['questions'])
-    
-    for question in exam_data['part2']['questions']:
-        if question['id'] in st.session_state.user_answers:
-            if st.session_state.user_answers[question['id']] == question['correct_answer']:
-                part2_correct += 1
+    part2_correct = progress.exam_part(exam.seed, 2)['correct']
+    part2_total = exam.part_size(2)
     
     # Scores calculés
     part1_score = (part1_correct / part1_total * 100) if part1_total > 0 else 0
@@ -231,7 +181,7 @@ def show_exam_blanc_results():
         st.error("❌ Impossible de calculer les scores")
         return
     
-    exam_data = st.session_state.exam_blanc_questions
+    exam = st.session_state.exam_blanc_questions
     exam_id = st.session_state.get('current_exam_blanc_id', '???')
     
     # En-tête des résultats
@@ -349,25 +299,8 @@ def show_exam_blanc_results():
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        # Bouton pour réviser les erreurs - VERSION CORRIGÉE
-        incorrect_questions = []
-        
-        # Collecter toutes les questions incorrectes
-        for question in exam_data['part1']['questions']:
-            question_id = question['id']
-            if question_id in st.session_state.user_answers:
-                user_answer = st.session_state.user_answers[question_id]
-                correct_answer = question['correct_answer']
-                if user_answer != correct_answer:
-                    incorrect_questions.append(question)
-        
-        for question in exam_data['part2']['questions']:
-            question_id = question['id']
-            if question_id in st.session_state.user_answers:
-                user_answer = st.session_state.user_answers[question_id]
-                correct_answer = question['correct_answer']
-                if user_answer != correct_answer:
-                    incorrect_questions.append(question)
+        # Bouton pour réviser les erreurs (positions des questions ratées, sans copie)
+        incorrect_questions = exam.incorrect_questions(get_progress().exam_error_positions(exam.seed))
         
         # Toujours afficher le bouton, même s'il n'y a pas d'erreurs
         if len(incorrect_questions) > 0:
@@ -395,14 +328,8 @@ def show_exam_blanc_results():
     with col2:
         # Bouton pour refaire l'examen
         if st.button("🔄 Refaire l'examen", type="secondary", use_container_width=True):
-            # Supprimer toutes les réponses de cet examen
-            keys_to_remove = []
-            for key in st.session_state.user_answers.keys():
-                if key.startswith(f'exam{exam_id}_'):
-                    keys_to_remove.append(key)
-            
-            for key in keys_to_remove:
-                del st.session_state.user_answers[key]
+            # Supprimer toutes les réponses de cet examen (clés préfixées par le seed)
+            reset_exam_answers(exam.seed)
             
             # Redémarrer l'examen
             st.session_state.current_question_idx = 0
@@ -538,8 +465,13 @@ def show_exam_blanc_results():
                 avg_time_per_q = elapsed_minutes / total_questions
                 st.write(f"**Temps moyen/question :** {avg_time_per_q:.1f} min")
 
+def _select_review_question(q_idx):
+    st.session_state.current_question_idx = q_idx
+
+@st.fragment
+@timed("fragment:exam_review")
 def show_exam_blanc_review_interface():
-    """Interface pour réviser les erreurs d'un examen blanc"""
+    """Interface pour réviser les erreurs d'un examen blanc (fragment Streamlit)"""
     if 'exam_blanc_review_questions' not in st.session_state or not st.session_state.exam_blanc_review_questions:
         st.error("❌ Aucune question de révision disponible")
         return
@@ -604,14 +536,14 @@ def show_exam_blanc_review_interface():
         if current_idx > 0:
             if st.button("⬅️ Précédent", use_container_width=True):
                 st.session_state.current_question_idx -= 1
-                st.rerun()
+                rerun_question()
     
     with col2:
         # Bouton "Compris" pour passer à la suivante
         if st.button("✅ Compris", type="primary", use_container_width=True):
             if current_idx < len(questions) - 1:
                 st.session_state.current_question_idx += 1
-                st.rerun()
+                rerun_question()
             else:
                 # Fin de la révision
                 st.success("🎉 Révision terminée !")
@@ -623,7 +555,7 @@ def show_exam_blanc_review_interface():
         if current_idx < len(questions) - 1:
             if st.button("➡️ Suivant", use_container_width=True):
                 st.session_state.current_question_idx += 1
-                st.rerun()
+                rerun_question()
         else:
             if st.button("🏁 Terminer", type="primary", use_container_width=True):
                 st.session_state.quiz_completed = True
@@ -632,14 +564,9 @@ def show_exam_blanc_review_interface():
     # Navigation rapide pour la révision
     if len(questions) > 1:
         st.markdown("**🔍 Navigation rapide**")
-        
-        cols_per_row = 10
-        for i in range(0, len(questions), cols_per_row):
-            cols = st.columns(cols_per_row)
-            for j, q_idx in enumerate(range(i, min(i + cols_per_row, len(questions)))):
-                with cols[j]:
-                    button_type = "primary" if q_idx == current_idx else "secondary"
-                    if st.button(f"{q_idx + 1}", key=f"nav_review_{q_idx}", 
-                               type=button_type, use_container_width=True):
-                        st.session_state.current_question_idx = q_idx
-                        st.rerun()
\ No newline at end of file
+        question_navigator(
+            navigation_status(NAV_PLAIN * len(questions), current_idx),
+            key="review_nav",
+            on_select=_select_review_question,
+            columns=10
+        )
\ No newline at end of file
@@ -0,0 +1,43 @@
+import random
+from functools import lru_cache
+from modules.answer_store import EXAM_PART_SIZES
+
+# Thème de la banque d'examen tiré dans chaque partie
+EXAM_PART_THEMES = {1: 'Environnement réglementaire', 2: 'Connaissances techniques'}
+
+# Nombre de seeds dont la composition reste en cache (les plus anciens sont évincés)
+EXAM_LAYOUT_CACHE_SIZE = 256
+
+
+def _draw_layout(rng, pool_sizes):
+    """Tire les indices des questions de chaque partie avec le générateur fourni"""
+    return tuple(
+        tuple(rng.sample(range(pool_size), min(EXAM_PART_SIZES[part], pool_size)))
+        for part, pool_size in zip(EXAM_PART_SIZES, pool_sizes)
+    )
+
+
+@lru_cache(maxsize=EXAM_LAYOUT_CACHE_SIZE)
+def _cached_layout(seed, pool_sizes):
+    return _draw_layout(random.Random(seed), pool_sizes)
+
+
+def exam_layout(seed, pool_sizes):
+    """
+    Composition d'un examen blanc : indices des questions tirées dans chaque partie
+
+    Le tirage utilise un générateur isolé random.Random(seed) (le générateur
+    global du processus n'est pas touché) et donne les mêmes questions que
+    l'ancien random.seed(seed) + random.sample. Le résultat est mémorisé par
+    seed dans un cache LRU partagé par le processus.
+
+    Args:
+        seed: identifiant de l'examen (None : tirage non reproductible, non mis en cache)
+        pool_sizes: (taille du thème de la partie 1, taille du thème de la partie 2)
+
+    Returns:
+        tuple: (indices partie 1, indices partie 2), tuples d'entiers
+    """
+    if seed is None:
+        return _draw_layout(random.Random(), tuple(pool_sizes))
+    return _cached_layout(seed, tuple(pool_sizes))
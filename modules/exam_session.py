@@ -0,0 +1,151 @@
+from array import array
+from collections.abc import Mapping, Sequence
+from modules.answer_store import exam_key
+from modules.data_loader import get_exam_bank
+from modules.exam_layout import EXAM_PART_THEMES, exam_layout
+from modules.review_scheduler import exam_card_key
+
+EXAM_PART_TITLES = {
+    1: 'Partie 1 - Environnement réglementaire',
+    2: 'Partie 2 - Connaissances techniques',
+}
+
+
+class ExamQuestion(Mapping):
+    """
+    Question d'examen résolue à la demande (vue, sans copie)
+
+    Champs de la question de la banque partagée, complétés par ceux propres à
+    l'examen : id (clé de réponse), exam_part et theme_display.
+    """
+
+    __slots__ = ('_question', '_fields')
+
+    def __init__(self, question, fields):
+        self._question = question
+        self._fields = fields
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            return self._fields[key]
+        return self._question[key]
+
+    def __iter__(self):
+        yield from self._fields
+        for key in self._question:
+            if key not in self._fields:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class ExamQuestionList(Sequence):
+    """Suite de questions d'un examen désignées par leur position globale (0 à 119)"""
+
+    __slots__ = ('session', 'positions')
+
+    def __init__(self, session, positions):
+        self.session = session
+        self.positions = array('H', positions)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        return self.session.question_at(self.positions[index])
+
+
+class ExamSession:
+    """
+    Examen blanc en cours, gardé dans st.session_state
+
+    Ne contient que le seed et deux petits tableaux d'indices (un par partie)
+    dans les thèmes de la banque d'examen partagée : quelques centaines
+    d'octets au lieu de 120 questions copiées. Les questions sont résolues à
+    chaque accès.
+    """
+
+    __slots__ = ('seed', 'parts')
+
+    def __init__(self, seed, layout):
+        self.seed = seed
+        self.parts = tuple(array('H', indices) for indices in layout)
+
+    @property
+    def exam_id(self):
+        return self.seed
+
+    @property
+    def boundaries(self):
+        """Positions globales (début partie 1, début partie 2, fin)"""
+        return 0, len(self.parts[0]), len(self.parts[0]) + len(self.parts[1])
+
+    @property
+    def total_questions(self):
+        return self.boundaries[2]
+
+    def part_size(self, part):
+        return len(self.parts[part - 1])
+
+    def _module(self, part):
+        bank = get_exam_bank()
+        return bank.module_by_theme(EXAM_PART_THEMES[part]) if bank else None
+
+    def question(self, part, position):
+        """Question `position` (à partir de 0) de la partie `part`"""
+        question = self._module(part)['questions'][self.parts[part - 1][position]]
+        return ExamQuestion(question, {
+            'id': exam_key(self.seed, part, position),
+            'exam_part': part,
+            'theme_display': EXAM_PART_THEMES[part],
+        })
+
+    def question_at(self, global_position):
+        """Question désignée par sa position globale dans l'examen"""
+        part_start = self.boundaries[1]
+        if global_position < part_start:
+            return self.question(1, global_position)
+        return self.question(2, global_position - part_start)
+
+    def questions(self, part):
+        """Questions d'une partie, résolues à la demande"""
+        start = self.boundaries[part - 1]
+        return ExamQuestionList(self, range(start, start + self.part_size(part)))
+
+    def card_key(self, part, position):
+        """Clé de la fiche de révision de la question (question de la banque, quel que soit l'examen)"""
+        module = self._module(part)
+        return exam_card_key(module['id'], module['questions'][self.parts[part - 1][position]]['id'])
+
+    def correct_answers(self, part):
+        """Corrigé de la partie, dans l'ordre de l'examen ("ABCA...")"""
+        questions = self._module(part)['questions']
+        return ''.join(questions[i]['correct_answer'] for i in self.parts[part - 1])
+
+    def incorrect_questions(self, errors):
+        """
+        Questions en erreur (pour la révision des erreurs)
+
+        Args:
+            errors: Couples (partie, position) triés, voir ProgressAggregate.exam_error_positions
+        """
+        return ExamQuestionList(self, [self.boundaries[part - 1] + position for part, position in errors])
+
+
+def create_exam_session(exam_id=None):
+    """
+    Crée la session d'un examen blanc à partir de la composition (mise en cache) du seed
+
+    Returns:
+        ExamSession ou None si la banque d'examen est indisponible
+    """
+    bank = get_exam_bank()
+    if bank is None:
+        return None
+
+    modules = [bank.module_by_theme(EXAM_PART_THEMES[part]) for part in (1, 2)]
+    if not all(modules):
+        return None
+
+    return ExamSession(exam_id, exam_layout(exam_id, tuple(len(module['questions']) for module in modules)))
@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+from modules.answer_store import EXAM_PART_SIZES, exam_key
+
+# Taille au-delà de laquelle le journal est compacté dans le snapshot
+DEFAULT_COMPACT_THRESHOLD = 64 * 1024
+
+
+def apply_answer_event(user_answers, event, exam_seed_mapping=None, review_cards=None):
+    """
+    Applique un événement du journal à un dictionnaire de réponses
+
+    Événements :
+        {"k": clé, "v": lettre}       réponse validée (ou supprimée si "v" est null)
+        {"reset_module": module_id}   suppression des réponses (et fiches de révision) d'un module
+        {"reset_exam": seed}          suppression des réponses d'un examen blanc
+        {"reset_all": true}           réinitialisation complète des réponses et des fiches
+        {"exam_seed": n, "seed": s}   l'examen blanc n utilise désormais le seed s
+                                      (appliqué à exam_seed_mapping s'il est fourni)
+        {"review": clé, "card": [...]} fiche de répétition espacée de la question
+                                      (appliquée à review_cards s'il est fourni)
+    """
+    if 'k' in event:
+        if event.get('v') is None:
+            user_answers.pop(event['k'], None)
+        else:
+            user_answers[event['k']] = event['v']
+    elif 'review' in event:
+        if review_cards is not None:
+            review_cards[event['review']] = event['card']
+    elif 'reset_module' in event:
+        prefix = f"{event['reset_module']}_"
+        for key in [key for key in user_answers if key.startswith(prefix)]:
+            del user_answers[key]
+        if review_cards is not None:
+            for key in [key for key in review_cards if key.startswith(prefix)]:
+                del review_cards[key]
+    elif 'reset_exam' in event:
+        # Clés connues de l'examen : O(taille de l'examen), sans parcourir toutes les réponses
+        seed = event['reset_exam']
+        for part, size in EXAM_PART_SIZES.items():
+            for position in range(size):
+                user_answers.pop(exam_key(seed, part, position), None)
+    elif event.get('reset_all'):
+        user_answers.clear()
+        if review_cards is not None:
+            review_cards.clear()
+    elif 'exam_seed' in event:
+        if exam_seed_mapping is not None:
+            exam_seed_mapping[int(event['exam_seed'])] = event['seed']
+
+
+class AnswerJournal:
+    """
+    Journal append-only des réponses validées (une ligne JSON par événement)
+
+    Chaque ajout est écrit puis fsync : coût O(événements) indépendant du nombre
+    total de réponses. Le chargement rejoue le journal sur le dernier snapshot ;
+    la compaction (réécriture du snapshot) se fait dans un thread dès que le
+    journal dépasse `compact_threshold` octets.
+    """
+
+    def __init__(self, path, compact_threshold=DEFAULT_COMPACT_THRESHOLD):
+        self.path = path
+        self.compacting_path = f"{path}.compacting"
+        self.compact_threshold = compact_threshold
+        self._lock = threading.Lock()
+        self._compaction_thread = None
+
+    def append(self, events):
+        """Ajoute des événements au journal (écriture + fsync)"""
+        if not events:
+            return
+        payload = ''.join(json.dumps(event, ensure_ascii=False) + '\n' for event in events)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def replay(self, user_answers, exam_seed_mapping=None, review_cards=None):
+        """
+        Rejoue les journaux (compaction interrompue puis courant) sur user_answers
+        (et exam_seed_mapping, review_cards s'ils sont fournis)
+
+        Une dernière ligne tronquée (arrêt pendant une écriture) est ignorée.
+
+        Returns:
+            int: nombre d'événements appliqués
+        """
+        applied = 0
+        for path in (self.compacting_path, self.path):
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    apply_answer_event(user_answers, event, exam_seed_mapping, review_cards)
+                    applied += 1
+        return applied
+
+    def is_compacting(self):
+        return self._compaction_thread is not None and self._compaction_thread.is_alive()
+
+    def needs_compaction(self):
+        return not self.is_compacting() and self.size() >= self.compact_threshold
+
+    def compact_async(self, snapshot, write_snapshot):
+        """
+        Lance la compaction en arrière-plan
+
+        Le journal courant est renommé (O(1)) : les nouveaux événements partent
+        dans un journal neuf pendant que le thread écrit `snapshot` (état complet
+        au moment de la rotation) puis supprime le journal renommé.
+        """
+        with self._lock:
+            if self.is_compacting() or not os.path.exists(self.path):
+                return False
+            if os.path.exists(self.compacting_path):
+                # Compaction précédente interrompue : fusionner avant la rotation
+                with open(self.path, 'r', encoding='utf-8') as src, \
+                        open(self.compacting_path, 'a', encoding='utf-8') as dst:
+                    dst.write(src.read())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.compacting_path)
+
+            self._compaction_thread = threading.Thread(
+                target=self._compact, args=(snapshot, write_snapshot),
+                name="answer-journal-compaction"
+            )
+            self._compaction_thread.start()
+        return True
+
+    def _compact(self, snapshot, write_snapshot):
+        try:
+            write_snapshot(snapshot)
+            os.remove(self.compacting_path)
+            print(f"🗜️ Journal compacté: {len(snapshot.get('user_answers', {}))} réponses dans le snapshot")
+        except Exception as e:
+            # Le journal renommé est conservé : il sera rejoué au prochain chargement
+            print(f"⚠️ Erreur lors de la compaction du journal: {e}")
+
+    def wait(self):
+        """Attend la fin d'une compaction en cours"""
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join()
+
+    def clear(self):
+        """Supprime les journaux (après écriture d'un snapshot complet)"""
+        self.wait()
+        with self._lock:
+            for path in (self.compacting_path, self.path):
+                if os.path.exists(path):
+                    os.remove(path)
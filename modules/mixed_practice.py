@@ -0,0 +1,208 @@
+import streamlit as st
+from datetime import datetime
+from modules.data_loader import get_question_bank
+from modules.persistence import on_answer_validated, save_user_progress
+from modules.practice_sampler import (
+    CORRECT_WEIGHT, ERROR_WEIGHT, PracticeSampler, module_factor, question_weight
+)
+from modules.progress import get_progress, record_answer
+from modules.quiz_common import render_question_header, render_question_card, rerun_question
+from modules.timing import timed
+
+MIXED_MODE = 'mixed'
+
+DRAW_REASONS = {
+    ERROR_WEIGHT: "❌ Erreur lors de votre dernière réponse",
+    CORRECT_WEIGHT: "✅ Déjà réussie",
+}
+UNSEEN_REASON = "🆕 Jamais vue"
+
+
+def _draw(state, sampler, exclude=None):
+    """Tire la question suivante et note pourquoi elle a été choisie"""
+    drawn = sampler.sample(exclude=exclude)
+    if drawn is None:
+        return False
+    module_id, position = drawn
+    state['current'] = drawn
+    state['draw'] += 1
+    state['validated'] = None
+    state['reason'] = DRAW_REASONS.get(sampler.questions[module_id].weights[position], UNSEEN_REASON)
+    state['probability'] = sampler.probability(module_id, position)
+    return True
+
+
+def start_mixed_practice():
+    """
+    Lance l'entraînement mixte : questions tirées dans les 12 modules selon leur faiblesse
+
+    Returns:
+        bool: False si la banque n'est pas disponible
+    """
+    bank = get_question_bank()
+    store = st.session_state.user_answers
+    if bank is None or not hasattr(store, 'module_status'):
+        return False
+    progress = get_progress()
+    sampler = PracticeSampler.from_progress(bank, store.module_status, progress.module_errors, progress.module)
+    state = {'current': None, 'draw': 0, 'validated': None, 'answered': 0, 'correct': 0, 'by_module': {}}
+    if not _draw(state, sampler):
+        return False
+    st.session_state.practice_sampler = sampler
+    st.session_state.mixed_practice = state
+    st.session_state.current_module = None
+    st.session_state.current_question_idx = 0
+    st.session_state.quiz_started = True
+    st.session_state.quiz_completed = False
+    st.session_state.start_time = datetime.now()
+    st.session_state.quiz_mode = MIXED_MODE
+    # Nettoyer les données d'examen blanc
+    st.session_state.exam_blanc_questions = None
+    st.session_state.current_exam_blanc_id = None
+    return True
+
+
+def end_mixed_practice():
+    """Quitte l'entraînement mixte (retour au tableau de bord)"""
+    st.session_state.quiz_started = False
+    st.session_state.quiz_completed = False
+    st.session_state.quiz_mode = 'practice'
+    for key in ('mixed_practice', 'practice_sampler'):
+        if key in st.session_state:
+            del st.session_state[key]
+
+
+def _validate(state, module, position, question, choice):
+    """
+    Enregistre la réponse puis met à jour le poids de la question et le facteur de son module
+
+    Les réponses sont celles des modules (progression, erreurs, révision du jour).
+    """
+    module_id = module['id']
+    correct_answer = question['correct_answer']
+    record_answer(f"{module_id}_{question['id']}", choice, correct_answer)
+    on_answer_validated()
+
+    counters = get_progress().module(module_id)
+    st.session_state.practice_sampler.update(
+        module_id, position,
+        question_weight(choice, correct_answer),
+        module_factor(counters['correct'], counters['answered'])
+    )
+
+    state['validated'] = choice
+    state['answered'] += 1
+    module_stats = state['by_module'].setdefault(module_id, [0, 0])
+    module_stats[0] += 1
+    if choice == correct_answer:
+        state['correct'] += 1
+        module_stats[1] += 1
+
+
+@st.fragment
+@timed("fragment:mixed")
+def show_mixed_practice_interface():
+    """
+    Entraînement mixte : une question à la fois, tirée dans tous les modules
+
+    Fragment Streamlit, comme le quiz standard (voir quiz_common.rerun_question).
+    """
+    state = st.session_state.get('mixed_practice')
+    sampler = st.session_state.get('practice_sampler')
+    bank = get_question_bank()
+    if not state or sampler is None or bank is None:
+        end_mixed_practice()
+        st.rerun()
+        return
+
+    module_id, position = state['current']
+    module = bank.module(module_id)
+    question = module['questions'][position]
+    render_question_header("🔀 Entraînement mixte", subtitle=f"{module['title']} : {module['full_title']}")
+    st.caption(f"Question tirée n°{state['draw']} • {state['reason']} • "
+               f"probabilité de tirage {state['probability']:.2%}")
+
+    render_question_card(question['id'], question['question'])
+
+    options = question['options']
+    option_keys = list(options.keys())
+    validated = state['validated']
+    st.markdown("**Choisissez votre réponse :**")
+    user_choice = st.radio(
+        "Options",
+        option_keys,
+        format_func=lambda x: f"{x} - {options[x]}",
+        key=f"q_{MIXED_MODE}_{state['draw']}",
+        index=option_keys.index(validated) if validated in option_keys else None,
+        disabled=validated is not None,
+        label_visibility="collapsed"
+    )
+
+    if validated is not None:
+        correct_answer = question['correct_answer']
+        if validated == correct_answer:
+            st.success(f"✅ **Correct !** Votre choix : {validated} - {options[validated]}")
+        else:
+            st.error(f"❌ **Incorrect** • Votre choix : {validated} - {options[validated]}")
+            st.info(f"🎯 **Bonne réponse :** {correct_answer} - {options[correct_answer]}")
+
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        if validated is None:
+            if st.button("💾 Valider", type="primary", use_container_width=True, disabled=not user_choice):
+                _validate(state, module, position, question, user_choice)
+                rerun_question(refresh_app=True)
+    with col2:
+        if st.button("➡️ Question suivante", type="primary" if validated else "secondary", use_container_width=True):
+            if validated is None:
+                st.warning("⚠️ Veuillez d'abord valider votre réponse")
+            else:
+                _draw(state, sampler, exclude=state['current'])
+                rerun_question()
+    with col3:
+        if st.button("🏁 Terminer", use_container_width=True):
+            st.session_state.quiz_completed = True
+            st.rerun()
+
+
+def show_mixed_practice_results():
+    """Bilan de l'entraînement mixte, par module"""
+    state = st.session_state.get('mixed_practice')
+    bank = get_question_bank()
+    if not state or bank is None:
+        end_mixed_practice()
+        st.rerun()
+        return
+
+    answered, correct = state['answered'], state['correct']
+    st.markdown("""
+    <div class="results-header">
+        <h1>🎉 Entraînement terminé !</h1>
+        <h2>🔀 Entraînement mixte</h2>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("✅ Bonnes réponses", f"{correct} / {answered}")
+    with col2:
+        st.metric("📚 Modules travaillés", len(state['by_module']))
+    with col3:
+        st.metric("📊 Score", f"{(correct / answered) * 100 if answered else 0:.1f}%")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("🔀 Nouvel entraînement mixte", type="primary", use_container_width=True):
+            start_mixed_practice()
+            st.rerun()
+    with col2:
+        if st.button("📚 Tableau de bord", use_container_width=True):
+            save_user_progress()
+            end_mixed_practice()
+            st.rerun()
+
+    if state['by_module']:
+        st.subheader("📈 Par module")
+        for module_id, (module_answered, module_correct) in sorted(state['by_module'].items()):
+            module = bank.module(module_id)
+            st.write(f"**{module['title']}** - {module['full_title']} : {module_correct} / {module_answered}")
@@ -0,0 +1,50 @@
+import os
+import streamlit as st
+import streamlit.components.v1 as components
+
+# Codes du vecteur d'état envoyé à la grille (une lettre par question)
+NAV_CURRENT = 'c'
+NAV_ANSWERED = 'a'
+NAV_UNANSWERED = 'u'
+NAV_PLAIN = '-'
+
+_COMPONENT_DIR = os.path.join(os.path.dirname(__file__), "components", "question_nav")
+_question_nav = components.declare_component("question_nav", path=_COMPONENT_DIR)
+
+
+def navigation_status(answered, current_idx):
+    """
+    Construit le vecteur d'état de la grille
+
+    Args:
+        answered: chaîne de NAV_ANSWERED / NAV_UNANSWERED / NAV_PLAIN, une lettre par question
+        current_idx: index de la question affichée
+
+    Returns:
+        str: le même vecteur avec NAV_CURRENT à la position actuelle
+    """
+    if 0 <= current_idx < len(answered):
+        return answered[:current_idx] + NAV_CURRENT + answered[current_idx + 1:]
+    return answered
+
+
+def question_navigator(status, key, on_select, columns=15):
+    """
+    Grille de navigation rapide rendue par un seul composant (un widget par rerun)
+
+    Le navigateur reçoit le vecteur d'état en une chaîne compacte et renvoie
+    {index, nonce} au clic. Le rappel s'exécute avant le rerun suivant
+    (limité au fragment quand la grille est dans un fragment).
+
+    Args:
+        status: vecteur d'état (voir navigation_status)
+        key: clé du widget
+        on_select: fonction appelée avec l'index (à partir de 0) de la question cliquée
+        columns: nombre de boutons par ligne
+    """
+    def handle_click():
+        clicked = st.session_state.get(key)
+        if clicked and 0 <= clicked.get('index', -1) < len(status):
+            on_select(clicked['index'])
+
+    _question_nav(status=status, columns=columns, key=key, on_change=handle_click, default=None)
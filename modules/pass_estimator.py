@@ -0,0 +1,123 @@
+"""
+Probabilité de réussite à l'examen estimée par simulation (Monte Carlo, NumPy)
+
+Chaque question de la banque d'examen reçoit une probabilité de bonne
+réponse : celle de sa partie, déduite des taux de réussite des modules
+d'entraînement correspondants, corrigée par les réponses déjà données à
+cette question dans les examens blancs.
+
+Un examen simulé tire EXAM_PART_SIZES questions de chaque partie sans remise,
+comme exam_layout. Le tirage se fait en deux étapes vectorisées, équivalentes
+à simuler question par question :
+- nombre de questions de la partie que l'apprenant réussirait, tiré selon sa
+  loi exacte (somme de Bernoulli, calculée une fois par convolution) ;
+- nombre de bonnes réponses parmi les questions tirées : loi hypergéométrique
+  (tirage sans remise parmi les réussies et les ratées).
+L'examen est réussi si chaque partie atteint PASS_RATIO.
+
+Module sans Streamlit : voir modules/dashboard.py pour la collecte des
+réponses et l'affichage.
+"""
+import math
+import numpy as np
+from modules.answer_store import EXAM_PART_SIZES
+
+# Seuil de réussite de chaque partie (80 %)
+PASS_RATIO = 0.8
+
+# Examens simulés par estimation
+SIMULATIONS = 100_000
+
+# Poids (en nombre de réponses) de l'estimation de la partie face aux réponses à la question
+PRIOR_STRENGTH = 2.0
+
+# Modules d'entraînement qui alimentent chaque partie de l'examen
+EXAM_PART_MODULES = {
+    1: (1, 2, 3, 4, 5),
+    2: (6, 7, 8, 9, 10, 11, 12),
+}
+
+
+def pass_threshold(size):
+    """Bonnes réponses nécessaires pour valider une partie de size questions"""
+    return math.ceil(PASS_RATIO * size - 1e-9)
+
+
+def part_prior(module_stats):
+    """
+    Probabilité de bonne réponse d'une partie d'après ses modules d'entraînement
+
+    Taux de réussite lissé de chaque module ((bonnes + 1) / (réponses + 2),
+    0,5 sans réponse), pondéré par le nombre de questions du module.
+
+    Args:
+        module_stats: Triplets (questions du module, bonnes réponses, réponses)
+    """
+    weighted = total = 0.0
+    for size, correct, answered in module_stats:
+        weighted += size * (correct + 1) / (answered + 2)
+        total += size
+    return weighted / total if total else 0.5
+
+
+def question_estimates(pool_size, prior, evidence=None):
+    """
+    Probabilités de bonne réponse des questions d'une partie
+
+    Args:
+        pool_size: Questions de la partie dans la banque d'examen
+        prior: Probabilité de la partie (part_prior)
+        evidence: {index de la question: (bonnes réponses, réponses)} dans les examens blancs
+    """
+    estimates = np.full(pool_size, prior)
+    for index, (correct, answered) in (evidence or {}).items():
+        estimates[index] = (PRIOR_STRENGTH * prior + correct) / (PRIOR_STRENGTH + answered)
+    return estimates
+
+
+def success_distribution(estimates):
+    """Loi exacte du nombre de questions réussies parmi toutes celles de la partie"""
+    values, counts = np.unique(np.round(estimates, 6), return_counts=True)
+    distribution = np.ones(1)
+    for p, count in zip(values, counts):
+        # Loi binomiale des `count` questions de même probabilité, par convolutions successives
+        for _ in range(count):
+            distribution = np.convolve(distribution, (1.0 - p, p))
+    return distribution
+
+
+def simulate_part(estimates, size, rng, simulations=SIMULATIONS):
+    """Bonnes réponses de `simulations` tirages de `size` questions parmi la partie"""
+    pool_size = len(estimates)
+    size = min(size, pool_size)
+    cumulative = np.cumsum(success_distribution(estimates))
+    successes = np.searchsorted(cumulative, rng.random(simulations) * cumulative[-1], side='right')
+    successes = np.minimum(successes, pool_size)
+    return rng.hypergeometric(successes, pool_size - successes, size)
+
+
+def estimate_pass_probability(part_estimates, simulations=SIMULATIONS, seed=None):
+    """
+    Simule des examens complets et renvoie les probabilités de réussite
+
+    Args:
+        part_estimates: {partie: probabilités de bonne réponse des questions de la partie}
+        simulations: Nombre d'examens simulés
+        seed: Graine du générateur (résultats reproductibles)
+
+    Returns:
+        dict: {'probability', 'simulations', 'parts': {partie: {'probability', 'expected_score'}}}
+    """
+    rng = np.random.default_rng(seed)
+    passed = np.ones(simulations, dtype=bool)
+    parts = {}
+    for part, estimates in part_estimates.items():
+        size = min(EXAM_PART_SIZES[part], len(estimates))
+        correct = simulate_part(estimates, size, rng, simulations)
+        part_passed = correct >= pass_threshold(size)
+        passed &= part_passed
+        parts[part] = {
+            'probability': float(part_passed.mean()),
+            'expected_score': float(correct.mean() / size * 100),
+        }
+    return {'probability': float(passed.mean()), 'simulations': simulations, 'parts': parts}
@@ -1,13 +1,30 @@
 import json
 import os
+import re
 import streamlit as st
 from datetime import datetime
 from pathlib import Path
+from modules.progress import (
+    build_review_scheduler, create_answer_store, get_progress, log_answer_event, reset_progress_aggregate
+)
+from modules.review_scheduler import ReviewScheduler
+from modules.progress_store import (
+    DEFAULT_BACKEND, DEFAULT_LEARNER_ID, JournalProgressStore, create_progress_store
+)
+from modules.save_worker import save_worker
 
 # Configuration des fichiers de sauvegarde - MODIFIÉ vers checkpoint
 SAVE_DIRECTORY = "checkpoint"
-PROGRESS_FILE = f"{SAVE_DIRECTORY}/user_progress.json"
-BACKUP_FILE = f"{SAVE_DIRECTORY}/user_progress_backup.json"
+
+# Backend de progression : sqlite (défaut), journal, json ou memory
+PROGRESS_BACKEND = os.environ.get("AMF_PROGRESS_BACKEND", DEFAULT_BACKEND)
+LEARNER_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+# Store de progression partagé par le processus : seul point d'accès au disque
+progress_store = create_progress_store(PROGRESS_BACKEND, SAVE_DIRECTORY)
+
+# Délai maximal d'attente de la durabilité lors d'un flush explicite (secondes)
+FLUSH_TIMEOUT_SECONDS = 10
 
 def ensure_save_directory():
     """Crée le répertoire de sauvegarde s'il n'existe pas"""
@@ -41,6 +58,8 @@ def get_default_progress():
     """Retourne la structure par défaut de progression"""
     return {
         "user_answers": {},
+        "exam_seed_mapping": {},
+        "review_cards": {},
         "last_updated": datetime.now().isoformat(),
         "version": "1.0",
         "statistics": {
@@ -52,97 +71,145 @@ def get_default_progress():
         }
     }
 
+def get_learner_id():
+    """
+    Identifiant de l'apprenant de la session
+    
+    Lu dans l'URL (?learner=...) au premier appel, sinon apprenant par défaut.
+    
+    Returns:
+        str: identifiant de l'apprenant
+    """
+    if 'learner_id' not in st.session_state:
+        learner_id = st.query_params.get('learner', DEFAULT_LEARNER_ID)
+        if not LEARNER_ID_PATTERN.match(learner_id):
+            print(f"⚠️ Identifiant d'apprenant invalide ignoré: {learner_id!r}")
+            learner_id = DEFAULT_LEARNER_ID
+        st.session_state.learner_id = learner_id
+    return st.session_state.learner_id
+
 def load_user_progress():
     """
-    Charge la progression de l'utilisateur depuis le fichier JSON
+    Charge la progression de l'apprenant depuis le store de progression
+    
+    Au premier lancement d'un backend non fichier, l'ancien user_progress.json
+    (et son journal) est importé pour l'apprenant par défaut.
     
     Returns:
         dict: Données de progression ou données par défaut si erreur
     """
     ensure_save_directory()
+    learner_id = get_learner_id()
     
     try:
-        # Essayer de charger le fichier principal
-        if os.path.exists(PROGRESS_FILE):
-            with open(PROGRESS_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            # Valider la structure des données
-            if validate_progress_data(data):
-                print(f"✅ Progression chargée: {len(data.get('user_answers', {}))} réponses")
-                return data
-            else:
-                print("⚠️ Structure de données invalide, tentative de récupération du backup")
-                
-        # Essayer le fichier de backup
-        if os.path.exists(BACKUP_FILE):
-            with open(BACKUP_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            if validate_progress_data(data):
-                print("✅ Progression récupérée depuis le backup")
-                return data
-        
-        print("📝 Nouvelle session: progression initialisée")
-        return get_default_progress()
+        if learner_id == DEFAULT_LEARNER_ID and not progress_store.has_learner(learner_id):
+            migrate_legacy_progress(learner_id)
         
+        stored = progress_store.load(learner_id)
+        progress_store.start_session(learner_id)
     except Exception as e:
         print(f"❌ Erreur lors du chargement: {e}")
         return get_default_progress()
+    
+    data = get_default_progress()
+    data['user_answers'] = stored['user_answers']
+    data['exam_seed_mapping'] = stored.get('exam_seed_mapping', {})
+    data['review_cards'] = stored.get('review_cards', {})
+    data['last_updated'] = stored['last_updated'] or data['last_updated']
+    data['statistics']['total_sessions'] = stored['session_count']
+    
+    if stored['user_answers']:
+        print(f"✅ Progression chargée ({learner_id}, {progress_store.name}): {len(stored['user_answers'])} réponses")
+    else:
+        print(f"📝 Nouvelle session ({learner_id}, {progress_store.name}): progression initialisée")
+    return data
 
-def validate_progress_data(data):
+def migrate_legacy_progress(learner_id):
     """
-    Valide la structure des données de progression
+    Importe l'ancien snapshot JSON + journal dans le store (une seule fois)
+    
+    Returns:
+        int: nombre de réponses importées
+    """
+    legacy = JournalProgressStore(SAVE_DIRECTORY)
+    if not legacy.has_learner(learner_id):
+        return 0
+    
+    legacy_progress = legacy.load(learner_id)
+    user_answers = legacy_progress['user_answers']
+    progress_store.import_answers(learner_id, user_answers, legacy_progress['exam_seed_mapping'],
+                                  legacy_progress['review_cards'])
+    print(f"📦 Ancienne progression importée ({learner_id}): {len(user_answers)} réponses")
+    return len(user_answers)
+
+def build_progress_data():
+    """Prépare l'export complet de la progression de la session"""
+    return {
+        "learner_id": get_learner_id(),
+        "user_answers": dict(st.session_state.user_answers.items()),
+        "exam_seed_mapping": dict(st.session_state.get('exam_seed_mapping', {})),
+        "review_cards": dict(st.session_state.review_scheduler.cards) if 'review_scheduler' in st.session_state else {},
+        "last_updated": datetime.now().isoformat(),
+        "version": "1.0",
+        "statistics": calculate_user_statistics()
+    }
+
+def export_progress(path, progress_data):
+    """Écrit un export JSON de la progression (fichier temporaire + rename)"""
+    ensure_save_directory()
+    
+    temp_file = f"{path}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(progress_data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, path)
+
+def flush_pending_answers(wait=False):
+    """
+    Confie les événements en attente de la session au thread de sauvegarde
+    Le clic ne bloque pas sur le disque sauf si wait=True (retour au menu).
     
-    Args:
-        data: Données à valider
-        
     Returns:
-        bool: True si valide, False sinon
+        bool: True si les événements sont durables (toujours True si wait=False)
     """
-    if not isinstance(data, dict):
+    events = st.session_state.get('pending_answer_events')
+    if events:
+        ensure_save_directory()
+        learner_log = progress_store.learner(get_learner_id())
+        st.session_state.last_save_ticket = save_worker.submit(learner_log, events)
+        st.session_state.pending_answer_events = []
+        st.session_state.last_save_time = datetime.now()
+    
+    if wait:
+        return save_worker.flush(timeout=FLUSH_TIMEOUT_SECONDS)
+    return True
+
+def is_progress_durable():
+    """Indique si toutes les réponses validées de la session sont sur disque"""
+    if st.session_state.get('pending_answer_events'):
         return False
-        
-    required_keys = ["user_answers", "last_updated", "version"]
-    return all(key in data for key in required_keys)
+    ticket = st.session_state.get('last_save_ticket')
+    return ticket is None or save_worker.is_durable(ticket)
 
 def save_user_progress(force_save=False):
     """
     Sauvegarde la progression de l'utilisateur
     
+    Le store ne reçoit que les événements en attente (jamais un état complet
+    envoyé par la page) : force_save attend en plus que le thread de
+    sauvegarde ait tout écrit, y compris pour les autres sessions.
+    
     Args:
-        force_save: Force la sauvegarde même si peu de changements
+        force_save: Attendre la durabilité de toutes les écritures du processus
     """
     try:
-        ensure_save_directory()
-        
-        # Préparer les données à sauvegarder
-        progress_data = {
-            "user_answers": st.session_state.user_answers,
-            "last_updated": datetime.now().isoformat(),
-            "version": "1.0",
-            "statistics": calculate_user_statistics()
-        }
+        durable = flush_pending_answers(wait=True)
         
-        # Créer un backup du fichier existant
-        if os.path.exists(PROGRESS_FILE):
-            try:
-                os.replace(PROGRESS_FILE, BACKUP_FILE)
-            except Exception as e:
-                print(f"⚠️ Impossible de créer le backup: {e}")
-        
-        # Sauvegarder les nouvelles données
-        with open(PROGRESS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(progress_data, f, ensure_ascii=False, indent=2)
-        
-        # Mettre à jour les métadonnées de session
-        if 'last_save_time' not in st.session_state:
-            st.session_state.last_save_time = datetime.now()
-        else:
+        if force_save:
             st.session_state.last_save_time = datetime.now()
-            
-        print(f"💾 Progression sauvegardée: {len(st.session_state.user_answers)} réponses")
-        return True
+            print(f"💾 Progression sauvegardée ({get_learner_id()}): {len(st.session_state.user_answers)} réponses")
+        return durable
         
     except Exception as e:
         st.error(f"❌ Erreur lors de la sauvegarde: {e}")
@@ -178,29 +245,13 @@ def calculate_user_statistics():
 
 def auto_save_progress():
     """
-    Sauvegarde automatique intelligente
-    Sauvegarde seulement si des changements significatifs ont eu lieu
+    Sauvegarde automatique : écrit les réponses validées depuis le dernier flush
     """
     if 'user_answers' not in st.session_state:
         return
     
-    # Vérifier s'il y a eu des changements depuis la dernière sauvegarde
-    current_answers_count = len(st.session_state.user_answers)
-    last_saved_count = st.session_state.get('last_saved_answers_count', 0)
-    
-    # Sauvegarder si :
-    # 1. Il y a plus de 5 nouvelles réponses
-    # 2. Plus de 5 minutes se sont écoulées depuis la dernière sauvegarde
-    # 3. Force save demandée
-    should_save = (
-        current_answers_count - last_saved_count >= 5 or
-        (st.session_state.get('last_save_time') and 
-         (datetime.now() - st.session_state.last_save_time).seconds > 300)
-    )
-    
-    if should_save:
-        if save_user_progress():
-            st.session_state.last_saved_answers_count = current_answers_count
+    flush_pending_answers()
+    st.session_state.last_saved_answers_count = len(st.session_state.user_answers)
 
 def reset_user_progress():
     """
@@ -208,16 +259,21 @@ def reset_user_progress():
     """
     try:
         # Créer un backup avant la réinitialisation
-        if os.path.exists(PROGRESS_FILE):
-            backup_reset_file = f"{SAVE_DIRECTORY}/progress_before_reset_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            os.replace(PROGRESS_FILE, backup_reset_file)
+        if st.session_state.get('user_answers'):
+            learner_id = get_learner_id()
+            backup_reset_file = f"{SAVE_DIRECTORY}/progress_before_reset_{learner_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            export_progress(backup_reset_file, build_progress_data())
             print(f"💾 Backup créé avant réinitialisation: {backup_reset_file}")
         
         # Réinitialiser en mémoire
-        st.session_state.user_answers = {}
+        st.session_state.user_answers = create_answer_store()
+        st.session_state.pending_answer_events = []
+        reset_progress_aggregate()
+        st.session_state.review_scheduler = ReviewScheduler()
         st.session_state.last_saved_answers_count = 0
         
-        # Sauvegarder l'état vide
+        # Supprimer les lignes de l'apprenant
+        log_answer_event({'reset_all': True})
         save_user_progress(force_save=True)
         
         print("🔄 Progression réinitialisée avec succès")
@@ -238,8 +294,16 @@ def initialize_session_with_persistence():
     # Charger la progression sauvegardée
     saved_progress = load_user_progress()
     
-    # Restaurer les réponses utilisateur
-    st.session_state.user_answers = saved_progress.get('user_answers', {})
+    # Restaurer les réponses utilisateur (les compteurs seront reconstruits au premier accès)
+    st.session_state.user_answers = create_answer_store(saved_progress.get('user_answers', {}))
+    st.session_state.pending_answer_events = []
+    reset_progress_aggregate()
+    
+    # Seeds des examens blancs régénérés (numéro d'examen -> seed)
+    st.session_state.exam_seed_mapping = dict(saved_progress.get('exam_seed_mapping', {}))
+    
+    # Fiches de répétition espacée (file des révisions à venir)
+    st.session_state.review_scheduler = build_review_scheduler(saved_progress.get('review_cards', {}), get_progress())
     
     # Initialiser les autres variables de session si nécessaire
     defaults = {
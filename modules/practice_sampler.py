@@ -0,0 +1,209 @@
+"""
+Tirage pondéré des questions de l'entraînement mixte (tous les modules)
+
+Le poids d'une question dépend de son état (jamais vue, dernière réponse
+fausse ou juste) multiplié par un facteur de son module, d'autant plus grand
+que le taux de réussite du module est faible.
+
+Les poids sont rangés dans des arbres de Fenwick (sommes préfixes) : un arbre
+par module sur ses questions, et un arbre des modules dont chaque entrée vaut
+(somme des poids du module) × facteur du module. Un tirage descend les deux
+arbres et une mise à jour après réponse modifie une feuille de chacun :
+O(log n) dans les deux cas, sans recalculer tous les poids.
+
+Module pur Python (sans Streamlit) : voir modules/mixed_practice.py pour l'interface.
+"""
+import random
+
+# Poids d'une question selon sa dernière réponse
+UNSEEN_WEIGHT = 2.0
+ERROR_WEIGHT = 4.0
+CORRECT_WEIGHT = 0.5
+
+# Facteur de module : 1 + taux d'erreur, UNSEEN_MODULE_FACTOR si aucune réponse
+UNSEEN_MODULE_FACTOR = 1.5
+
+# Tirages successifs évitant de reproposer la question précédente
+MAX_REDRAWS = 8
+
+
+def question_weight(choice, correct_answer):
+    """Poids de faiblesse d'une question d'après sa dernière réponse (None : jamais vue)"""
+    if choice is None:
+        return UNSEEN_WEIGHT
+    return CORRECT_WEIGHT if choice == correct_answer else ERROR_WEIGHT
+
+
+def module_factor(correct, answered):
+    """Facteur de faiblesse d'un module d'après son taux de réussite"""
+    if not answered:
+        return UNSEEN_MODULE_FACTOR
+    return 1.0 + (1.0 - correct / answered)
+
+
+class FenwickTree:
+    """
+    Poids positifs indexés de 0 à n - 1 avec somme préfixe et recherche en O(log n)
+
+    weights garde la valeur de chaque feuille : set() applique la différence,
+    find() descend l'arbre pour un tirage proportionnel aux poids.
+    """
+
+    __slots__ = ('weights', '_tree', '_top')
+
+    def __init__(self, weights):
+        self.weights = [float(weight) for weight in weights]
+        size = len(self.weights)
+        tree = [0.0] + self.weights
+        # Construction en O(n) : chaque nœud transmet sa somme à son parent
+        for index in range(1, size + 1):
+            parent = index + (index & -index)
+            if parent <= size:
+                tree[parent] += tree[index]
+        self._tree = tree
+        self._top = 1 << (size.bit_length() - 1) if size else 0
+
+    def __len__(self):
+        return len(self.weights)
+
+    @property
+    def total(self):
+        return self.prefix_sum(len(self.weights))
+
+    def prefix_sum(self, count):
+        """Somme des count premiers poids"""
+        tree = self._tree
+        total = 0.0
+        while count > 0:
+            total += tree[count]
+            count -= count & -count
+        return total
+
+    def set(self, index, weight):
+        """Remplace le poids d'une feuille (O(log n))"""
+        delta = weight - self.weights[index]
+        if not delta:
+            return
+        self.weights[index] = weight
+        tree = self._tree
+        size = len(self.weights)
+        index += 1
+        while index <= size:
+            tree[index] += delta
+            index += index & -index
+
+    def find(self, value):
+        """
+        Feuille dont l'intervalle cumulé contient value (0 <= value < total)
+
+        Les feuilles de poids nul ne sont jamais renvoyées, sauf arrondi
+        flottant en toute fin d'arbre (corrigé vers la dernière feuille non nulle).
+        """
+        tree = self._tree
+        size = len(self.weights)
+        index = 0
+        bit = self._top
+        while bit:
+            following = index + bit
+            if following <= size and tree[following] <= value:
+                index = following
+                value -= tree[following]
+            bit >>= 1
+        index = min(index, size - 1)
+        while index > 0 and self.weights[index] <= 0:
+            index -= 1
+        return index
+
+
+class PracticeSampler:
+    """
+    Tirage des questions de l'entraînement mixte proportionnellement à leur faiblesse
+
+    Questions désignées par (module_id, position dans le module).
+    """
+
+    __slots__ = ('module_ids', 'questions', 'factors', 'modules', '_module_index')
+
+    def __init__(self, module_weights, module_factors):
+        """
+        Args:
+            module_weights: {module_id: [poids des questions, dans l'ordre du module]}
+            module_factors: {module_id: facteur du module}
+        """
+        self.module_ids = list(module_weights)
+        self._module_index = {module_id: i for i, module_id in enumerate(self.module_ids)}
+        self.questions = {module_id: FenwickTree(weights) for module_id, weights in module_weights.items()}
+        self.factors = {module_id: module_factors.get(module_id, UNSEEN_MODULE_FACTOR) for module_id in self.module_ids}
+        self.modules = FenwickTree(
+            self.questions[module_id].total * self.factors[module_id] for module_id in self.module_ids
+        )
+
+    @classmethod
+    def from_progress(cls, bank, answer_status, error_positions, module_counters):
+        """
+        Poids initiaux depuis la progression (un passage sur la banque)
+
+        Args:
+            bank: QuestionBank d'entraînement
+            answer_status: module_id -> chaîne "a"/"u" des questions répondues (AnswerStore.module_status)
+            error_positions: module_id -> positions en erreur (ProgressAggregate.module_errors)
+            module_counters: module_id -> {'answered', 'correct'}
+        """
+        module_weights = {}
+        module_factors = {}
+        for module in bank.modules:
+            module_id = module['id']
+            status = answer_status(module_id)
+            errors = error_positions.get(module_id, ())
+            weights = [CORRECT_WEIGHT if answered == 'a' else UNSEEN_WEIGHT for answered in status]
+            for position in errors:
+                weights[position] = ERROR_WEIGHT
+            module_weights[module_id] = weights
+            counters = module_counters(module_id)
+            module_factors[module_id] = module_factor(counters['correct'], counters['answered'])
+        return cls(module_weights, module_factors)
+
+    def __len__(self):
+        return sum(len(tree) for tree in self.questions.values())
+
+    @property
+    def total(self):
+        return self.modules.total
+
+    def probability(self, module_id, position):
+        """Probabilité de tirer la question au prochain tirage"""
+        total = self.total
+        if not total:
+            return 0.0
+        return self.questions[module_id].weights[position] * self.factors[module_id] / total
+
+    def _refresh_module(self, module_id):
+        self.modules.set(self._module_index[module_id], self.questions[module_id].total * self.factors[module_id])
+
+    def update(self, module_id, position, weight, factor=None):
+        """
+        Nouveau poids d'une question (et facteur de son module) après une réponse : O(log n)
+        """
+        self.questions[module_id].set(position, weight)
+        if factor is not None:
+            self.factors[module_id] = factor
+        self._refresh_module(module_id)
+
+    def sample(self, rng=random, exclude=None):
+        """
+        Tire une question (module_id, position) proportionnellement à son poids
+
+        Args:
+            rng: Générateur aléatoire (random par défaut)
+            exclude: Question à ne pas reproposer tout de suite (question précédente)
+        """
+        if not self.module_ids or self.total <= 0:
+            return None
+        drawn = None
+        for _ in range(MAX_REDRAWS):
+            module_id = self.module_ids[self.modules.find(rng.random() * self.modules.total)]
+            questions = self.questions[module_id]
+            drawn = (module_id, questions.find(rng.random() * questions.total))
+            if drawn != exclude:
+                break
+        return drawn
@@ -0,0 +1,330 @@
+import itertools
+import streamlit as st
+from modules.data_loader import get_question_bank, get_scoring_engine
+from modules.answer_store import ANSWER_CODES, AnswerStore, parse_exam_key
+from modules.review_scheduler import ReviewScheduler, failed_card, today_number
+
+
+def parse_answer_key(unique_question_id):
+    """
+    Décode une clé de réponse
+
+    Returns:
+        tuple: ('module', module_id, question_id), ('exam', seed, part, position) ou None
+    """
+    parsed = parse_exam_key(unique_question_id)
+    if parsed:
+        return ('exam',) + parsed
+
+    module_id, _, question_id = unique_question_id.partition('_')
+    if module_id.isdigit() and question_id.isdigit():
+        return ('module', int(module_id), int(question_id))
+    return None
+
+
+# Numéros de version uniques dans le processus (un agrégat reconstruit ne
+# reprend jamais la version d'un agrégat précédent)
+_versions = itertools.count(1)
+
+
+class ProgressAggregate:
+    """
+    Compteurs de progression mis à jour en O(1) à chaque validation
+
+    - par module : réponses, bonnes réponses, dernier index répondu
+    - par examen (seed) et par partie : réponses, bonnes réponses
+    - erreurs : positions des questions dont la réponse est incorrecte, par
+      module et par examen (révision des erreurs en O(erreurs))
+
+    `version` change à chaque modification : c'est l'empreinte de la
+    progression utilisée comme clé des calculs mis en cache (tableau de bord).
+    """
+
+    def __init__(self):
+        self.modules = {}  # module_id -> {'answered', 'correct', 'last_index'}
+        self.exams = {}    # seed -> {part: {'answered', 'correct'}}
+        self.module_errors = {}  # module_id -> {position}
+        self.exam_errors = {}    # seed -> {(part, position)}
+        self.version = next(_versions)
+
+    def _touch(self):
+        self.version = next(_versions)
+
+    def _apply(self, counters, previous, choice, correct_answer):
+        """Met à jour answered/correct en tenant compte d'une éventuelle réponse précédente"""
+        if previous is None:
+            counters['answered'] += 1
+        elif previous == correct_answer:
+            counters['correct'] -= 1
+        if choice == correct_answer:
+            counters['correct'] += 1
+
+    def _track_error(self, errors, owner, entry, choice, correct_answer):
+        """Ajoute ou retire la question de l'ensemble d'erreurs de son module / examen"""
+        if choice != correct_answer:
+            errors.setdefault(owner, set()).add(entry)
+        elif owner in errors:
+            errors[owner].discard(entry)
+
+    def record_module_answer(self, module_id, position, previous, choice, correct_answer):
+        self._touch()
+        counters = self.modules.setdefault(module_id, {'answered': 0, 'correct': 0, 'last_index': -1})
+        self._apply(counters, previous, choice, correct_answer)
+        if position is not None:
+            self._track_error(self.module_errors, module_id, position, choice, correct_answer)
+            if position > counters['last_index']:
+                counters['last_index'] = position
+
+    def record_exam_answer(self, seed, part, position, previous, choice, correct_answer):
+        self._touch()
+        parts = self.exams.setdefault(seed, {})
+        counters = parts.setdefault(part, {'answered': 0, 'correct': 0})
+        self._apply(counters, previous, choice, correct_answer)
+        self._track_error(self.exam_errors, seed, (part, position), choice, correct_answer)
+
+    def module(self, module_id):
+        """Compteurs d'un module (zéros si aucune réponse)"""
+        return self.modules.get(module_id, {'answered': 0, 'correct': 0, 'last_index': -1})
+
+    def exam_part(self, seed, part):
+        """Compteurs d'une partie d'examen (zéros si aucune réponse)"""
+        return self.exams.get(seed, {}).get(part, {'answered': 0, 'correct': 0})
+
+    def exam_answered(self, seed):
+        """Nombre total de réponses d'un examen"""
+        return sum(counters['answered'] for counters in self.exams.get(seed, {}).values())
+
+    def total_module_answered(self):
+        """Nombre total de réponses d'entraînement"""
+        return sum(counters['answered'] for counters in self.modules.values())
+
+    def module_error_positions(self, module_id):
+        """Positions (dans le module) des questions en erreur, dans l'ordre du module"""
+        return sorted(self.module_errors.get(module_id, ()))
+
+    def exam_error_positions(self, seed):
+        """Couples (partie, position) des questions en erreur d'un examen, dans l'ordre de l'examen"""
+        return sorted(self.exam_errors.get(seed, ()))
+
+    def reset_module(self, module_id):
+        self._touch()
+        self.modules.pop(module_id, None)
+        self.module_errors.pop(module_id, None)
+
+    def reset_exam(self, seed):
+        self._touch()
+        self.exams.pop(seed, None)
+        self.exam_errors.pop(seed, None)
+
+
+def rebuild_progress(user_answers):
+    """
+    Reconstruit l'agrégat depuis un dictionnaire de réponses (chargement, import)
+
+    Les modules sont recalculés en un passage vectorisé ; les examens sont
+    résolus via la composition (mise en cache) de chaque seed rencontré.
+    """
+    aggregate = ProgressAggregate()
+
+    engine = get_scoring_engine()
+    if engine is not None:
+        answers = engine.encode_answers(user_answers)
+        correct, answered = engine.module_scores(answers)
+        for i, module_id in enumerate(engine.module_ids):
+            if answered[i] == 0:
+                continue
+            start, end = engine.bank.module_range(module_id)
+            last_index = int(answers[start:end].nonzero()[0][-1])
+            aggregate.modules[module_id] = {
+                'answered': int(answered[i]),
+                'correct': int(correct[i]),
+                'last_index': last_index
+            }
+        for slot in engine.error_slots(answers).tolist():
+            module_id = engine.module_ids[engine.module_index[slot]]
+            start, _ = engine.bank.module_range(module_id)
+            aggregate.module_errors.setdefault(module_id, set()).add(slot - start)
+
+    exam_keys = {}
+    for key, choice in user_answers.items():
+        parsed = parse_answer_key(key)
+        if parsed and parsed[0] == 'exam':
+            exam_keys.setdefault(parsed[1], []).append((parsed[2], parsed[3], choice))
+
+    if exam_keys:
+        from modules.exam_session import create_exam_session
+
+        for seed, entries in exam_keys.items():
+            exam = create_exam_session(seed)
+            if exam is None:
+                continue
+            corrections = {part: exam.correct_answers(part) for part in (1, 2)}
+            for part, position, choice in entries:
+                if position < len(corrections[part]):
+                    aggregate.record_exam_answer(seed, part, position, None, choice, corrections[part][position])
+
+    return aggregate
+
+
+def get_progress():
+    """Retourne l'agrégat de progression de la session (construit au premier accès)"""
+    if 'progress_aggregate' not in st.session_state:
+        st.session_state.progress_aggregate = rebuild_progress(st.session_state.get('user_answers', {}))
+    return st.session_state.progress_aggregate
+
+
+def record_answer(unique_question_id, choice, correct_answer):
+    """
+    Point unique de mutation : enregistre une réponse validée et met à jour les compteurs
+    """
+    if choice not in ANSWER_CODES:
+        return
+    progress = get_progress()
+    previous = st.session_state.user_answers.get(unique_question_id)
+    st.session_state.user_answers[unique_question_id] = choice
+    log_answer_event({'k': unique_question_id, 'v': choice})
+
+    parsed = parse_answer_key(unique_question_id)
+    if parsed is None:
+        return
+    if parsed[0] == 'exam':
+        _, seed, part, position = parsed
+        progress.record_exam_answer(seed, part, position, previous, choice, correct_answer)
+        _review_exam_answer(seed, part, position, choice == correct_answer)
+    else:
+        _, module_id, question_id = parsed
+        bank = get_question_bank()
+        position = bank.position(module_id, question_id) if bank else None
+        progress.record_module_answer(module_id, position, previous, choice, correct_answer)
+        record_review(unique_question_id, choice == correct_answer)
+
+
+def build_review_scheduler(review_cards=None, progress=None):
+    """
+    Crée l'échéancier de répétition espacée depuis les fiches sauvegardées
+
+    Les erreurs de l'agrégat sans fiche (réponses antérieures à la
+    répétition espacée) reçoivent une fiche due aujourd'hui ; elle n'est
+    écrite qu'à sa première révision.
+    """
+    cards = dict(review_cards or {})
+    if progress is None:
+        return ReviewScheduler(cards)
+    today = today_number()
+
+    bank = get_question_bank()
+    if bank is not None:
+        for module_id, positions in progress.module_errors.items():
+            start, _ = bank.module_range(module_id)
+            for position in positions:
+                cards.setdefault(bank.key_for_slot(start + position), failed_card(today))
+
+    if progress.exam_errors:
+        from modules.exam_session import create_exam_session
+
+        for seed, errors in progress.exam_errors.items():
+            exam = create_exam_session(seed)
+            if exam is None:
+                continue
+            for part, position in errors:
+                cards.setdefault(exam.card_key(part, position), failed_card(today))
+
+    return ReviewScheduler(cards)
+
+
+def get_review_scheduler():
+    """Retourne l'échéancier de révision de la session (construit au premier accès)"""
+    if 'review_scheduler' not in st.session_state:
+        st.session_state.review_scheduler = build_review_scheduler(progress=get_progress())
+    return st.session_state.review_scheduler
+
+
+def record_review(card_key, correct):
+    """
+    Met à jour la fiche de révision d'une question et journalise la nouvelle fiche
+
+    Returns:
+        list: Fiche après la réponse
+    """
+    scheduler = get_review_scheduler()
+    previous = scheduler.get(card_key)
+    card = scheduler.review(card_key, correct)
+    if card != previous:
+        log_answer_event({'review': card_key, 'card': card})
+    return card
+
+
+def _review_exam_answer(seed, part, position, correct):
+    """
+    Fiche de révision d'une réponse d'examen blanc
+
+    Une erreur crée (ou fait échouer) la fiche de la question de la banque
+    d'examen ; une bonne réponse ne met à jour qu'une fiche existante : seules
+    les erreurs d'examen entrent dans la révision.
+    """
+    from modules.exam_session import create_exam_session
+
+    exam = create_exam_session(seed)
+    if exam is None or position >= exam.part_size(part):
+        return
+    card_key = exam.card_key(part, position)
+    if correct and card_key not in get_review_scheduler():
+        return
+    record_review(card_key, correct)
+
+
+def log_answer_event(event):
+    """Ajoute un événement à persister au prochain flush du journal"""
+    if 'pending_answer_events' not in st.session_state:
+        st.session_state.pending_answer_events = []
+    st.session_state.pending_answer_events.append(event)
+
+
+def create_answer_store(user_answers=None):
+    """Crée le store compact de réponses de la session (éventuellement depuis un dict)"""
+    bank = get_question_bank()
+    if bank is None:
+        return dict(user_answers or {})
+    return AnswerStore.from_dict(bank, user_answers or {})
+
+
+def reset_module_answers(module_id):
+    """Supprime toutes les réponses d'un module (effacement d'une tranche de slots)"""
+    st.session_state.user_answers.reset_module(module_id)
+    get_progress().reset_module(module_id)
+    scheduler = get_review_scheduler()
+    prefix = f"{module_id}_"
+    scheduler.remove([key for key in scheduler.cards if key.startswith(prefix)])
+    log_answer_event({'reset_module': module_id})
+
+
+def reset_exam_answers(seed):
+    """
+    Supprime toutes les réponses d'un examen blanc (identifié par son seed)
+
+    Les fiches de révision des erreurs sont conservées : elles portent sur les
+    questions de la banque d'examen, pas sur cet examen blanc.
+    """
+    st.session_state.user_answers.reset_exam(seed)
+    get_progress().reset_exam(seed)
+    log_answer_event({'reset_exam': seed})
+
+
+def set_exam_seed(exam_num, seed):
+    """Associe l'examen blanc n° exam_num à un nouveau seed (régénération), persisté avec la progression"""
+    if 'exam_seed_mapping' not in st.session_state:
+        st.session_state.exam_seed_mapping = {}
+    st.session_state.exam_seed_mapping[exam_num] = seed
+    log_answer_event({'exam_seed': exam_num, 'seed': seed})
+
+
+def reset_progress_aggregate():
+    """Invalide l'agrégat (après remplacement complet de user_answers)"""
+    if 'progress_aggregate' in st.session_state:
+        del st.session_state.progress_aggregate
+
+
+def reset_review_scheduler():
+    """Invalide l'échéancier de révision (après remplacement complet de user_answers)"""
+    if 'review_scheduler' in st.session_state:
+        del st.session_state.review_scheduler
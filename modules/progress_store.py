@@ -0,0 +1,336 @@
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from modules.journal import AnswerJournal, apply_answer_event
+
+# Backends disponibles (sélection via la variable d'environnement AMF_PROGRESS_BACKEND)
+PROGRESS_BACKENDS = ('sqlite', 'journal', 'json', 'memory')
+DEFAULT_BACKEND = 'sqlite'
+
+# Apprenant sans paramètre ?learner= : ses fichiers gardent les noms historiques
+DEFAULT_LEARNER_ID = "default"
+SNAPSHOT_VERSION = "1.0"
+
+
+class ProgressStore:
+    """
+    Interface commune des backends de progression
+
+    Toutes les écritures passent par apply_events(learner_id, events), avec les
+    événements du journal (voir journal.apply_answer_event) : chaque backend
+    choisit comment les rendre durables (fichier complet, ajout, lignes SQL).
+    """
+
+    name = None
+
+    def __init__(self):
+        self._learners = {}
+        self._learners_lock = threading.Lock()
+
+    def has_learner(self, learner_id):
+        raise NotImplementedError
+
+    def load(self, learner_id):
+        """
+        Charge les réponses et métadonnées d'un apprenant
+
+        Returns:
+            dict: {"user_answers", "exam_seed_mapping", "review_cards", "last_updated", "session_count"}
+        """
+        raise NotImplementedError
+
+    def start_session(self, learner_id):
+        """Enregistre l'apprenant si besoin et incrémente son nombre de sessions"""
+        raise NotImplementedError
+
+    def apply_events(self, learner_id, events):
+        """Rend durables des événements de réponse d'un apprenant"""
+        raise NotImplementedError
+
+    def import_answers(self, learner_id, user_answers, exam_seed_mapping=None, review_cards=None):
+        """Insère un dictionnaire complet de réponses, les seeds des examens et les fiches de révision (migration, import)"""
+        events = [{'k': key, 'v': choice} for key, choice in user_answers.items()]
+        events.extend({'exam_seed': exam_num, 'seed': seed} for exam_num, seed in (exam_seed_mapping or {}).items())
+        events.extend({'review': key, 'card': card} for key, card in (review_cards or {}).items())
+        self.apply_events(learner_id, events)
+
+    def learner(self, learner_id):
+        """
+        Vue d'un apprenant exposant append(events), cible du thread de sauvegarde
+
+        La même instance est renvoyée pour un apprenant donné : le thread
+        regroupe ainsi les événements d'un apprenant en une seule écriture.
+        """
+        with self._learners_lock:
+            log = self._learners.get(learner_id)
+            if log is None:
+                log = self._learners[learner_id] = LearnerLog(self, learner_id)
+            return log
+
+    def close(self):
+        """Libère les ressources du backend (fichiers, connexions)"""
+
+
+class LearnerLog:
+    """Événements d'un apprenant écrits dans un ProgressStore (interface du journal)"""
+
+    def __init__(self, store, learner_id):
+        self.store = store
+        self.learner_id = learner_id
+
+    def append(self, events):
+        self.store.apply_events(self.learner_id, events)
+
+
+class MemoryProgressStore(ProgressStore):
+    """
+    Progression gardée en mémoire du processus (tests, démonstrations)
+
+    Les sous-classes fichiers réutilisent cet état et surchargent les points
+    d'accroche _read / _persist_events / _persist_session.
+    """
+
+    name = 'memory'
+
+    def __init__(self):
+        super().__init__()
+        self._states = {}
+        self._lock = threading.RLock()
+
+    def _new_state(self):
+        return {
+            "user_answers": {},
+            "exam_seed_mapping": {},
+            "review_cards": {},
+            "session_count": 0,
+            "last_updated": datetime.now().isoformat(),
+        }
+
+    def _read(self, learner_id):
+        """État persistant d'un apprenant, ou None s'il est inconnu"""
+        return None
+
+    def _persist_events(self, learner_id, state, events):
+        pass
+
+    def _persist_session(self, learner_id, state):
+        pass
+
+    def _state(self, learner_id, create=False):
+        state = self._states.get(learner_id)
+        if state is None:
+            state = self._read(learner_id)
+            if state is None:
+                if not create:
+                    return None
+                state = self._new_state()
+            self._states[learner_id] = state
+        return state
+
+    def has_learner(self, learner_id):
+        with self._lock:
+            return self._state(learner_id) is not None
+
+    def load(self, learner_id):
+        with self._lock:
+            state = self._state(learner_id)
+            if state is None:
+                return {"user_answers": {}, "exam_seed_mapping": {}, "review_cards": {},
+                        "last_updated": None, "session_count": 0}
+            return {
+                "user_answers": dict(state["user_answers"]),
+                "exam_seed_mapping": dict(state["exam_seed_mapping"]),
+                "review_cards": {key: list(card) for key, card in state["review_cards"].items()},
+                "last_updated": state["last_updated"],
+                "session_count": state["session_count"],
+            }
+
+    def start_session(self, learner_id):
+        with self._lock:
+            state = self._state(learner_id, create=True)
+            state["session_count"] += 1
+            state["last_updated"] = datetime.now().isoformat()
+            self._persist_session(learner_id, state)
+
+    def apply_events(self, learner_id, events):
+        if not events:
+            return
+        with self._lock:
+            state = self._state(learner_id, create=True)
+            for event in events:
+                apply_answer_event(state["user_answers"], event, state["exam_seed_mapping"], state["review_cards"])
+            state["last_updated"] = datetime.now().isoformat()
+            self._persist_events(learner_id, state, events)
+
+
+class JsonSnapshotProgressStore(MemoryProgressStore):
+    """
+    Un fichier JSON complet par apprenant, réécrit à chaque écriture
+
+    Format historique (user_progress.json) : chaque validation coûte une
+    réécriture O(réponses) du fichier ; l'ancien fichier est gardé en backup.
+    """
+
+    name = 'json'
+
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+
+    def _base_path(self, learner_id):
+        stem = "user_progress" if learner_id == DEFAULT_LEARNER_ID else f"user_progress_{learner_id}"
+        return os.path.join(self.directory, stem)
+
+    def snapshot_paths(self, learner_id):
+        """Retourne (fichier principal, backup) du snapshot d'un apprenant"""
+        base = self._base_path(learner_id)
+        return f"{base}.json", f"{base}_backup.json"
+
+    def _read(self, learner_id):
+        return self._read_snapshot(learner_id)
+
+    def _read_snapshot(self, learner_id):
+        """Lit le snapshot (fichier principal, puis backup) ou None"""
+        for path in self.snapshot_paths(learner_id):
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"❌ Erreur lors de la lecture de {path}: {e}")
+                continue
+            if isinstance(data, dict) and all(key in data for key in ("user_answers", "last_updated", "version")):
+                return {
+                    "user_answers": data["user_answers"],
+                    # Clés JSON en texte : numéros d'examen remis en entiers
+                    "exam_seed_mapping": {
+                        int(exam_num): seed for exam_num, seed in data.get("exam_seed_mapping", {}).items()
+                    },
+                    "review_cards": data.get("review_cards", {}),
+                    "session_count": data.get("statistics", {}).get("total_sessions", 0),
+                    "last_updated": data["last_updated"],
+                }
+            print(f"⚠️ Structure de données invalide: {path}")
+        return None
+
+    def _snapshot(self, state):
+        return {
+            "user_answers": dict(state["user_answers"]),
+            "exam_seed_mapping": dict(state["exam_seed_mapping"]),
+            "review_cards": {key: list(card) for key, card in state["review_cards"].items()},
+            "last_updated": state["last_updated"],
+            "version": SNAPSHOT_VERSION,
+            "statistics": {"total_sessions": state["session_count"]},
+        }
+
+    def _write_snapshot(self, learner_id, snapshot):
+        """
+        Écrit un snapshot de manière atomique (fichier temporaire + rename)
+        L'ancien snapshot est conservé comme backup.
+        """
+        Path(self.directory).mkdir(parents=True, exist_ok=True)
+        path, backup_path = self.snapshot_paths(learner_id)
+
+        temp_file = f"{path}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if os.path.exists(path):
+            try:
+                os.replace(path, backup_path)
+            except Exception as e:
+                print(f"⚠️ Impossible de créer le backup: {e}")
+
+        os.replace(temp_file, path)
+
+    def _persist_events(self, learner_id, state, events):
+        self._write_snapshot(learner_id, self._snapshot(state))
+
+    def _persist_session(self, learner_id, state):
+        self._write_snapshot(learner_id, self._snapshot(state))
+
+
+class JournalProgressStore(JsonSnapshotProgressStore):
+    """
+    Snapshot JSON + journal append-only par apprenant
+
+    Chaque écriture ajoute les événements au journal (O(événements) + fsync) ;
+    le snapshot est réécrit en arrière-plan quand le journal dépasse son seuil,
+    et à chaque début de session.
+    """
+
+    name = 'journal'
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self._journals = {}
+
+    def journal(self, learner_id):
+        journal = self._journals.get(learner_id)
+        if journal is None:
+            journal = self._journals[learner_id] = AnswerJournal(f"{self._base_path(learner_id)}.journal")
+        return journal
+
+    def _read(self, learner_id):
+        state = self._read_snapshot(learner_id)
+        journal = self.journal(learner_id)
+        if state is None and not (os.path.exists(journal.path) or os.path.exists(journal.compacting_path)):
+            return None
+        if state is None:
+            state = self._new_state()
+        try:
+            replayed = journal.replay(state["user_answers"], state["exam_seed_mapping"], state["review_cards"])
+            if replayed:
+                print(f"📜 Journal rejoué ({learner_id}): {replayed} événements")
+        except Exception as e:
+            print(f"❌ Erreur lors du rejeu du journal: {e}")
+        return state
+
+    def _persist_events(self, learner_id, state, events):
+        Path(self.directory).mkdir(parents=True, exist_ok=True)
+        journal = self.journal(learner_id)
+        journal.append(events)
+        if journal.needs_compaction():
+            journal.compact_async(
+                self._snapshot(state),
+                lambda snapshot: self._write_snapshot(learner_id, snapshot)
+            )
+
+    def _persist_session(self, learner_id, state):
+        # Snapshot complet puis journal vidé : le rejeu repart de zéro à chaque session
+        journal = self.journal(learner_id)
+        journal.wait()
+        self._write_snapshot(learner_id, self._snapshot(state))
+        journal.clear()
+
+    def close(self):
+        for journal in self._journals.values():
+            journal.wait()
+
+
+def create_progress_store(backend, directory):
+    """
+    Instancie le backend de progression demandé
+
+    Args:
+        backend: 'sqlite', 'journal', 'json' ou 'memory'
+        directory: dossier des fichiers de sauvegarde
+
+    Returns:
+        ProgressStore: backend prêt à l'emploi
+    """
+    if backend == 'sqlite':
+        from modules.sqlite_store import SQLiteProgressStore
+        return SQLiteProgressStore(os.path.join(directory, "progress.db"))
+    if backend == 'journal':
+        return JournalProgressStore(directory)
+    if backend == 'json':
+        return JsonSnapshotProgressStore(directory)
+    if backend == 'memory':
+        return MemoryProgressStore()
+    raise ValueError(f"Backend de progression inconnu: {backend} (attendu: {', '.join(PROGRESS_BACKENDS)})")
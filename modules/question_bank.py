@@ -0,0 +1,186 @@
+import json
+import os
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+
+
+def _freeze(value):
+    """Convertit récursivement dicts/listes en vues immuables (mappingproxy/tuple)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class LazyModule(Mapping):
+    """
+    Module décrit par le manifeste, dont les questions sont lues à la demande
+
+    Se comporte comme un enregistrement de module figé : les champs du
+    manifeste (titre, nombre de questions, corrigé) sont disponibles tout de
+    suite, module['questions'] charge le shard du module au premier accès
+    puis le garde en mémoire pour toutes les sessions.
+    """
+
+    def __init__(self, fields, shard_path):
+        self._fields = _freeze(fields)
+        self._shard_path = shard_path
+        self._questions = None
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        if key == 'questions':
+            return self.questions()
+        return self._fields[key]
+
+    def __iter__(self):
+        yield from self._fields
+        yield 'questions'
+
+    def __len__(self):
+        return len(self._fields) + 1
+
+    def is_loaded(self):
+        return self._questions is not None
+
+    def questions(self):
+        """Questions du module (lecture du shard au premier appel)"""
+        if self._questions is None:
+            with self._lock:
+                if self._questions is None:
+                    with open(self._shard_path, "r", encoding="utf-8") as f:
+                        questions = json.load(f)['questions']
+                    if [q['id'] for q in questions] != list(self._fields['question_ids']):
+                        raise ValueError(f"Shard incohérent avec le manifeste: {self._shard_path}")
+                    self._questions = _freeze(questions)
+        return self._questions
+
+
+class QuestionBank:
+    """
+    Banque de questions en lecture seule, chargée une fois par processus
+
+    Les enregistrements sont figés (mappingproxy / tuple) : la même instance
+    est partagée par toutes les sessions sans copie ni risque de mutation.
+    Chaque question reçoit un index global dense (slot) dans l'ordre des modules.
+
+    Construite depuis un manifeste, la banque indexe les slots et le corrigé
+    sans lire le texte des questions : les shards de modules sont chargés à la
+    première consultation d'un module.
+    """
+
+    def __init__(self, raw_data):
+        data = _freeze(raw_data)
+        modules = [
+            (module, [q['id'] for q in module['questions']], ''.join(q['correct_answer'] for q in module['questions']))
+            for module in data['modules']
+        ]
+        self._build(data, modules)
+
+    @classmethod
+    def from_file(cls, path):
+        """Charge la banque depuis un fichier JSON complet (lève FileNotFoundError)"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def from_manifest(cls, path):
+        """
+        Charge la banque depuis un manifeste de shards (lève FileNotFoundError)
+
+        Seul le manifeste est lu ; chaque shard est ouvert au premier accès à
+        module['questions'] ou à une question du module.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        directory = os.path.dirname(path)
+        bank = cls.__new__(cls)
+        modules = []
+        for fields in manifest['modules']:
+            module = LazyModule(fields, os.path.join(directory, fields['shard']))
+            modules.append((module, fields['question_ids'], fields['answer_key']))
+        data = MappingProxyType({
+            'metadata': _freeze(manifest['metadata']),
+            'modules': tuple(module for module, _, _ in modules),
+        })
+        bank._build(data, modules)
+        return bank
+
+    def _build(self, data, modules):
+        """Indexe les modules à partir de (module, ids des questions, corrigé)"""
+        self.data = data
+        self.metadata = self.data['metadata']
+        self.modules = self.data['modules']
+
+        self._modules_by_id = {}
+        self._questions = {}  # (module_id, question_id) -> (position, slot)
+        self._slots_by_key = {}  # clé de réponse "module_question" -> slot
+        self._slot_keys = []     # slot -> clé de réponse
+        self._answer_keys = {}   # module_id -> corrigé ("ABCA...")
+        self.module_offsets = {}
+
+        slot = 0
+        for module, question_ids, answer_key in modules:
+            module_id = module['id']
+            self._modules_by_id[module_id] = module
+            self._answer_keys[module_id] = answer_key
+            self.module_offsets[module_id] = slot
+            for position, question_id in enumerate(question_ids):
+                self._questions[(module_id, question_id)] = (position, slot)
+                answer_key_id = f"{module_id}_{question_id}"
+                self._slots_by_key[answer_key_id] = slot
+                self._slot_keys.append(answer_key_id)
+                slot += 1
+
+        self.total_questions = slot
+
+    def __len__(self):
+        return self.total_questions
+
+    def module(self, module_id):
+        """Retourne le module par son ID (None si inconnu)"""
+        return self._modules_by_id.get(module_id)
+
+    def question(self, module_id, question_id):
+        """Retourne la question par (module, question) en O(1) (None si inconnue)"""
+        entry = self._questions.get((module_id, question_id))
+        if entry is None:
+            return None
+        return self._modules_by_id[module_id]['questions'][entry[0]]
+
+    def position(self, module_id, question_id):
+        """Retourne la position de la question dans son module (None si inconnue)"""
+        entry = self._questions.get((module_id, question_id))
+        return entry[0] if entry else None
+
+    def slot(self, module_id, question_id):
+        """Retourne l'index global dense de la question (None si inconnue)"""
+        entry = self._questions.get((module_id, question_id))
+        return entry[1] if entry else None
+
+    def slot_for_key(self, answer_key):
+        """Retourne le slot d'une clé de réponse "module_question" (None si inconnue)"""
+        return self._slots_by_key.get(answer_key)
+
+    def key_for_slot(self, slot):
+        """Retourne la clé de réponse "module_question" d'un slot"""
+        return self._slot_keys[slot]
+
+    def answer_key(self, module_id):
+        """Retourne le corrigé du module ("ABCA...", dans l'ordre des questions)"""
+        return self._answer_keys[module_id]
+
+    def module_range(self, module_id):
+        """Retourne (début, fin) des slots du module dans l'index global"""
+        start = self.module_offsets[module_id]
+        return start, start + len(self._answer_keys[module_id])
+
+    def module_by_theme(self, theme):
+        """Retourne le premier module dont le champ 'theme' correspond (banque d'examen)"""
+        for module in self.modules:
+            if module.get('theme') == theme:
+                return module
+        return None
@@ -1,6 +1,23 @@
 import streamlit as st
 from datetime import datetime
-from modules.config import auto_save
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from modules.answer_store import parse_exam_key
+from modules.data_loader import get_question_bank
+from modules.navigation import NAV_ANSWERED, NAV_UNANSWERED, navigation_status, question_navigator
+from modules.progress import get_progress, record_answer
+
+def rerun_question(refresh_app=False):
+    """
+    Relance la zone de question (fragment) après un clic
+    
+    Toute l'application est relancée si refresh_app (la sidebar affiche une
+    valeur modifiée par le clic) ou si le clic est traité pendant une
+    exécution complète du script (relance de fragment impossible).
+    """
+    ctx = get_script_run_ctx()
+    if refresh_app or ctx is None or not ctx.fragment_ids_this_run:
+        st.rerun()
+    st.rerun(scope="fragment")
 
 def render_question_header(title, subtitle=None):
     """Affiche l'en-tête d'une question"""
@@ -60,9 +77,24 @@ def render_answer_feedback(unique_question_id, show_saved_message=True):
     if unique_question_id in st.session_state.user_answers and show_saved_message:
         st.success("✅ Réponse enregistrée")
 
+def render_answer_correction(unique_question_id, question):
+    """Affiche la correction (choix validé, bonne réponse) si la question a été répondue"""
+    if unique_question_id not in st.session_state.user_answers:
+        return
+    user_answer = st.session_state.user_answers[unique_question_id]
+    correct_answer = question['correct_answer']
+    options = question['options']
+    
+    if user_answer == correct_answer:
+        st.success(f"✅ **Correct !** Votre choix : {user_answer} - {options[user_answer]}")
+    else:
+        st.error(f"❌ **Incorrect** • Votre choix : {user_answer} - {options[user_answer]}")
+        st.info(f"🎯 **Bonne réponse :** {correct_answer} - {options[correct_answer]}")
+
 def render_navigation_buttons(current_idx, total_questions, unique_question_id, 
                             has_next_part=False, next_part_label="", 
-                            is_last_section=False, auto_save_func=None):
+                            is_last_section=False, auto_save_func=None,
+                            correct_answer=None):
     """
     Affiche les boutons de navigation avec gestion des couleurs
     
@@ -74,6 +106,7 @@ def render_navigation_buttons(current_idx, total_questions, unique_question_id,
         next_part_label: Label de la partie suivante
         is_last_section: Si c'est la dernière section
         auto_save_func: Fonction de sauvegarde automatique
+        correct_answer: Bonne réponse de la question (mise à jour des compteurs)
     """
     col1, col2, col3 = st.columns([1, 1, 1])
     
@@ -87,7 +120,7 @@ def render_navigation_buttons(current_idx, total_questions, unique_question_id,
         if current_idx > 0:
             if st.button("⬅️ Précédent", use_container_width=True):
                 st.session_state.current_question_idx -= 1
-                st.rerun()
+                rerun_question()
     
     with col2:
         # Bouton Valider - couleur selon l'état
@@ -95,17 +128,17 @@ def render_navigation_buttons(current_idx, total_questions, unique_question_id,
             # Si la réponse est déjà validée, bouton normal
             button_type = "secondary" if is_answered else "primary"
             if st.button("💾 Valider", type=button_type, use_container_width=True):
-                st.session_state.user_answers[unique_question_id] = user_choice
+                record_answer(unique_question_id, user_choice, correct_answer)
                 
                 # Sauvegarder automatiquement
                 if auto_save_func:
                     try:
                         auto_save_func()
-                        print(f"✅ Réponse validée et sauvegardée: {unique_question_id} = {user_choice}")
                     except Exception as e:
                         print(f"⚠️ Erreur lors de la sauvegarde automatique: {e}")
                 
-                st.rerun()
+                # Nouvelle réponse : les compteurs de la sidebar changent
+                rerun_question(refresh_app=not is_answered)
         else:
             # Bouton désactivé visuellement quand aucune réponse n'est sélectionnée
             st.button("💾 Valider", type="primary", use_container_width=True, disabled=True)
@@ -119,7 +152,7 @@ def render_navigation_buttons(current_idx, total_questions, unique_question_id,
             if st.button("➡️ Suivant", type=button_type, use_container_width=True):
                 if unique_question_id in st.session_state.user_answers:
                     st.session_state.current_question_idx += 1
-                    st.rerun()
+                    rerun_question()
                 else:
                     st.warning("⚠️ Veuillez d'abord valider votre réponse")
         elif has_next_part and not is_last_section:
@@ -143,10 +176,47 @@ def render_navigation_buttons(current_idx, total_questions, unique_question_id,
     
     return None
 
-# Modifier render_quick_navigation pour marquer la navigation manuelle
+def is_question_answered(question, module_id=None):
+    """Indique si une question a une réponse (accès direct au store pour les modules)"""
+    if module_id:
+        return st.session_state.user_answers.module_choice(module_id, question['id']) is not None
+    return question['id'] in st.session_state.user_answers
+
+def _answered_status(questions, module_id=None):
+    """
+    Vecteur "a" / "u" des questions, lu directement dans le store compact si possible
+
+    Le vecteur du module n'est repris que pour sa liste de questions elle-même
+    (ordre naturel) : une liste mélangée ou filtrée est lue question par question.
+    """
+    store = st.session_state.user_answers
+    if module_id and hasattr(store, 'module_status'):
+        bank = get_question_bank()
+        module = bank.module(module_id) if bank is not None else None
+        if module is not None and questions is module['questions']:
+            return store.module_status(module_id)
+    elif not module_id and hasattr(store, 'exam_status'):
+        exam_position = parse_exam_key(questions[0]['id'])
+        if exam_position and exam_position[0]:
+            status = store.exam_status(exam_position[0], exam_position[1])[:len(questions)]
+            if len(status) == len(questions):
+                return status
+    return ''.join(
+        NAV_ANSWERED if is_question_answered(question, module_id) else NAV_UNANSWERED
+        for question in questions
+    )
+
+def _select_question(q_idx):
+    # Marquer que l'utilisateur a utilisé la navigation manuelle
+    st.session_state.manual_navigation_used = True
+    st.session_state.current_question_idx = q_idx
+
 def render_quick_navigation(questions, current_idx, module_id=None, exam_part=None, title_suffix=""):
     """
     Affiche la navigation rapide par numéro de question
+    
+    Un seul composant pour toute la grille : l'état de chaque question
+    (actuelle / répondue / non répondue) est envoyé en une chaîne compacte.
     """
     if len(questions) <= 1:
         return
@@ -157,42 +227,14 @@ def render_quick_navigation(questions, current_idx, module_id=None, exam_part=No
     
     st.markdown(title)
     
-    # Créer une grille compacte de boutons pour la navigation
-    cols_per_row = 15
-    question_numbers = list(range(1, len(questions) + 1))
+    # Clé du composant selon le contexte
+    if module_id:
+        nav_key = f"quick_nav_{module_id}"
+    else:
+        nav_key = f"quick_nav_exam_{exam_part}"
     
-    for i in range(0, len(question_numbers), cols_per_row):
-        cols = st.columns(cols_per_row)
-        for j, q_num in enumerate(question_numbers[i:i+cols_per_row]):
-            with cols[j]:
-                q_idx = q_num - 1
-                question = questions[q_idx]
-                
-                # Générer l'ID unique selon le contexte
-                if module_id:
-                    unique_question_id = f"{module_id}_{question['id']}"
-                    nav_key = f"nav_{q_num}_{module_id}"
-                else:
-                    unique_question_id = question['id']
-                    nav_key = f"nav_exam_{exam_part}_{q_num}"
-                
-                # Déterminer le style du bouton selon le statut
-                if q_idx == current_idx:
-                    button_type = "primary"
-                    icon = "👁️"
-                elif unique_question_id in st.session_state.user_answers:
-                    icon = "✅"
-                    button_type = "secondary"
-                else:
-                    icon = "🔵"
-                    button_type = "secondary"
-                
-                if st.button(f"{icon}{q_num}", key=nav_key, 
-                           type=button_type, use_container_width=True):
-                    # Marquer que l'utilisateur a utilisé la navigation manuelle
-                    st.session_state.manual_navigation_used = True
-                    st.session_state.current_question_idx = q_idx
-                    st.rerun()
+    status = navigation_status(_answered_status(questions, module_id), current_idx)
+    question_navigator(status, key=nav_key, on_select=_select_question, columns=15)
 
 def get_quiz_progress_info(questions, module_id=None):
     """
@@ -202,8 +244,8 @@ def get_quiz_progress_info(questions, module_id=None):
         dict: Informations de progression (answered, total, progress_pct)
     """
     if module_id:
-        # Quiz standard
-        answered = sum(1 for q in questions if f"{module_id}_{q['id']}" in st.session_state.user_answers)
+        # Quiz standard : compteur incrémental du module
+        answered = get_progress().module(module_id)['answered']
     else:
         # Examen blanc
         answered = sum(1 for q in questions if q['id'] in st.session_state.user_answers)
@@ -217,7 +259,7 @@ def get_quiz_progress_info(questions, module_id=None):
         'progress_pct': progress_pct
     }
 
-def handle_auto_positioning(questions, module_id=None):
+def handle_auto_positioning(questions, module_id=None, last_answered_idx=None):
     """
     Positionne automatiquement sur la dernière question répondue + 1
     Détecte automatiquement si c'est un nouveau démarrage de quiz
@@ -225,6 +267,7 @@ def handle_auto_positioning(questions, module_id=None):
     Args:
         questions: Liste des questions
         module_id: ID du module (None pour examen blanc)
+        last_answered_idx: Dernier index répondu s'il est déjà connu (compteurs incrémentaux)
     """
     # Détection intelligente : nouveau démarrage si on est à l'index 0 
     # ET qu'aucun quiz n'était en cours (quiz_started vient de passer à True)
@@ -245,28 +288,30 @@ def handle_auto_positioning(questions, module_id=None):
     # Marquer cette session pour ce module
     st.session_state[session_key] = current_session
     
-    # Chercher la dernière question répondue
-    last_answered_idx = -1
-    for i, question in enumerate(questions):
-        if module_id:
-            unique_question_id = f"{module_id}_{question['id']}"
-        else:
-            unique_question_id = question['id']
-        
-        if unique_question_id in st.session_state.user_answers:
-            last_answered_idx = i
+    # Chercher la dernière question répondue (sauf si fournie par les compteurs)
+    if last_answered_idx is None:
+        last_answered_idx = _find_last_answered_idx(questions, module_id)
     
     # Se positionner sur la question suivante seulement s'il y a des réponses
     if last_answered_idx >= 0:
         next_position = min(last_answered_idx + 1, len(questions) - 1)
         st.session_state.current_question_idx = next_position
 
+def _find_last_answered_idx(questions, module_id=None):
+    """Parcourt les questions pour trouver le dernier index répondu (-1 si aucun)"""
+    last_answered_idx = -1
+    for i, question in enumerate(questions):
+        if is_question_answered(question, module_id):
+            last_answered_idx = i
+    return last_answered_idx
+
 def create_part_navigation_buttons(parts_data, current_part):
     """
     Crée les boutons de navigation entre les parties
     
     Args:
         parts_data: Liste des données de parties [{'title': str, 'questions': list, 'part_number': int}]
+                    avec éventuellement 'answered' (int) si le compteur est déjà connu
         current_part: Numéro de la partie actuelle
     
     Returns:
@@ -284,8 +329,10 @@ def create_part_navigation_buttons(parts_data, current_part):
             part_title = part_data['title']
             questions = part_data['questions']
             
-            # Calculer les questions répondues pour cette partie
-            answered = sum(1 for q in questions if q['id'] in st.session_state.user_answers)
+            # Questions répondues pour cette partie
+            answered = part_data.get('answered')
+            if answered is None:
+                answered = sum(1 for q in questions if q['id'] in st.session_state.user_answers)
             total = len(questions)
             progress_text = f"{answered}/{total}"
             
@@ -1,15 +1,24 @@
 import streamlit as st
 import random
 from datetime import datetime
-from modules.config import auto_save
+from modules.persistence import on_answer_validated
 from modules.quiz_common import (
     render_question_header, render_question_card, render_answer_options,
-    render_answer_feedback, render_navigation_buttons, render_quick_navigation,
+    render_answer_feedback, render_answer_correction, render_navigation_buttons, render_quick_navigation,
     get_quiz_progress_info, handle_auto_positioning
 )
+from modules.progress import get_progress
+from modules.timing import timed
 
+@st.fragment
+@timed("fragment:quiz")
 def show_enhanced_quiz_interface():
-    """Interface principale pour les quiz standards"""
+    """
+    Interface principale pour les quiz standards
+    
+    Fragment Streamlit : sélection d'une option et navigation ne relancent
+    que cette zone (voir quiz_common.rerun_question).
+    """
     if not st.session_state.current_module:
         st.error("❌ Module non sélectionné")
         st.session_state.quiz_started = False
@@ -25,14 +34,8 @@ def show_enhanced_quiz_interface():
     
     # Filtrage des questions selon le mode
     if st.session_state.get('quiz_mode') == 'review':
-        # Mode révision : seulement les questions incorrectes
-        incorrect_questions = []
-        for question in questions:
-            unique_question_id = f"{module['id']}_{question['id']}"
-            if unique_question_id in st.session_state.user_answers:
-                user_answer = st.session_state.user_answers[unique_question_id]
-                if user_answer != question['correct_answer']:
-                    incorrect_questions.append(question)
+        # Mode révision : seulement les questions incorrectes (index des erreurs, sans parcourir le module)
+        incorrect_questions = [questions[position] for position in get_progress().module_error_positions(module['id'])]
         
         if not incorrect_questions:
             st.info("🎉 Aucune erreur à réviser dans ce module ! Toutes vos réponses sont correctes.")
@@ -50,15 +53,20 @@ def show_enhanced_quiz_interface():
     if (st.session_state.randomize_questions and 
         st.session_state.get('quiz_mode') == 'practice' and 
         'shuffled_questions' not in st.session_state):
-        st.session_state.shuffled_questions = questions.copy()
+        st.session_state.shuffled_questions = list(questions)
         random.shuffle(st.session_state.shuffled_questions)
     
     if (st.session_state.randomize_questions and 
         st.session_state.get('quiz_mode') == 'practice'):
         questions = st.session_state.shuffled_questions
     
-    # Positionnement automatique
-    handle_auto_positioning(questions, module['id'])
+    # Positionnement automatique (ordre naturel du module : dernier index déjà connu)
+    module_progress = get_progress().module(module['id'])
+    natural_order = questions is module['questions']
+    handle_auto_positioning(
+        questions, module['id'],
+        last_answered_idx=module_progress['last_index'] if natural_order else None
+    )
     
     current_idx = st.session_state.current_question_idx
     
@@ -85,11 +93,11 @@ def show_enhanced_quiz_interface():
         progress = answered_questions / len(questions)
     else:
         # En mode practice, progression basée sur toutes les questions du module
-        all_questions = module['questions']
-        answered_questions = sum(1 for q in all_questions if f"{module['id']}_{q['id']}" in st.session_state.user_answers)
-        progress = answered_questions / len(all_questions)
+        answered_questions = module_progress['answered']
+        progress = answered_questions / len(module['questions'])
     
     st.progress(progress)
+    st.caption(f"Question actuelle: {current_idx + 1} / {len(questions)}")
     
     # Affichage de la question
     render_question_card(current_question['id'], current_question['question'])
@@ -103,16 +111,7 @@ def show_enhanced_quiz_interface():
     st.session_state.current_user_choice = user_choice
     
     # Afficher les réponses correctes/incorrectes si déjà répondu (UNE SEULE FOIS)
-    if unique_question_id in st.session_state.user_answers:
-        user_answer = st.session_state.user_answers[unique_question_id]
-        correct_answer = current_question['correct_answer']
-        options = current_question['options']
-        
-        if user_answer == correct_answer:
-            st.success(f"✅ **Correct !** Votre choix : {user_answer} - {options[user_answer]}")
-        else:
-            st.error(f"❌ **Incorrect** • Votre choix : {user_answer} - {options[user_answer]}")
-            st.info(f"🎯 **Bonne réponse :** {correct_answer} - {options[correct_answer]}")
+    render_answer_correction(unique_question_id, current_question)
     
     # Feedback immédiat (seulement pour les examens blancs)
     is_exam_mode = st.session_state.get('quiz_mode') == 'exam_blanc'
@@ -124,7 +123,8 @@ def show_enhanced_quiz_interface():
         current_idx=current_idx,
         total_questions=len(questions),
         unique_question_id=unique_question_id,
-        auto_save_func=auto_save
+        auto_save_func=on_answer_validated,
+        correct_answer=current_question['correct_answer']
     )
     
     # Navigation rapide
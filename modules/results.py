@@ -2,7 +2,8 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from datetime import datetime
-from modules.utils import calculate_score, get_performance_level
+from modules.utils import get_performance_level
+from modules.progress import get_progress, reset_module_answers
 
 def show_enhanced_results():
     """Affiche les résultats détaillés du quiz"""
@@ -10,10 +11,10 @@ def show_enhanced_results():
         return
     
     module = st.session_state.current_module
-    questions = st.session_state.get('shuffled_questions', module['questions'])
     
     # Calcul des résultats détaillés
-    correct, total = calculate_score(questions, st.session_state.user_answers, module['id'])
+    module_progress = get_progress().module(module['id'])
+    correct, total = module_progress['correct'], module_progress['answered']
     score_percentage = (correct / total) * 100 if total > 0 else 0
     level, level_type = get_performance_level(score_percentage)
     
@@ -97,10 +98,7 @@ def show_enhanced_results():
     with col1:
         if st.button("🔄 Recommencer ce module", type="primary", use_container_width=True):
             # Nettoyer les réponses de ce module
-            questions_ids = [f"{module['id']}_{q['id']}" for q in questions]
-            for q_id in questions_ids:
-                if q_id in st.session_state.user_answers:
-                    del st.session_state.user_answers[q_id]
+            reset_module_answers(module['id'])
             
             # Sauvegarder les changements
             from modules.persistence import save_user_progress
@@ -124,9 +122,8 @@ def show_enhanced_results():
                 del st.session_state.shuffled_questions
             st.rerun()
     
-    # Vérifier s'il y a des erreurs
-    errors = [q for q in questions if f"{module['id']}_{q['id']}" in st.session_state.user_answers and 
-              st.session_state.user_answers[f"{module['id']}_{q['id']}"] != q['correct_answer']]
+    # Vérifier s'il y a des erreurs (index des erreurs, dans l'ordre du module)
+    errors = [module['questions'][position] for position in get_progress().module_error_positions(module['id'])]
     
     # Affichage conditionnel selon l'état
     if not st.session_state.get('show_error_review', False):
@@ -162,8 +159,7 @@ def show_enhanced_error_review(errors):
             col1, col2 = st.columns([2, 1])
             
             with col1:
-                unique_q_id = f"{module['id']}_{question['id']}"
-                user_answer = st.session_state.user_answers[unique_q_id]
+                user_answer = st.session_state.user_answers.module_choice(module['id'], question['id'])
                 
                 # Question
                 st.markdown("**Question**")
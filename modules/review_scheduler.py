@@ -0,0 +1,199 @@
+"""
+Répétition espacée (SM-2) des questions d'entraînement et des erreurs d'examen
+
+Chaque question suivie a une fiche : nombre de révisions réussies d'affilée,
+intervalle (jours), facilité, jour d'échéance, nombre d'oublis et jour de la
+dernière révision. Une bonne réponse espace la révision suivante (1 jour,
+6 jours, puis intervalle × facilité) ; une erreur la ramène au lendemain et
+baisse la facilité.
+
+Les fiches à revoir sont rangées dans un tas par jour d'échéance : la
+prochaine fiche due se lit en O(log n) sans parcourir toutes les fiches.
+Une fiche révisée est remise dans le tas avec sa nouvelle échéance ; l'ancienne
+entrée, devenue périmée, est ignorée à la lecture puis éliminée quand le tas
+est reconstruit.
+
+Module pur Python (sans Streamlit) : l'état de session et la persistance sont
+gérés par modules/progress.py.
+"""
+import heapq
+from datetime import date
+
+# Paramètres SM-2 (réponse juste : qualité 4, erreur : qualité 1)
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+CORRECT_QUALITY = 4
+INCORRECT_QUALITY = 1
+FIRST_INTERVAL = 1
+SECOND_INTERVAL = 6
+
+# Fiche : [réussites d'affilée, intervalle, facilité, échéance, oublis, dernière révision]
+REPETITIONS, INTERVAL, EASE, DUE, LAPSES, LAST_REVIEW = range(6)
+
+# Le tas est reconstruit quand les entrées périmées dépassent ce facteur
+HEAP_REBUILD_FACTOR = 2
+
+# Préfixe des fiches d'erreurs d'examen (questions de la banque d'examen)
+EXAM_CARD_PREFIX = "x"
+
+
+def today_number(day=None):
+    """Jour (ordinal grégorien) utilisé pour les échéances"""
+    return (day or date.today()).toordinal()
+
+
+def exam_card_key(module_id, question_id):
+    """Clé de la fiche d'une question de la banque d'examen (indépendante de l'examen blanc)"""
+    return f"{EXAM_CARD_PREFIX}{module_id}_{question_id}"
+
+
+def parse_card_key(card_key):
+    """
+    Décode une clé de fiche
+
+    Returns:
+        tuple: ('training', module_id, question_id), ('exam', module_id, question_id) ou None
+    """
+    bank = 'training'
+    if card_key.startswith(EXAM_CARD_PREFIX):
+        bank = 'exam'
+        card_key = card_key[len(EXAM_CARD_PREFIX):]
+    module_id, _, question_id = card_key.partition('_')
+    if module_id.isdigit() and question_id.isdigit():
+        return bank, int(module_id), int(question_id)
+    return None
+
+
+def review_card(card, correct, today):
+    """
+    Nouvelle fiche après une réponse (SM-2)
+
+    Une bonne réponse donnée le jour même d'une révision ne rallonge pas
+    l'intervalle (réponse modifiée, question revue deux fois) ; une erreur
+    est toujours prise en compte, une seule fois par jour.
+
+    Args:
+        card: Fiche actuelle ou None (première réponse)
+        correct: La réponse est juste
+        today: Jour de la révision (today_number)
+
+    Returns:
+        list: Fiche mise à jour (nouvelle liste)
+    """
+    if card is None:
+        card = [0, 0, INITIAL_EASE, today, 0, None]
+    elif card[LAST_REVIEW] == today and (correct or card[REPETITIONS] == 0):
+        return list(card)
+
+    repetitions, interval, ease, _, lapses, _ = card
+    quality = CORRECT_QUALITY if correct else INCORRECT_QUALITY
+    if correct:
+        if repetitions == 0:
+            interval = FIRST_INTERVAL
+        elif repetitions == 1:
+            interval = SECOND_INTERVAL
+        else:
+            interval = round(interval * ease)
+        repetitions += 1
+    else:
+        repetitions = 0
+        interval = FIRST_INTERVAL
+        lapses += 1
+    ease = max(MIN_EASE, round(ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02), 2))
+    return [repetitions, interval, ease, today + interval, lapses, today]
+
+
+def failed_card(today):
+    """Fiche d'une erreur passée sans date connue : due tout de suite"""
+    return [0, 0, INITIAL_EASE, today, 1, None]
+
+
+class ReviewScheduler:
+    """
+    Fiches de révision d'un apprenant et file des échéances (tas binaire)
+
+    cards : clé -> fiche ; les clés sont celles des réponses d'entraînement
+    ("module_question") et exam_card_key(...) pour les erreurs d'examen.
+    """
+
+    __slots__ = ('cards', '_heap')
+
+    def __init__(self, cards=None):
+        self.cards = {key: list(card) for key, card in (cards or {}).items()}
+        self._rebuild()
+
+    def _rebuild(self):
+        self._heap = [(card[DUE], key) for key, card in self.cards.items()]
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __contains__(self, key):
+        return key in self.cards
+
+    def get(self, key):
+        return self.cards.get(key)
+
+    def set(self, key, card):
+        """Remplace la fiche et la place dans la file à sa nouvelle échéance (O(log n))"""
+        previous = self.cards.get(key)
+        self.cards[key] = card
+        if previous is not None and previous[DUE] == card[DUE]:
+            return
+        heapq.heappush(self._heap, (card[DUE], key))
+        if len(self._heap) > HEAP_REBUILD_FACTOR * len(self.cards) + 16:
+            self._rebuild()
+
+    def review(self, key, correct, today=None):
+        """Enregistre une réponse à la question et renvoie sa nouvelle fiche"""
+        card = review_card(self.cards.get(key), correct, today_number() if today is None else today)
+        self.set(key, card)
+        return card
+
+    def remove(self, keys):
+        """Retire des fiches (réinitialisation) ; leurs entrées du tas deviennent périmées"""
+        for key in keys:
+            self.cards.pop(key, None)
+
+    def clear(self):
+        self.cards.clear()
+        self._heap = []
+
+    def _is_current(self, entry):
+        card = self.cards.get(entry[1])
+        return card is not None and card[DUE] == entry[0]
+
+    def next_due(self):
+        """(échéance, clé) de la prochaine fiche à revoir, ou None (O(log n) amorti)"""
+        heap = self._heap
+        while heap and not self._is_current(heap[0]):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def due(self, today=None, limit=None):
+        """
+        Clés des fiches échues (échéance <= today), la plus en retard d'abord
+
+        Les entrées lues sont retirées du tas puis remises : O(k log n) pour
+        k fiches renvoyées.
+        """
+        today = today_number() if today is None else today
+        heap = self._heap
+        taken = []
+        keys = []
+        seen = set()
+        while heap and heap[0][0] <= today and (limit is None or len(keys) < limit):
+            entry = heapq.heappop(heap)
+            if not self._is_current(entry) or entry[1] in seen:
+                continue
+            seen.add(entry[1])
+            taken.append(entry)
+            keys.append(entry[1])
+        for entry in taken:
+            heapq.heappush(heap, entry)
+        return keys
+
+    def due_count(self, today=None):
+        """Nombre de fiches échues"""
+        return len(self.due(today))
@@ -0,0 +1,124 @@
+import atexit
+import queue
+import threading
+import time
+
+# Fenêtre de regroupement des écritures (secondes)
+DEFAULT_DEBOUNCE_SECONDS = 0.25
+# Délai avant nouvelle tentative après une erreur d'écriture (secondes)
+RETRY_DELAY_SECONDS = 1.0
+
+
+class SaveWorker:
+    """
+    Thread de sauvegarde partagé par le processus
+
+    Les sessions déposent leurs événements de réponse dans une file (O(1), sans
+    attendre le disque) et reçoivent un ticket. Le thread regroupe tout ce qui
+    arrive pendant la fenêtre de debounce en une seule écriture par journal,
+    puis marque les tickets correspondants comme durables.
+    """
+
+    def __init__(self, debounce_seconds=DEFAULT_DEBOUNCE_SECONDS):
+        self.debounce_seconds = debounce_seconds
+        self._queue = queue.Queue()
+        self._condition = threading.Condition()
+        self._submitted = 0
+        self._durable = 0
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="progress-save-worker", daemon=True)
+                self._thread.start()
+
+    def submit(self, journal, events):
+        """
+        Dépose des événements à ajouter au journal
+
+        Returns:
+            int: ticket à passer à is_durable() / flush()
+        """
+        self._ensure_started()
+        with self._condition:
+            # Ticket et dépôt sous le même verrou : la file reste ordonnée par ticket
+            self._submitted += 1
+            ticket = self._submitted
+            self._queue.put((ticket, journal, list(events)))
+        return ticket
+
+    def is_durable(self, ticket):
+        """Indique si les événements du ticket sont écrits et fsync sur disque"""
+        with self._condition:
+            return ticket <= self._durable
+
+    def pending(self):
+        """Nombre de tickets déposés mais pas encore durables"""
+        with self._condition:
+            return self._submitted - self._durable
+
+    def flush(self, timeout=None):
+        """
+        Attend que tous les tickets déposés jusqu'ici soient durables
+
+        Returns:
+            bool: True si tout est sur disque avant l'expiration du délai
+        """
+        with self._condition:
+            target = self._submitted
+            return self._condition.wait_for(lambda: self._durable >= target, timeout=timeout)
+
+    def _collect_batch(self):
+        """Bloque jusqu'au premier dépôt puis regroupe ceux de la fenêtre de debounce"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.debounce_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch + self._drain()
+
+    def _drain(self):
+        """Retire ce qui est déjà en file sans attendre"""
+        items = []
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                return items
+
+    def _run(self):
+        retry = []
+        while True:
+            # Après une erreur, réessayer sans attendre un nouveau dépôt
+            batch = retry + self._drain() if retry else self._collect_batch()
+            retry = []
+
+            # Une seule écriture par journal, dans l'ordre de dépôt
+            by_journal = {}
+            for ticket, journal, events in batch:
+                by_journal.setdefault(id(journal), (journal, []))[1].extend(events)
+
+            try:
+                for journal, events in by_journal.values():
+                    journal.append(events)
+            except Exception as e:
+                print(f"⚠️ Erreur d'écriture du journal, nouvelle tentative: {e}")
+                retry = batch
+                time.sleep(RETRY_DELAY_SECONDS)
+                continue
+
+            with self._condition:
+                self._durable = max(self._durable, max(ticket for ticket, _, _ in batch))
+                self._condition.notify_all()
+
+
+# Worker unique du processus, vidé à l'arrêt de l'interpréteur
+save_worker = SaveWorker()
+atexit.register(save_worker.flush, 10)
@@ -0,0 +1,84 @@
+import numpy as np
+from modules.answer_store import ANSWER_CODES, AnswerStore
+
+# Décalages des 4 réponses 2 bits d'un octet du store compact
+_PACKED_SHIFTS = np.array([0, 2, 4, 6], dtype=np.uint8)
+
+
+class ScoringEngine:
+    """
+    Moteur de score vectorisé sur une QuestionBank
+
+    Le corrigé de tous les modules est stocké dans un tableau uint8 indexé par
+    slot global ; les réponses d'un apprenant forment un tableau parallèle.
+    Les compteurs bonnes réponses / réponses de tous les modules sortent
+    d'un seul passage vectorisé.
+    """
+
+    def __init__(self, bank):
+        self.bank = bank
+        self.module_ids = [module['id'] for module in bank.modules]
+        self._module_positions = {module_id: i for i, module_id in enumerate(self.module_ids)}
+
+        self.answer_key = np.zeros(len(bank), dtype=np.uint8)
+        self.module_index = np.zeros(len(bank), dtype=np.intp)
+
+        for i, module in enumerate(bank.modules):
+            start, end = bank.module_range(module['id'])
+            self.answer_key[start:end] = [ANSWER_CODES[letter] for letter in bank.answer_key(module['id'])]
+            self.module_index[start:end] = i
+
+    def encode_answers(self, user_answers):
+        """Convertit les réponses (AnswerStore ou dict clé -> lettre) en tableau uint8"""
+        if isinstance(user_answers, AnswerStore):
+            return self.unpack(user_answers.training.data)
+
+        answers = np.zeros(len(self.answer_key), dtype=np.uint8)
+        for key, choice in user_answers.items():
+            slot = self.bank.slot_for_key(key)
+            if slot is not None:
+                answers[slot] = ANSWER_CODES.get(choice, 0)
+        return answers
+
+    def unpack(self, packed_bytes):
+        """Décompresse les réponses 2 bits de l'espace d'entraînement en tableau uint8"""
+        raw = np.frombuffer(bytes(packed_bytes), dtype=np.uint8)
+        codes = (raw[:, None] >> _PACKED_SHIFTS) & 3
+        return codes.reshape(-1)[:len(self.answer_key)]
+
+    def module_scores(self, answers):
+        """
+        Calcule les compteurs de tous les modules en un passage
+
+        Returns:
+            tuple: (correct, answered) tableaux d'entiers alignés sur module_ids
+        """
+        answered_mask = answers != 0
+        correct_mask = answered_mask & (answers == self.answer_key)
+        n_modules = len(self.module_ids)
+        answered = np.bincount(self.module_index[answered_mask], minlength=n_modules)
+        correct = np.bincount(self.module_index[correct_mask], minlength=n_modules)
+        return correct, answered
+
+    def error_slots(self, answers):
+        """Slots des réponses incorrectes (tableau trié)"""
+        return np.flatnonzero((answers != 0) & (answers != self.answer_key))
+
+    def scores_by_module(self, answers):
+        """Retourne {module_id: (correct, answered)}"""
+        correct, answered = self.module_scores(answers)
+        return {
+            module_id: (int(correct[i]), int(answered[i]))
+            for i, module_id in enumerate(self.module_ids)
+        }
+
+    def module_score(self, answers, module_id):
+        """Retourne (correct, answered) pour un seul module"""
+        start, end = self.bank.module_range(module_id)
+        module_answers = answers[start:end]
+        answered_mask = module_answers != 0
+        correct = int(np.count_nonzero(module_answers[answered_mask] == self.answer_key[start:end][answered_mask]))
+        return correct, int(np.count_nonzero(answered_mask))
+
+    def has_module(self, module_id):
+        return module_id in self._module_positions
@@ -0,0 +1,101 @@
+import streamlit as st
+import time
+from modules.data_loader import get_exam_bank, get_question_bank, get_search_indexes
+from modules.selection_quiz import start_selection_quiz
+from modules.timing import timed
+
+# Résultats affichés par banque, et questions au plus dans un quiz lancé depuis la recherche
+MAX_DISPLAYED_RESULTS = 30
+MAX_QUIZ_QUESTIONS = 40
+EXCERPT_LENGTH = 110
+
+SEARCH_SCOPES = {
+    'Toutes les questions': ('training', 'exam'),
+    'Entraînement': ('training',),
+    'Examens blancs': ('exam',),
+}
+
+
+def close_search():
+    """Retour au tableau de bord"""
+    st.session_state.show_search = False
+
+
+def _excerpt(text):
+    text = ' '.join(text.split())
+    return text if len(text) <= EXCERPT_LENGTH else text[:EXCERPT_LENGTH - 1] + "…"
+
+
+def _show_results(results, bank, show_answers):
+    """Liste des questions trouvées dans une banque (les mieux classées d'abord)"""
+    for (module_id, question_id), score in results[:MAX_DISPLAYED_RESULTS]:
+        module = bank.module(module_id)
+        question = bank.question(module_id, question_id)
+        with st.expander(f"{module['title']} · Q{question_id} — {_excerpt(question['question'])}"):
+            st.write(question['question'])
+            for key, option in question['options'].items():
+                if show_answers and key == question['correct_answer']:
+                    st.markdown(f"✅ **{key} - {option}**")
+                else:
+                    st.markdown(f"{key} - {option}")
+            st.caption(f"{module['full_title']} • {score} occurrence(s)")
+    if len(results) > MAX_DISPLAYED_RESULTS:
+        st.caption(f"… et {len(results) - MAX_DISPLAYED_RESULTS} autres résultats, précisez la recherche")
+
+
+@timed("page:search")
+def show_search_page():
+    """
+    Recherche plein texte dans les banques d'entraînement et d'examen
+
+    L'index inversé est construit au build (data/*_index.json) et partagé
+    par toutes les sessions : une requête ne parcourt que les postings de
+    ses termes, sans relire le texte des questions.
+    """
+    st.header("🔎 Rechercher une question")
+    st.button("⬅️ Retour au tableau de bord", on_click=close_search)
+
+    indexes = get_search_indexes()
+    query = st.text_input(
+        "Mots-clés",
+        key='search_query',
+        placeholder='ex. dépositaire, OPCVM, "abus de marché"',
+        help="Majuscules et accents sont ignorés. Une expression entre guillemets est cherchée telle quelle ; "
+             "le dernier mot est complété (« dépos » trouve « dépositaire »)."
+    )
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        scope = st.radio("Banques", list(SEARCH_SCOPES), horizontal=True, key='search_scope',
+                         label_visibility="collapsed")
+    with col2:
+        show_answers = st.toggle("Afficher les réponses", key='search_show_answers')
+
+    if not query.strip():
+        st.info("💡 Saisissez un ou plusieurs mots : les questions qui les contiennent tous sont listées.")
+        return
+
+    start = time.perf_counter()
+    results = {name: indexes[name].search(query) for name in SEARCH_SCOPES[scope] if name in indexes}
+    elapsed_ms = (time.perf_counter() - start) * 1e3
+    total = sum(len(found) for found in results.values())
+    st.caption(f"{total} question(s) trouvée(s) en {elapsed_ms:.2f} ms")
+
+    if not total:
+        st.warning("Aucune question ne contient tous ces mots.")
+        return
+
+    training_results = results.get('training', [])
+    if training_results:
+        quiz_refs = [ref for ref, _ in training_results[:MAX_QUIZ_QUESTIONS]]
+        if st.button(f"🎯 Quiz sur ces {len(quiz_refs)} question(s) d'entraînement", type="primary"):
+            start_selection_quiz(quiz_refs, f"Recherche « {query.strip()} »")
+            close_search()
+            st.rerun()
+        st.subheader(f"📚 Entraînement ({len(training_results)})")
+        _show_results(training_results, get_question_bank(), show_answers)
+
+    exam_results = results.get('exam', [])
+    if exam_results:
+        st.subheader(f"🎓 Examens blancs ({len(exam_results)})")
+        st.caption("Consultation seulement : ces questions se travaillent dans un examen blanc.")
+        _show_results(exam_results, get_exam_bank(), show_answers)
@@ -0,0 +1,240 @@
+"""
+Index inversé plein texte des banques de questions
+
+Même idée que process_exam.normalize_text (casse et ponctuation ignorées),
+avec en plus les accents : « Dépositaire », « depositaire » et « DÉPOSITAIRE »
+donnent le même terme. Chaque terme renvoie aux questions qui le contiennent
+avec ses positions (énoncé puis options A, B, C), ce qui permet les requêtes
+d'expression entre guillemets.
+
+Module pur Python (sans Streamlit) : les scripts de data/ écrivent l'index au
+build dans le même format (data/search_build.py, autonome), l'application ne
+fait que le charger et l'interroger.
+"""
+import heapq
+import json
+import re
+import unicodedata
+from bisect import bisect_left
+
+INDEX_VERSION = 1
+
+# Champs indexés, dans l'ordre des positions
+INDEXED_OPTIONS = ('A', 'B', 'C')
+# Saut de position entre deux champs : une expression ne chevauche pas l'énoncé et une option
+FIELD_GAP = 1
+# Préfixe minimal pour compléter le dernier mot d'une requête (« dépos » → dépositaire...)
+MIN_PREFIX_LENGTH = 3
+
+_TOKEN = re.compile(r"[0-9a-z]+")
+_PHRASE = re.compile(r'"([^"]*)"?')
+# Diacritiques séparés par la décomposition NFKD (accents, cédille, tréma)
+_COMBINING = re.compile(r"[\u0300-\u036f]")
+
+
+def fold_text(text):
+    """Minuscules sans accents ni ligatures (« Société » → « societe »)"""
+    if not text:
+        return ""
+    text = text.lower().replace('œ', 'oe').replace('æ', 'ae')
+    return _COMBINING.sub('', unicodedata.normalize('NFKD', text))
+
+
+def tokenize(text):
+    """Termes normalisés du texte, dans l'ordre (la ponctuation sépare les mots)"""
+    return _TOKEN.findall(fold_text(text))
+
+
+def question_fields(question):
+    """Textes indexés d'une question : énoncé puis options"""
+    options = question.get('options', {})
+    return [question.get('question', '')] + [options.get(key, '') for key in INDEXED_OPTIONS]
+
+
+def parse_query(query):
+    """
+    Découpe une requête en termes et expressions
+
+    Returns:
+        (termes, expressions, préfixe) : les mots hors guillemets, les listes de
+        termes entre guillemets, et le dernier mot s'il peut être complété
+        (requête non terminée par une espace ni un guillemet)
+    """
+    phrases = []
+    for match in _PHRASE.finditer(query):
+        # Un seul mot entre guillemets : terme exact, sans complétion
+        terms = tokenize(match.group(1))
+        if terms:
+            phrases.append(terms)
+    rest = _PHRASE.sub(' ', query)
+    terms = tokenize(rest)
+    prefix = None
+    # Dernier mot hors guillemets et collé à la fin de la requête
+    if terms and query[-1:].isalnum() and query.count('"') % 2 == 0:
+        prefix = terms.pop()
+    return terms, phrases, prefix
+
+
+class SearchIndex:
+    """
+    Index positionnel : terme -> {document: positions}
+
+    Les documents sont des références (module_id, question_id) dans l'ordre
+    de la banque. Une requête est un ET de ses termes ; les résultats sont
+    classés par nombre d'occurrences puis dans l'ordre de la banque.
+    """
+
+    __slots__ = ('documents', 'postings', 'vocabulary')
+
+    def __init__(self, documents, postings):
+        self.documents = documents
+        self.postings = postings
+        self.vocabulary = sorted(postings)
+
+    @classmethod
+    def build(cls, entries):
+        """
+        Construit l'index
+
+        Args:
+            entries: itérable de (référence, textes), textes dans l'ordre des positions
+        """
+        documents = []
+        postings = {}
+        for doc, (reference, fields) in enumerate(entries):
+            documents.append(tuple(reference))
+            positions = {}
+            position = 0
+            for text in fields:
+                for position, term in enumerate(tokenize(text), position):
+                    positions.setdefault(term, []).append(position)
+                position += 1 + FIELD_GAP
+            for term, term_positions in positions.items():
+                postings.setdefault(term, {})[doc] = tuple(term_positions)
+        return cls(documents, postings)
+
+    @classmethod
+    def from_bank_data(cls, data):
+        """Index d'une banque (questions.json, exam_questions.json ou QuestionBank.data)"""
+        return cls.build(
+            ((module['id'], question['id']), question_fields(question))
+            for module in data['modules']
+            for question in module['questions']
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Index sérialisé par to_dict (lève ValueError si la version ne correspond pas)"""
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Version d'index non prise en charge: {data.get('version')}")
+        postings = {}
+        for term, entries in data['postings'].items():
+            docs = {}
+            for entry in entries:
+                docs[entry[0]] = tuple(entry[1:])
+            postings[term] = docs
+        return cls([tuple(reference) for reference in data['documents']], postings)
+
+    @classmethod
+    def from_file(cls, path):
+        """Charge un index écrit par les scripts de build (lève FileNotFoundError)"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self):
+        """Forme JSON : documents, puis pour chaque terme [[document, positions...], ...]"""
+        return {
+            'version': INDEX_VERSION,
+            'documents': [list(reference) for reference in self.documents],
+            'postings': {
+                term: [[doc, *self.postings[term][doc]] for doc in sorted(self.postings[term])]
+                for term in self.vocabulary
+            },
+        }
+
+    def __len__(self):
+        return len(self.documents)
+
+    def complete(self, prefix):
+        """Termes du vocabulaire qui commencent par prefix (recherche dichotomique)"""
+        start = bisect_left(self.vocabulary, prefix)
+        end = bisect_left(self.vocabulary, prefix + '\x7f', start)
+        return self.vocabulary[start:end]
+
+    def _phrase_counts(self, terms, candidates):
+        """Occurrences de l'expression (termes consécutifs) dans chaque document candidat"""
+        lists = [self.postings.get(term) for term in terms]
+        if any(docs is None for docs in lists):
+            return {}
+        counts = {}
+        for doc in candidates:
+            if not all(doc in docs for docs in lists):
+                continue
+            # Positions de départ compatibles avec chaque terme suivant
+            starts = set(lists[0][doc])
+            for offset, docs in enumerate(lists[1:], 1):
+                starts.intersection_update([position - offset for position in docs[doc]])
+                if not starts:
+                    break
+            if starts:
+                counts[doc] = len(starts)
+        return counts
+
+    def search(self, query, limit=None):
+        """
+        Documents qui contiennent tous les termes et expressions de la requête
+
+        Le dernier mot d'une requête en cours de saisie est complété (au moins
+        MIN_PREFIX_LENGTH caractères) : « dépos » trouve « dépositaire ».
+
+        Returns:
+            Liste de (référence, score), la plus pertinente d'abord ; le score
+            est le nombre d'occurrences des termes et expressions
+        """
+        terms, phrases, prefix = parse_query(query)
+        if not terms and not phrases and not prefix:
+            return []
+
+        # Documents de chaque critère : postings des termes, occurrences des préfixes
+        term_docs = [self.postings.get(term) for term in terms]
+        phrase_docs = [self.postings.get(term) for phrase in phrases for term in phrase]
+        if any(docs is None for docs in term_docs + phrase_docs):
+            return []
+        prefix_counts = {}
+        if prefix is not None:
+            completions = self.complete(prefix) if len(prefix) >= MIN_PREFIX_LENGTH else []
+            if prefix in self.postings and prefix not in completions:
+                completions.append(prefix)
+            for term in completions:
+                for doc, positions in self.postings[term].items():
+                    prefix_counts[doc] = prefix_counts.get(doc, 0) + len(positions)
+            if not prefix_counts:
+                return []
+
+        # Intersection en partant du critère le plus sélectif (sans copier les postings)
+        criteria = term_docs + phrase_docs
+        if prefix is not None:
+            criteria.append(prefix_counts)
+        criteria.sort(key=len)
+        candidates = set(criteria[0])
+        for docs in criteria[1:]:
+            candidates.intersection_update(docs)
+
+        phrase_counts = []
+        for phrase in phrases:
+            counts = self._phrase_counts(phrase, candidates)
+            candidates.intersection_update(counts)
+            phrase_counts.append(counts)
+
+        # Score : occurrences de chaque critère ; à égalité, ordre de la banque (tri stable)
+        scores = dict.fromkeys(sorted(candidates), 0)
+        for docs in term_docs:
+            for doc in candidates:
+                scores[doc] += len(docs[doc])
+        for counts in phrase_counts + ([prefix_counts] if prefix is not None else []):
+            for doc in candidates:
+                scores[doc] += counts[doc]
+
+        order = sorted(scores, key=scores.__getitem__, reverse=True) if limit is None else heapq.nlargest(
+            limit, scores, key=scores.__getitem__)
+        return [(self.documents[doc], scores[doc]) for doc in order]
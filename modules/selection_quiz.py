@@ -0,0 +1,204 @@
+import streamlit as st
+from collections.abc import Sequence
+from datetime import datetime
+from modules.data_loader import get_question_bank
+from modules.exam_session import ExamQuestion
+from modules.persistence import on_answer_validated, save_user_progress
+from modules.quiz_common import (
+    render_question_header, render_question_card, render_answer_options,
+    render_answer_correction, render_navigation_buttons, render_quick_navigation
+)
+from modules.timing import timed
+
+SELECTION_MODE = 'selection'
+
+
+class SelectionQuestionList(Sequence):
+    """
+    Questions d'entraînement de plusieurs modules, désignées par (module_id, question_id)
+
+    Chaque question est une vue de la banque partagée dont l'id est la clé de
+    réponse "module_question" : les réponses données ici sont celles des
+    modules (progression, sauvegarde, révision).
+    """
+
+    __slots__ = ('bank', 'refs')
+
+    def __init__(self, bank, refs):
+        self.bank = bank
+        self.refs = refs
+
+    def __len__(self):
+        return len(self.refs)
+
+    def __getitem__(self, index):
+        module_id, question_id = self.refs[index]
+        return ExamQuestion(self.bank.question(module_id, question_id), {
+            'id': f"{module_id}_{question_id}",
+            'module_id': module_id,
+            'number': question_id,
+        })
+
+
+def start_selection_quiz(refs, title):
+    """
+    Lance un quiz sur une sélection de questions d'entraînement
+
+    Args:
+        refs: Références (module_id, question_id), dans l'ordre du quiz
+        title: Titre affiché en tête du quiz et des résultats
+    """
+    st.session_state.selection_quiz = {'title': title, 'refs': [tuple(ref) for ref in refs]}
+    st.session_state.current_module = None
+    st.session_state.current_question_idx = 0
+    st.session_state.quiz_started = True
+    st.session_state.quiz_completed = False
+    st.session_state.start_time = datetime.now()
+    st.session_state.quiz_mode = SELECTION_MODE
+    # Nettoyer les données d'examen blanc
+    st.session_state.exam_blanc_questions = None
+    st.session_state.current_exam_blanc_id = None
+
+
+def end_selection_quiz():
+    """Quitte le quiz sur sélection (retour au tableau de bord)"""
+    st.session_state.quiz_started = False
+    st.session_state.quiz_completed = False
+    st.session_state.quiz_mode = 'practice'
+    if 'selection_quiz' in st.session_state:
+        del st.session_state.selection_quiz
+
+
+def get_selection_questions():
+    """Questions du quiz sur sélection en cours (None s'il n'y en a pas)"""
+    selection = st.session_state.get('selection_quiz')
+    bank = get_question_bank()
+    if not selection or not selection['refs'] or bank is None:
+        return None
+    return SelectionQuestionList(bank, selection['refs'])
+
+
+def selection_score(questions):
+    """(bonnes réponses, réponses, questions en erreur) de la sélection"""
+    user_answers = st.session_state.user_answers
+    correct = answered = 0
+    errors = []
+    for question in questions:
+        user_answer = user_answers.get(question['id'])
+        if user_answer is None:
+            continue
+        answered += 1
+        if user_answer == question['correct_answer']:
+            correct += 1
+        else:
+            errors.append(question)
+    return correct, answered, errors
+
+
+@st.fragment
+@timed("fragment:selection")
+def show_selection_quiz_interface():
+    """
+    Quiz sur une sélection de questions de plusieurs modules (résultats de recherche...)
+
+    Fragment Streamlit, comme le quiz standard (voir quiz_common.rerun_question).
+    """
+    questions = get_selection_questions()
+    if questions is None:
+        st.error("❌ Aucune question sélectionnée")
+        end_selection_quiz()
+        st.rerun()
+        return
+
+    current_idx = st.session_state.current_question_idx
+    if current_idx >= len(questions):
+        st.session_state.quiz_completed = True
+        st.rerun()
+        return
+
+    current_question = questions[current_idx]
+    module = get_question_bank().module(current_question['module_id'])
+    render_question_header(f"🔎 {st.session_state.selection_quiz['title']}",
+                           subtitle=f"{module['title']} : {module['full_title']}")
+
+    # Barre de progression (questions de la sélection déjà répondues)
+    answered = sum(1 for question in questions if question['id'] in st.session_state.user_answers)
+    st.progress(answered / len(questions))
+    st.caption(f"Question actuelle: {current_idx + 1} / {len(questions)}")
+
+    render_question_card(current_question['number'], current_question['question'])
+
+    unique_question_id = current_question['id']
+    radio_key = f"q_{unique_question_id}_{SELECTION_MODE}"
+    user_choice = render_answer_options(current_question['options'], unique_question_id, radio_key)
+    st.session_state.current_user_choice = user_choice
+
+    render_answer_correction(unique_question_id, current_question)
+
+    render_navigation_buttons(
+        current_idx=current_idx,
+        total_questions=len(questions),
+        unique_question_id=unique_question_id,
+        auto_save_func=on_answer_validated,
+        correct_answer=current_question['correct_answer']
+    )
+
+    render_quick_navigation(
+        questions=questions,
+        current_idx=current_idx,
+        exam_part=SELECTION_MODE,
+        title_suffix=f"{len(questions)} questions"
+    )
+
+
+def show_selection_results():
+    """Résultats du quiz sur sélection, avec les erreurs à revoir"""
+    questions = get_selection_questions()
+    if questions is None:
+        end_selection_quiz()
+        st.rerun()
+        return
+
+    title = st.session_state.selection_quiz['title']
+    correct, answered, errors = selection_score(questions)
+    score_percentage = (correct / answered) * 100 if answered > 0 else 0
+
+    st.markdown(f"""
+    <div class="results-header">
+        <h1>🎉 Quiz terminé !</h1>
+        <h2>🔎 {title}</h2>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("✅ Bonnes réponses", f"{correct} / {len(questions)}")
+    with col2:
+        st.metric("❌ Erreurs", len(errors))
+    with col3:
+        st.metric("📊 Score", f"{score_percentage:.1f}%")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if errors and st.button("🔄 Refaire les erreurs", type="primary", use_container_width=True):
+            start_selection_quiz([(q['module_id'], q['number']) for q in errors], f"{title} - erreurs")
+            st.rerun()
+    with col2:
+        if st.button("📚 Tableau de bord", use_container_width=True):
+            save_user_progress()
+            end_selection_quiz()
+            st.rerun()
+
+    if not errors:
+        st.success("🎉 Aucune erreur à réviser ! Parfait !")
+        return
+
+    st.subheader("🔍 Erreurs à revoir")
+    bank = get_question_bank()
+    for i, question in enumerate(errors):
+        module = bank.module(question['module_id'])
+        user_answer = st.session_state.user_answers[question['id']]
+        with st.expander(f"❌ {module['title']} - Question {question['number']}", expanded=i == 0):
+            st.write(question['question'])
+            st.error(f"**{user_answer}** - {question['options'][user_answer]}")
+            st.success(f"**{question['correct_answer']}** - {question['options'][question['correct_answer']]}")
@@ -0,0 +1,225 @@
+import sqlite3
+import threading
+from datetime import datetime
+from modules.progress_store import ProgressStore
+
+# Requêtes constantes : compilées une fois puis réutilisées par le cache de
+# requêtes préparées de chaque connexion sqlite3
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS learners (
+        learner_id TEXT PRIMARY KEY,
+        session_count INTEGER NOT NULL DEFAULT 0,
+        created_at TEXT NOT NULL,
+        last_updated TEXT NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS answers (
+        learner_id TEXT NOT NULL,
+        answer_key TEXT NOT NULL,
+        choice TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        PRIMARY KEY (learner_id, answer_key)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS exam_seeds (
+        learner_id TEXT NOT NULL,
+        exam_num INTEGER NOT NULL,
+        seed INTEGER NOT NULL,
+        PRIMARY KEY (learner_id, exam_num)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS review_cards (
+        learner_id TEXT NOT NULL,
+        card_key TEXT NOT NULL,
+        repetitions INTEGER NOT NULL,
+        interval_days INTEGER NOT NULL,
+        ease REAL NOT NULL,
+        due_day INTEGER NOT NULL,
+        lapses INTEGER NOT NULL,
+        last_review INTEGER,
+        PRIMARY KEY (learner_id, card_key)
+    ) WITHOUT ROWID""",
+)
+_UPSERT_ANSWER = (
+    "INSERT INTO answers (learner_id, answer_key, choice, updated_at) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (learner_id, answer_key) DO UPDATE SET choice = excluded.choice, updated_at = excluded.updated_at"
+)
+_DELETE_ANSWER = "DELETE FROM answers WHERE learner_id = ? AND answer_key = ?"
+_DELETE_PREFIX = "DELETE FROM answers WHERE learner_id = ? AND answer_key >= ? AND answer_key < ?"
+_DELETE_ALL = "DELETE FROM answers WHERE learner_id = ?"
+_SELECT_ANSWERS = "SELECT answer_key, choice FROM answers WHERE learner_id = ?"
+_UPSERT_EXAM_SEED = (
+    "INSERT INTO exam_seeds (learner_id, exam_num, seed) VALUES (?, ?, ?) "
+    "ON CONFLICT (learner_id, exam_num) DO UPDATE SET seed = excluded.seed"
+)
+_SELECT_EXAM_SEEDS = "SELECT exam_num, seed FROM exam_seeds WHERE learner_id = ?"
+_UPSERT_REVIEW_CARD = (
+    "INSERT INTO review_cards (learner_id, card_key, repetitions, interval_days, ease, due_day, lapses, last_review) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (learner_id, card_key) DO UPDATE SET repetitions = excluded.repetitions, "
+    "interval_days = excluded.interval_days, ease = excluded.ease, due_day = excluded.due_day, "
+    "lapses = excluded.lapses, last_review = excluded.last_review"
+)
+_DELETE_REVIEW_PREFIX = "DELETE FROM review_cards WHERE learner_id = ? AND card_key >= ? AND card_key < ?"
+_DELETE_REVIEW_ALL = "DELETE FROM review_cards WHERE learner_id = ?"
+_SELECT_REVIEW_CARDS = (
+    "SELECT card_key, repetitions, interval_days, ease, due_day, lapses, last_review "
+    "FROM review_cards WHERE learner_id = ?"
+)
+_SELECT_LEARNER = "SELECT session_count, last_updated FROM learners WHERE learner_id = ?"
+_TOUCH_LEARNER = (
+    "INSERT INTO learners (learner_id, session_count, created_at, last_updated) VALUES (?, 0, ?, ?) "
+    "ON CONFLICT (learner_id) DO UPDATE SET last_updated = excluded.last_updated"
+)
+_START_SESSION = "UPDATE learners SET session_count = session_count + 1 WHERE learner_id = ?"
+
+# Attente maximale d'un verrou d'écriture tenu par un autre processus (ms)
+BUSY_TIMEOUT_MS = 5000
+
+
+def _prefix_bounds(prefix):
+    """
+    Bornes [prefix, fin) couvrant toutes les clés commençant par prefix
+
+    Permet une suppression par plage sur la clé primaire (pas de LIKE ni de scan).
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class SQLiteProgressStore(ProgressStore):
+    """
+    Progression de plusieurs apprenants dans une base SQLite en mode WAL
+
+    - une ligne par réponse, clé primaire (learner_id, answer_key) : chaque
+      validation est un upsert d'une ligne, chaque reset une suppression par plage
+    - une ligne par examen blanc régénéré (numéro d'examen -> seed)
+    - une ligne par fiche de répétition espacée (voir review_scheduler)
+    - une connexion par thread : les sessions Streamlit (threads) et les
+      processus serveur lisent en parallèle et n'attendent que pendant les
+      courtes transactions d'écriture
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._local = threading.local()
+        self._schema_ready = False
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=FULL")
+            connection.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            if not self._schema_ready:
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+                self._schema_ready = True
+            self._local.connection = connection
+        return connection
+
+    def has_learner(self, learner_id):
+        return self._connection().execute(_SELECT_LEARNER, (learner_id,)).fetchone() is not None
+
+    def load(self, learner_id):
+        """
+        Charge les réponses et métadonnées d'un apprenant (parcours de ses seules lignes)
+
+        Returns:
+            dict: {"user_answers", "exam_seed_mapping", "review_cards", "last_updated", "session_count"}
+        """
+        connection = self._connection()
+        row = connection.execute(_SELECT_LEARNER, (learner_id,)).fetchone()
+        user_answers = dict(connection.execute(_SELECT_ANSWERS, (learner_id,)))
+        return {
+            "user_answers": user_answers,
+            "exam_seed_mapping": dict(connection.execute(_SELECT_EXAM_SEEDS, (learner_id,))),
+            "review_cards": {
+                row[0]: list(row[1:]) for row in connection.execute(_SELECT_REVIEW_CARDS, (learner_id,))
+            },
+            "last_updated": row[1] if row else None,
+            "session_count": row[0] if row else 0,
+        }
+
+    def start_session(self, learner_id):
+        """Enregistre l'apprenant si besoin et incrémente son nombre de sessions"""
+        now = datetime.now().isoformat()
+        connection = self._connection()
+        with _transaction(connection):
+            connection.execute(_TOUCH_LEARNER, (learner_id, now, now))
+            connection.execute(_START_SESSION, (learner_id,))
+
+    def apply_events(self, learner_id, events):
+        """
+        Applique des événements de réponse en une transaction
+
+        Même format que le journal (voir journal.apply_answer_event) ; seules les
+        lignes concernées sont écrites.
+        """
+        if not events:
+            return
+        now = datetime.now().isoformat()
+        connection = self._connection()
+        with _transaction(connection):
+            connection.execute(_TOUCH_LEARNER, (learner_id, now, now))
+            for event in events:
+                if 'k' in event:
+                    if event.get('v') is None:
+                        connection.execute(_DELETE_ANSWER, (learner_id, event['k']))
+                    else:
+                        connection.execute(_UPSERT_ANSWER, (learner_id, event['k'], event['v'], now))
+                elif 'review' in event:
+                    connection.execute(_UPSERT_REVIEW_CARD, (learner_id, event['review'], *event['card']))
+                elif 'reset_module' in event:
+                    bounds = _prefix_bounds(f"{event['reset_module']}_")
+                    connection.execute(_DELETE_PREFIX, (learner_id,) + bounds)
+                    connection.execute(_DELETE_REVIEW_PREFIX, (learner_id,) + bounds)
+                elif 'reset_exam' in event:
+                    connection.execute(_DELETE_PREFIX, (learner_id,) + _prefix_bounds(f"exam{event['reset_exam']}_"))
+                elif event.get('reset_all'):
+                    connection.execute(_DELETE_ALL, (learner_id,))
+                    connection.execute(_DELETE_REVIEW_ALL, (learner_id,))
+                elif 'exam_seed' in event:
+                    connection.execute(_UPSERT_EXAM_SEED, (learner_id, int(event['exam_seed']), event['seed']))
+
+    def import_answers(self, learner_id, user_answers, exam_seed_mapping=None, review_cards=None):
+        """Insère un dictionnaire complet de réponses (migration de l'ancien fichier JSON)"""
+        now = datetime.now().isoformat()
+        connection = self._connection()
+        with _transaction(connection):
+            connection.execute(_TOUCH_LEARNER, (learner_id, now, now))
+            connection.executemany(
+                _UPSERT_ANSWER,
+                ((learner_id, key, choice, now) for key, choice in user_answers.items())
+            )
+            connection.executemany(
+                _UPSERT_EXAM_SEED,
+                ((learner_id, exam_num, seed) for exam_num, seed in (exam_seed_mapping or {}).items())
+            )
+            connection.executemany(
+                _UPSERT_REVIEW_CARD,
+                ((learner_id, key, *card) for key, card in (review_cards or {}).items())
+            )
+
+    def close(self):
+        """Ferme la connexion du thread appelant"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class _transaction:
+    """Transaction explicite BEGIN IMMEDIATE / COMMIT (ROLLBACK en cas d'erreur)"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        # IMMEDIATE : le verrou d'écriture est pris d'entrée, busy_timeout s'applique
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, exc, tb):
+        self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
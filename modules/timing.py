@@ -0,0 +1,69 @@
+import functools
+import os
+import statistics
+import threading
+import time
+from collections import deque
+
+# Affiche la durée de chaque exécution dans la console (AMF_TIMING=1)
+TIMING_LOG = os.environ.get("AMF_TIMING") == "1"
+# Nombre de mesures conservées par zone
+TIMING_HISTORY = 500
+
+_timings = {}
+_lock = threading.Lock()
+
+
+def record_timing(name, duration_ms):
+    """Ajoute une mesure (ms) à l'historique de la zone `name`"""
+    with _lock:
+        history = _timings.get(name)
+        if history is None:
+            history = _timings[name] = deque(maxlen=TIMING_HISTORY)
+        history.append(duration_ms)
+    if TIMING_LOG:
+        print(f"⏱️ {name}: {duration_ms:.1f} ms")
+
+
+def timed(name):
+    """
+    Décorateur mesurant la durée de chaque exécution d'une fonction de rendu
+
+    La mesure est enregistrée même si la fonction se termine par st.rerun()
+    (exception de contrôle de Streamlit).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_timing(name, (time.perf_counter() - start) * 1e3)
+        return wrapper
+    return decorator
+
+
+def timing_summary():
+    """
+    Résumé des mesures par zone
+
+    Returns:
+        dict: {zone: {'runs', 'mean_ms', 'median_ms', 'max_ms'}}
+    """
+    with _lock:
+        snapshot = {name: list(history) for name, history in _timings.items()}
+    return {
+        name: {
+            'runs': len(values),
+            'mean_ms': statistics.fmean(values),
+            'median_ms': statistics.median(values),
+            'max_ms': max(values),
+        }
+        for name, values in snapshot.items() if values
+    }
+
+
+def reset_timings():
+    with _lock:
+        _timings.clear()